@@ -31,6 +31,7 @@ TABLA_CONFIG = {
     'fila_altura_default': 36,  # Altura por defecto de filas (aumentada para mejor legibilidad)
     'fila_altura_minima': 32,   # Altura mínima
     'fila_altura_maxima': 48,   # Altura máxima
+    'filas_por_pagina': 500,    # Filas que se entregan a la vista cada vez que llega al final
     
     # Columnas (anchos optimizados)
     'columna_titulo': 280,
@@ -59,6 +60,23 @@ NOTAS_CONFIG = {
     'editor_line_height': 1.6,  # Espaciado entre líneas mejorado para lectura
 }
 
+# Configuración del almacenamiento de enlaces
+ALMACENAMIENTO_CONFIG = {
+    # 'auto' elige por extensión del archivo, 'json' o 'sqlite' fuerzan el backend
+    'backend': 'auto',
+    'extensiones_sqlite': ('.db', '.sqlite', '.sqlite3'),
+    'migrar_json_a_sqlite': True,  # Migrar links.json la primera vez que se usa SQLite
+    'snapshot_binario': True,  # Instantánea binaria junto al JSON para arrancar sin reparsear
+    'almacen_columnar': True,  # Filtrar con columnas NumPy si NumPy está instalado
+    'vigilar_archivo': True,  # Incorporar los cambios que otros procesos guarden en los datos
+    'retardo_vigilancia_ms': 500,  # Espera sin nuevas notificaciones antes de releer
+    'directorio_copias': 'copias',  # Carpeta de copias de seguridad, junto al archivo de datos
+    'compresion_copias': 'gzip',  # 'gzip' (rápida) o 'lzma' (más compacta)
+    # Se conservan las últimas copias y la más reciente de cada una de las últimas horas, días y semanas
+    'retencion_copias': {'ultimas': 10, 'horarias': 24, 'diarias': 7, 'semanales': 4},
+    'intervalo_copias_min': 60,  # Copia automática en segundo plano (0 la desactiva)
+}
+
 # Esquema de colores Fluent Design System - Tema Oscuro Violeta
 FLUENT_COLOR_SCHEME = {
     # Colores primarios violetas
@@ -227,6 +245,10 @@ def obtener_config_app():
     """Obtiene la configuración general."""
     return APP_CONFIG.copy()
 
+def obtener_config_almacenamiento():
+    """Obtiene la configuración del almacenamiento."""
+    return ALMACENAMIENTO_CONFIG.copy()
+
 def actualizar_config_tabla(**kwargs):
     """Actualiza la configuración de la tabla."""
     TABLA_CONFIG.update(kwargs)
@@ -235,6 +257,10 @@ def actualizar_config_notas(**kwargs):
     """Actualiza la configuración de notas."""
     NOTAS_CONFIG.update(kwargs)
 
+def actualizar_config_almacenamiento(**kwargs):
+    """Actualiza la configuración del almacenamiento."""
+    ALMACENAMIENTO_CONFIG.update(kwargs)
+
 # Nuevas funciones para el sistema Fluent Design
 def obtener_fluent_colors():
     """Obtiene el esquema de colores Fluent"""
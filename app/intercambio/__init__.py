@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Importación y exportación de enlaces en streaming para TECH LINK VIEWER
+"""
+
+from .lectores import (
+    LectorEnlaces, ErrorFormato, detectar_formato,
+    FORMATO_JSON, FORMATO_NDJSON
+)
+from .normalizacion import normalizar_registro, CATEGORIA_POR_DEFECTO
+from .importador import normalizar_en_lotes, SesionImportacion, TAMANO_LOTE
+from .navegadores import (
+    abrir_lector, LectorMarcadoresHTML, LectorMarcadoresChromium, LectorMarcadoresFirefox
+)
+from .escritores import (
+    exportar_enlaces, formato_por_extension, ExportacionCancelada,
+    FORMATO_CSV, FORMATO_HTML
+)
+
+__all__ = [
+    'LectorEnlaces', 'ErrorFormato', 'detectar_formato',
+    'FORMATO_JSON', 'FORMATO_NDJSON',
+    'normalizar_registro', 'CATEGORIA_POR_DEFECTO',
+    'normalizar_en_lotes', 'SesionImportacion', 'TAMANO_LOTE',
+    'abrir_lector', 'LectorMarcadoresHTML', 'LectorMarcadoresChromium', 'LectorMarcadoresFirefox',
+    'exportar_enlaces', 'formato_por_extension', 'ExportacionCancelada',
+    'FORMATO_CSV', 'FORMATO_HTML'
+]
@@ -0,0 +1,209 @@
+"""
+Exportación de enlaces en streaming (JSON, NDJSON, CSV y marcadores HTML).
+
+Cada escritor recorre los enlaces y escribe registro a registro, de modo que
+la memoria usada no depende del número de enlaces. La salida se escribe en
+un archivo temporal que sustituye al destino solo si la exportación termina.
+"""
+import csv
+import html
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, TextIO
+from .lectores import FORMATO_JSON, FORMATO_NDJSON
+from ..models.migraciones import VERSION_ACTUAL
+from ..utils.time import parsear_timestamp
+
+
+logger = logging.getLogger(__name__)
+
+FORMATO_CSV = 'csv'
+FORMATO_HTML = 'html'
+
+EXTENSIONES_FORMATO = {
+    '.json': FORMATO_JSON,
+    '.ndjson': FORMATO_NDJSON,
+    '.jsonl': FORMATO_NDJSON,
+    '.csv': FORMATO_CSV,
+    '.html': FORMATO_HTML,
+    '.htm': FORMATO_HTML,
+}
+
+COLUMNAS_CSV = ('id', 'titulo', 'url', 'categoria', 'tags', 'es_favorito', 'creado_en', 'actualizado_en')
+INTERVALO_PROGRESO = 1000
+
+
+class ExportacionCancelada(Exception):
+    """La exportación se canceló antes de terminar."""
+
+
+def formato_por_extension(ruta: Path) -> str:
+    """
+    Deduce el formato de exportación a partir de la extensión.
+
+    Args:
+        ruta: Ruta de destino
+
+    Returns:
+        Formato de exportación (JSON si la extensión no se reconoce)
+    """
+    return EXTENSIONES_FORMATO.get(ruta.suffix.lower(), FORMATO_JSON)
+
+
+class _Avance:
+    """Notifica el progreso y comprueba la cancelación cada pocos registros."""
+
+    def __init__(self, total: int, progreso: Optional[Callable[[int, int], None]],
+                 cancelado: Optional[Callable[[], bool]]):
+        self.total = total
+        self.hechos = 0
+        self._progreso = progreso
+        self._cancelado = cancelado
+
+    def avanzar(self) -> None:
+        self.hechos += 1
+        if self.hechos % INTERVALO_PROGRESO == 0:
+            self.notificar()
+
+    def notificar(self) -> None:
+        if self._cancelado and self._cancelado():
+            raise ExportacionCancelada()
+        if self._progreso:
+            self._progreso(self.hechos, self.total)
+
+
+def _escribir_json(enlaces: Iterable[Dict[str, Any]], categorias: List[str],
+                   archivo: TextIO, avance: _Avance) -> None:
+    """Escribe el documento de la aplicación enlace a enlace."""
+    archivo.write(f'{{\n  "version": {VERSION_ACTUAL},\n  "categorias": ')
+    archivo.write(json.dumps(categorias, ensure_ascii=False))
+    archivo.write(',\n  "links": [')
+    separador = '\n    '
+    for enlace in enlaces:
+        archivo.write(separador)
+        archivo.write(json.dumps(dict(enlace), ensure_ascii=False))
+        separador = ',\n    '
+        avance.avanzar()
+    archivo.write('\n  ]\n}\n')
+
+
+def _escribir_ndjson(enlaces: Iterable[Dict[str, Any]], categorias: List[str],
+                     archivo: TextIO, avance: _Avance) -> None:
+    """Escribe un enlace JSON por línea."""
+    for enlace in enlaces:
+        archivo.write(json.dumps(dict(enlace), ensure_ascii=False))
+        archivo.write('\n')
+        avance.avanzar()
+
+
+def _escribir_csv(enlaces: Iterable[Dict[str, Any]], categorias: List[str],
+                  archivo: TextIO, avance: _Avance) -> None:
+    """Escribe un enlace por fila con los tags separados por comas."""
+    escritor = csv.writer(archivo)
+    escritor.writerow(COLUMNAS_CSV)
+    for enlace in enlaces:
+        escritor.writerow([
+            enlace.get('id', ''),
+            enlace.get('titulo', ''),
+            enlace.get('url', ''),
+            enlace.get('categoria', ''),
+            ','.join(enlace.get('tags', [])),
+            'true' if enlace.get('es_favorito', False) else 'false',
+            enlace.get('creado_en', ''),
+            enlace.get('actualizado_en', ''),
+        ])
+        avance.avanzar()
+
+
+def _epoch(timestamp: Optional[str]) -> str:
+    """Convierte un timestamp ISO a segundos Unix para los atributos HTML."""
+    dt = parsear_timestamp(timestamp)
+    return str(int(dt.timestamp())) if dt else "0"
+
+
+def _escribir_html(enlaces: Iterable[Dict[str, Any]], categorias: List[str],
+                   archivo: TextIO, avance: _Avance) -> None:
+    """Escribe el formato de marcadores Netscape con una carpeta por categoría."""
+    # Agrupar solo referencias: los enlaces no se copian
+    grupos: Dict[str, List[Dict[str, Any]]] = {categoria: [] for categoria in categorias}
+    for enlace in enlaces:
+        grupos.setdefault(enlace.get('categoria', ''), []).append(enlace)
+
+    archivo.write(
+        '<!DOCTYPE NETSCAPE-Bookmark-file-1>\n'
+        '<!-- This is an automatically generated file.\n'
+        '     It will be read and overwritten.\n'
+        '     DO NOT EDIT! -->\n'
+        '<META HTTP-EQUIV="Content-Type" CONTENT="text/html; charset=UTF-8">\n'
+        '<TITLE>Bookmarks</TITLE>\n'
+        '<H1>Bookmarks</H1>\n'
+        '<DL><p>\n'
+    )
+    for categoria, miembros in grupos.items():
+        if not miembros:
+            continue
+        archivo.write(f'    <DT><H3>{html.escape(categoria)}</H3>\n    <DL><p>\n')
+        for enlace in miembros:
+            tags = ','.join(enlace.get('tags', []))
+            archivo.write(
+                f'        <DT><A HREF="{html.escape(enlace.get("url", ""))}"'
+                f' ADD_DATE="{_epoch(enlace.get("creado_en"))}"'
+                f' LAST_MODIFIED="{_epoch(enlace.get("actualizado_en"))}"'
+                + (f' TAGS="{html.escape(tags)}"' if tags else '')
+                + f'>{html.escape(enlace.get("titulo", ""))}</A>\n'
+            )
+            avance.avanzar()
+        archivo.write('    </DL><p>\n')
+    archivo.write('</DL><p>\n')
+
+
+_ESCRITORES = {
+    FORMATO_JSON: _escribir_json,
+    FORMATO_NDJSON: _escribir_ndjson,
+    FORMATO_CSV: _escribir_csv,
+    FORMATO_HTML: _escribir_html,
+}
+
+
+def exportar_enlaces(enlaces: Sequence[Dict[str, Any]], ruta: Path, formato: Optional[str] = None,
+                     categorias: Optional[List[str]] = None,
+                     progreso: Optional[Callable[[int, int], None]] = None,
+                     cancelado: Optional[Callable[[], bool]] = None) -> int:
+    """
+    Exporta enlaces a un archivo en el formato indicado.
+
+    Args:
+        enlaces: Enlaces a exportar
+        ruta: Archivo de destino
+        formato: Formato de salida (por defecto según la extensión)
+        categorias: Categorías del documento (JSON y carpetas vacías en HTML)
+        progreso: Función llamada con (exportados, total) periódicamente
+        cancelado: Función que devuelve True para abortar la exportación
+
+    Returns:
+        Número de enlaces exportados
+
+    Raises:
+        ExportacionCancelada: Si se canceló; el destino queda intacto
+        OSError: Si no se pudo escribir el archivo
+    """
+    formato = formato or formato_por_extension(ruta)
+    escritor = _ESCRITORES[formato]
+    avance = _Avance(len(enlaces), progreso, cancelado)
+    temporal = ruta.with_name(ruta.name + '.tmp')
+
+    try:
+        # CSV necesita newline='' para controlar él mismo los finales de línea
+        with open(temporal, 'w', encoding='utf-8', newline='' if formato == FORMATO_CSV else None) as archivo:
+            escritor(enlaces, list(categorias or []), archivo, avance)
+        os.replace(temporal, ruta)
+    except BaseException:
+        temporal.unlink(missing_ok=True)
+        raise
+
+    if progreso:
+        progreso(avance.hechos, avance.total)
+    logger.info(f"{avance.hechos} enlaces exportados a {ruta} ({formato})")
+    return avance.hechos
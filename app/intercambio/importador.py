@@ -0,0 +1,117 @@
+"""
+Importación por lotes de registros de enlaces en el repositorio.
+"""
+import logging
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+from .normalizacion import normalizar_registro
+from ..utils.time import obtener_timestamp_actual
+
+
+logger = logging.getLogger(__name__)
+
+TAMANO_LOTE = 1000
+
+
+def normalizar_en_lotes(registros: Iterable[Any], tamano_lote: int = TAMANO_LOTE,
+                        estadisticas: Optional[Dict[str, int]] = None,
+                        cancelado: Optional[Callable[[], bool]] = None,
+                        timestamp_actual: Optional[str] = None) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Valida y normaliza registros agrupándolos en lotes.
+
+    Args:
+        registros: Registros leídos del archivo de origen
+        tamano_lote: Número máximo de enlaces por lote
+        estadisticas: Diccionario donde acumular 'leidos' e 'invalidos'
+        cancelado: Función que devuelve True para detener la lectura
+        timestamp_actual: Timestamp para registros sin fecha (por defecto el actual)
+
+    Yields:
+        Listas de enlaces normalizados
+    """
+    if estadisticas is None:
+        estadisticas = {}
+    estadisticas.setdefault('leidos', 0)
+    estadisticas.setdefault('invalidos', 0)
+
+    timestamp_actual = timestamp_actual or obtener_timestamp_actual()
+    lote = []
+    for registro in registros:
+        if cancelado and cancelado():
+            return
+
+        estadisticas['leidos'] += 1
+        enlace = normalizar_registro(registro, timestamp_actual)
+        if enlace is None:
+            estadisticas['invalidos'] += 1
+            continue
+
+        lote.append(enlace)
+        if len(lote) >= tamano_lote:
+            yield lote
+            lote = []
+
+    if lote:
+        yield lote
+
+
+class SesionImportacion:
+    """
+    Fusiona lotes de enlaces normalizados con un repositorio.
+
+    Los enlaces existentes se indexan una sola vez al empezar, así cada lote
+    se fusiona en tiempo proporcional a su tamaño. Los registros normalizados
+    para esta sesión deben usar su timestamp (self.timestamp) como fecha por
+    defecto, para que los registros sin fecha no ganen por última escritura.
+    """
+
+    def __init__(self, repositorio):
+        """
+        Inicializa la sesión.
+
+        Args:
+            repositorio: RepositorioEnlaces destino
+        """
+        self.repositorio = repositorio
+        self.timestamp = obtener_timestamp_actual()
+        self.contadores = {'agregados': 0, 'actualizados': 0, 'omitidos': 0}
+        self._indice = repositorio.crear_indice_fusion(self.timestamp)
+
+    @property
+    def agregados(self) -> int:
+        """Enlaces agregados hasta el momento."""
+        return self.contadores['agregados']
+
+    def incorporar(self, lote: List[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Fusiona un lote con el repositorio.
+
+        Args:
+            lote: Enlaces normalizados
+
+        Returns:
+            Contadores del lote
+        """
+        resultado = self.repositorio.fusionar_enlaces(lote, self._indice)
+        for clave, valor in resultado.items():
+            self.contadores[clave] += valor
+        return resultado
+
+    def incorporar_categorias(self, categorias: Iterable[str]) -> None:
+        """
+        Agrega las categorías declaradas por el archivo de origen.
+
+        Args:
+            categorias: Nombres de categoría
+        """
+        for categoria in categorias:
+            self.repositorio.agregar_categoria(categoria)
+
+    def resumen(self) -> Dict[str, int]:
+        """
+        Obtiene los contadores de la sesión.
+
+        Returns:
+            Diccionario con 'agregados', 'actualizados' y 'omitidos'
+        """
+        return dict(self.contadores)
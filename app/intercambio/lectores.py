@@ -0,0 +1,215 @@
+"""
+Lectura incremental de archivos de enlaces (JSON y NDJSON).
+
+Los lectores recorren el archivo por bloques y devuelven los registros de
+uno en uno, de modo que la memoria usada no depende del tamaño del archivo.
+"""
+import codecs
+import json
+import logging
+import re
+from pathlib import Path
+from typing import Any, BinaryIO, Iterator, List
+
+
+logger = logging.getLogger(__name__)
+
+FORMATO_JSON = 'json'
+FORMATO_NDJSON = 'ndjson'
+EXTENSIONES_NDJSON = ('.ndjson', '.jsonl')
+TAMANO_BLOQUE = 64 * 1024
+
+_DECODIFICADOR = json.JSONDecoder()
+_ESPACIOS = re.compile(r'\s*')
+
+
+class ErrorFormato(ValueError):
+    """El archivo no tiene la estructura JSON esperada."""
+
+
+def detectar_formato(ruta: Path) -> str:
+    """
+    Detecta si un archivo es un documento JSON o NDJSON.
+
+    Se decide por la extensión y, si no es concluyente, por la primera línea:
+    en NDJSON es un objeto completo que no es el documento de la aplicación.
+
+    Args:
+        ruta: Ruta al archivo
+
+    Returns:
+        FORMATO_JSON o FORMATO_NDJSON
+    """
+    if ruta.suffix.lower() in EXTENSIONES_NDJSON:
+        return FORMATO_NDJSON
+
+    with open(ruta, 'rb') as archivo:
+        primera_linea = archivo.readline(TAMANO_BLOQUE)
+
+    try:
+        registro = json.loads(primera_linea.decode('utf-8-sig'))
+    except (ValueError, UnicodeDecodeError):
+        return FORMATO_JSON
+
+    if isinstance(registro, dict) and 'links' not in registro:
+        return FORMATO_NDJSON
+    return FORMATO_JSON
+
+
+class _BufferTexto:
+    """
+    Ventana deslizante sobre un archivo UTF-8 leído por bloques.
+    """
+
+    def __init__(self, archivo: BinaryIO, tamano_bloque: int):
+        self._archivo = archivo
+        self._tamano_bloque = tamano_bloque
+        self._decodificador = codecs.getincrementaldecoder('utf-8-sig')()
+        self.texto = ""
+        self.pos = 0
+        self.fin = False
+        self.bytes_leidos = 0
+
+    def leer_mas(self) -> bool:
+        """Descarta el texto consumido y añade el siguiente bloque."""
+        if self.fin:
+            return False
+
+        bloque = self._archivo.read(self._tamano_bloque)
+        self.bytes_leidos += len(bloque)
+        if not bloque:
+            self.fin = True
+
+        self.texto = self.texto[self.pos:] + self._decodificador.decode(bloque, final=self.fin)
+        self.pos = 0
+        return True
+
+    def caracter(self) -> str:
+        """Devuelve el siguiente carácter no blanco sin consumirlo ('' al final)."""
+        while True:
+            self.pos = _ESPACIOS.match(self.texto, self.pos).end()
+            if self.pos < len(self.texto) or not self.leer_mas():
+                break
+        return self.texto[self.pos] if self.pos < len(self.texto) else ""
+
+    def consumir(self, esperado: str) -> None:
+        """Consume un carácter estructural o lanza ErrorFormato."""
+        encontrado = self.caracter()
+        if encontrado != esperado:
+            raise ErrorFormato(f"Se esperaba '{esperado}' y se encontró '{encontrado or 'fin de archivo'}'")
+        self.pos += 1
+
+    def valor(self) -> Any:
+        """Decodifica el siguiente valor JSON completo."""
+        self.caracter()
+        while True:
+            pendiente = len(self.texto) - self.pos
+            try:
+                valor, fin = _DECODIFICADOR.raw_decode(self.texto, self.pos)
+                # Un número al final del bloque podría continuar en el siguiente
+                if fin < len(self.texto) or self.fin:
+                    self.pos = fin
+                    return valor
+            except json.JSONDecodeError as e:
+                if self.fin:
+                    raise ErrorFormato(str(e)) from e
+
+            # Duplicar la ventana para no redecodificar valores grandes bloque a bloque
+            while not self.fin and len(self.texto) - self.pos < 2 * pendiente + 1:
+                self.leer_mas()
+
+
+class LectorEnlaces:
+    """
+    Recorre los registros de enlaces de un archivo JSON o NDJSON.
+
+    Acepta el documento de la aplicación ({"version", "categorias", "links"}),
+    un array JSON de enlaces o un enlace por línea (NDJSON). Los registros se
+    devuelven tal cual; la validación corresponde a normalizar_registro.
+    """
+
+    def __init__(self, ruta: Path, tamano_bloque: int = TAMANO_BLOQUE):
+        """
+        Inicializa el lector.
+
+        Args:
+            ruta: Ruta al archivo
+            tamano_bloque: Bytes leídos en cada bloque
+        """
+        self.ruta = ruta
+        self.tamano_bloque = tamano_bloque
+        self.formato = detectar_formato(ruta)
+        self.tamano_total = ruta.stat().st_size
+        self.bytes_leidos = 0
+        self.lineas_invalidas = 0
+        self.categorias: List[str] = []
+
+    @property
+    def progreso(self) -> int:
+        """Porcentaje del archivo leído."""
+        if not self.tamano_total:
+            return 100
+        return min(100, self.bytes_leidos * 100 // self.tamano_total)
+
+    def __iter__(self) -> Iterator[Any]:
+        with open(self.ruta, 'rb') as archivo:
+            if self.formato == FORMATO_NDJSON:
+                yield from self._iterar_ndjson(archivo)
+            else:
+                yield from self._iterar_json(archivo)
+
+    def _iterar_ndjson(self, archivo: BinaryIO) -> Iterator[Any]:
+        for numero, linea in enumerate(archivo, 1):
+            self.bytes_leidos += len(linea)
+            linea = linea.strip()
+            if not linea:
+                continue
+            try:
+                yield json.loads(linea.decode('utf-8-sig'))
+            except (ValueError, UnicodeDecodeError) as e:
+                self.lineas_invalidas += 1
+                logger.warning(f"Línea {numero} inválida en {self.ruta}: {e}")
+
+    def _iterar_json(self, archivo: BinaryIO) -> Iterator[Any]:
+        buffer = _BufferTexto(archivo, self.tamano_bloque)
+        try:
+            if buffer.caracter() == '[':
+                yield from self._iterar_array(buffer)
+            else:
+                yield from self._iterar_documento(buffer)
+        finally:
+            self.bytes_leidos = buffer.bytes_leidos
+
+    def _iterar_documento(self, buffer: _BufferTexto) -> Iterator[Any]:
+        buffer.consumir('{')
+        if buffer.caracter() == '}':
+            return
+
+        while True:
+            clave = buffer.valor()
+            buffer.consumir(':')
+            if clave == 'links' and buffer.caracter() == '[':
+                yield from self._iterar_array(buffer)
+            else:
+                valor = buffer.valor()
+                if clave == 'categorias' and isinstance(valor, list):
+                    self.categorias.extend(c for c in valor if isinstance(c, str))
+
+            if buffer.caracter() != ',':
+                buffer.consumir('}')
+                return
+            buffer.pos += 1
+
+    def _iterar_array(self, buffer: _BufferTexto) -> Iterator[Any]:
+        buffer.consumir('[')
+        if buffer.caracter() == ']':
+            buffer.pos += 1
+            return
+
+        while True:
+            yield buffer.valor()
+            self.bytes_leidos = buffer.bytes_leidos
+            if buffer.caracter() != ',':
+                buffer.consumir(']')
+                return
+            buffer.pos += 1
@@ -0,0 +1,367 @@
+"""
+Lectores de marcadores de navegadores.
+
+Soporta el formato HTML de Netscape (exportación de cualquier navegador),
+el archivo Bookmarks de Chromium/Chrome/Edge y la base de datos places.sqlite
+de Firefox. Todos devuelven registros con los campos de links.json: la ruta
+de carpetas se convierte en la categoría y las palabras clave y etiquetas
+del navegador en tags.
+"""
+import codecs
+import json
+import logging
+import shutil
+import sqlite3
+import tempfile
+from datetime import datetime, timedelta
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+SEPARADOR_CARPETAS = " / "
+TAMANO_BLOQUE = 64 * 1024
+
+# Chromium guarda microsegundos desde 1601-01-01 (época de Windows)
+_EPOCA_CHROMIUM = datetime(1601, 1, 1)
+
+
+def _categoria(carpetas: List[str]) -> str:
+    """Convierte una ruta de carpetas en nombre de categoría."""
+    return SEPARADOR_CARPETAS.join(nombre for nombre in carpetas if nombre)
+
+
+def es_url_web(url: str) -> bool:
+    """True si el marcador apunta a una página web (no place:, javascript:, etc.)."""
+    return url.lower().startswith(('http://', 'https://'))
+
+
+def _desde_epoch(segundos: Any) -> Optional[str]:
+    """Convierte segundos Unix a timestamp ISO."""
+    try:
+        return datetime.fromtimestamp(int(segundos)).isoformat()
+    except (TypeError, ValueError, OverflowError, OSError):
+        return None
+
+
+def _desde_chromium(microsegundos: Any) -> Optional[str]:
+    """Convierte un timestamp de Chromium a ISO."""
+    try:
+        valor = int(microsegundos)
+        if valor <= 0:
+            return None
+        return (_EPOCA_CHROMIUM + timedelta(microseconds=valor)).isoformat()
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+class _AnalizadorNetscape(HTMLParser):
+    """Analizador incremental del formato de marcadores Netscape."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.registros: List[Dict[str, Any]] = []
+        self.omitidos = 0
+        self.carpetas: List[str] = []
+        self._carpeta_pendiente = ""
+        self._en_titulo_carpeta = False
+        self._enlace: Optional[Dict[str, Any]] = None
+        self._texto: List[str] = []
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        if tag == 'h3':
+            self._en_titulo_carpeta = True
+            self._texto = []
+        elif tag == 'dl':
+            # La lista que sigue a un <H3> contiene esa carpeta; la primera es la raíz
+            self.carpetas.append(self._carpeta_pendiente)
+            self._carpeta_pendiente = ""
+        elif tag == 'a':
+            atributos = {nombre.lower(): valor or "" for nombre, valor in attrs}
+            tags = [etiqueta for etiqueta in atributos.get('tags', '').split(',') if etiqueta.strip()]
+            if atributos.get('shortcuturl'):
+                tags.append(atributos['shortcuturl'])
+            self._enlace = {
+                'url': atributos.get('href', ''),
+                'categoria': _categoria(self.carpetas),
+                'tags': tags,
+                'creado_en': _desde_epoch(atributos.get('add_date')),
+                'actualizado_en': _desde_epoch(atributos.get('last_modified')),
+            }
+            self._texto = []
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == 'h3' and self._en_titulo_carpeta:
+            self._en_titulo_carpeta = False
+            self._carpeta_pendiente = "".join(self._texto).strip()
+        elif tag == 'dl' and self.carpetas:
+            self.carpetas.pop()
+        elif tag == 'a' and self._enlace is not None:
+            self._enlace['titulo'] = "".join(self._texto).strip()
+            if es_url_web(self._enlace['url']):
+                self.registros.append(self._enlace)
+            else:
+                self.omitidos += 1
+            self._enlace = None
+
+    def handle_data(self, data: str) -> None:
+        if self._en_titulo_carpeta or self._enlace is not None:
+            self._texto.append(data)
+
+
+class LectorMarcadoresHTML:
+    """
+    Lee un archivo de marcadores HTML (Netscape) por bloques con html.parser.
+    """
+
+    def __init__(self, ruta: Path, tamano_bloque: int = TAMANO_BLOQUE):
+        """
+        Inicializa el lector.
+
+        Args:
+            ruta: Ruta al archivo HTML
+            tamano_bloque: Caracteres analizados en cada bloque
+        """
+        self.ruta = ruta
+        self.tamano_bloque = tamano_bloque
+        self.tamano_total = ruta.stat().st_size
+        self.bytes_leidos = 0
+        self.lineas_invalidas = 0
+        self.categorias: List[str] = []
+
+    @property
+    def progreso(self) -> int:
+        """Porcentaje del archivo leído."""
+        if not self.tamano_total:
+            return 100
+        return min(100, self.bytes_leidos * 100 // self.tamano_total)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        analizador = _AnalizadorNetscape()
+        with open(self.ruta, 'rb') as archivo:
+            decodificador = codecs.getincrementaldecoder('utf-8-sig')(errors='replace')
+            while True:
+                bloque = archivo.read(self.tamano_bloque)
+                self.bytes_leidos += len(bloque)
+                if bloque:
+                    analizador.feed(decodificador.decode(bloque))
+                else:
+                    analizador.feed(decodificador.decode(b'', final=True))
+                    analizador.close()
+
+                yield from analizador.registros
+                analizador.registros.clear()
+                self.lineas_invalidas = analizador.omitidos
+                if not bloque:
+                    return
+
+
+class LectorMarcadoresChromium:
+    """
+    Lee el archivo Bookmarks (JSON) de Chromium, Chrome o Edge.
+
+    El archivo se carga completo: es un único objeto JSON anidado y, aun con
+    decenas de miles de marcadores, ocupa pocos megabytes.
+    """
+
+    def __init__(self, ruta: Path):
+        """
+        Inicializa el lector.
+
+        Args:
+            ruta: Ruta al archivo Bookmarks
+        """
+        self.ruta = ruta
+        self.lineas_invalidas = 0
+        self.categorias: List[str] = []
+        self._total = 0
+        self._leidos = 0
+
+    @property
+    def progreso(self) -> int:
+        """Porcentaje de marcadores recorridos."""
+        if not self._total:
+            return 0
+        return min(100, self._leidos * 100 // self._total)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        with open(self.ruta, encoding='utf-8-sig') as archivo:
+            raices = json.load(archivo).get('roots', {})
+
+        pila = [([], nodo) for nodo in reversed(list(raices.values())) if isinstance(nodo, dict)]
+        self._total = len(pila)
+        while pila:
+            carpetas, nodo = pila.pop()
+            self._leidos += 1
+            if nodo.get('type') == 'url':
+                if not es_url_web(nodo.get('url', '')):
+                    self.lineas_invalidas += 1
+                    continue
+                yield {
+                    'titulo': nodo.get('name', ''),
+                    'url': nodo.get('url', ''),
+                    'categoria': _categoria(carpetas),
+                    'creado_en': _desde_chromium(nodo.get('date_added')),
+                    'actualizado_en': _desde_chromium(nodo.get('date_modified') or nodo.get('date_added')),
+                }
+            else:
+                hijos = [hijo for hijo in nodo.get('children', []) if isinstance(hijo, dict)]
+                ruta_hijos = carpetas + [nodo.get('name', '')]
+                pila.extend((ruta_hijos, hijo) for hijo in reversed(hijos))
+                self._total += len(hijos)
+
+
+class LectorMarcadoresFirefox:
+    """
+    Lee los marcadores de la base de datos places.sqlite de Firefox.
+
+    La base se abre en solo lectura; si Firefox la tiene bloqueada se trabaja
+    sobre una copia temporal. Las etiquetas y palabras clave de Firefox se
+    convierten en tags.
+    """
+
+    # Carpetas raíz de Firefox y nombres legibles
+    RAICES = {
+        'menu________': 'Menú de marcadores',
+        'toolbar_____': 'Barra de marcadores',
+        'unfiled_____': 'Otros marcadores',
+        'mobile______': 'Marcadores del móvil',
+    }
+    RAIZ_ETIQUETAS = 'tags________'
+
+    def __init__(self, ruta: Path):
+        """
+        Inicializa el lector.
+
+        Args:
+            ruta: Ruta a places.sqlite
+        """
+        self.ruta = ruta
+        self.lineas_invalidas = 0
+        self.categorias: List[str] = []
+        self._total = 0
+        self._leidos = 0
+
+    @property
+    def progreso(self) -> int:
+        """Porcentaje de marcadores recorridos."""
+        if not self._total:
+            return 0
+        return min(100, self._leidos * 100 // self._total)
+
+    def _conectar(self, directorio_temporal: List[Path]) -> sqlite3.Connection:
+        """Abre places.sqlite en solo lectura, copiándolo si está bloqueado."""
+        conexion = sqlite3.connect(f"{self.ruta.resolve().as_uri()}?mode=ro", uri=True)
+        try:
+            conexion.execute("SELECT 1 FROM moz_bookmarks LIMIT 1")
+            return conexion
+        except sqlite3.OperationalError as e:
+            conexion.close()
+            if 'locked' not in str(e):
+                raise
+
+        logger.info(f"{self.ruta} bloqueado por Firefox, leyendo una copia")
+        directorio = Path(tempfile.mkdtemp(prefix="tlv_places_"))
+        directorio_temporal.append(directorio)
+        for sufijo in ('', '-wal'):
+            origen = self.ruta.with_name(self.ruta.name + sufijo)
+            if origen.exists():
+                shutil.copy(origen, directorio / origen.name)
+        return sqlite3.connect(f"{(directorio / self.ruta.name).as_uri()}?mode=ro", uri=True)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        directorio_temporal: List[Path] = []
+        conexion = self._conectar(directorio_temporal)
+        try:
+            yield from self._recorrer(conexion)
+        finally:
+            conexion.close()
+            for directorio in directorio_temporal:
+                shutil.rmtree(directorio, ignore_errors=True)
+
+    def _recorrer(self, conexion: sqlite3.Connection) -> Iterator[Dict[str, Any]]:
+        # Carpetas: id -> (padre, título); las raíces llevan nombre legible
+        carpetas = {}
+        raiz_etiquetas = None
+        for id_carpeta, padre, titulo, guid in conexion.execute(
+                "SELECT id, parent, title, guid FROM moz_bookmarks WHERE type = 2"):
+            if guid == self.RAIZ_ETIQUETAS:
+                raiz_etiquetas = id_carpeta
+            carpetas[id_carpeta] = (padre, self.RAICES.get(guid, titulo or ""))
+
+        rutas = {}
+
+        def ruta_carpeta(id_carpeta: int) -> List[str]:
+            if id_carpeta not in rutas:
+                padre, titulo = carpetas.get(id_carpeta, (None, ""))
+                rutas[id_carpeta] = (ruta_carpeta(padre) if padre in carpetas and padre != id_carpeta else []) + [titulo]
+            return rutas[id_carpeta]
+
+        # Etiquetas: marcadores dentro de una subcarpeta de la raíz de etiquetas
+        etiquetas: Dict[int, List[str]] = {}
+        if raiz_etiquetas is not None:
+            for lugar, etiqueta in conexion.execute(
+                    "SELECT b.fk, t.title FROM moz_bookmarks b "
+                    "JOIN moz_bookmarks t ON t.id = b.parent "
+                    "WHERE b.type = 1 AND t.parent = ?", (raiz_etiquetas,)):
+                etiquetas.setdefault(lugar, []).append(etiqueta or "")
+
+        self._total = conexion.execute("SELECT COUNT(*) FROM moz_bookmarks WHERE type = 1").fetchone()[0]
+        cursor = conexion.execute(
+            "SELECT b.parent, b.title, p.url, b.dateAdded, b.lastModified, b.fk, k.keyword "
+            "FROM moz_bookmarks b JOIN moz_places p ON p.id = b.fk "
+            "LEFT JOIN moz_keywords k ON k.place_id = b.fk "
+            "WHERE b.type = 1 ORDER BY b.parent, b.position"
+        )
+        etiquetadas = {id_carpeta for id_carpeta, (padre, _) in carpetas.items() if padre == raiz_etiquetas}
+        for padre, titulo, url, creado, modificado, lugar, palabra_clave in cursor:
+            self._leidos += 1
+            if padre in etiquetadas:
+                continue
+            if not es_url_web(url or ""):
+                self.lineas_invalidas += 1
+                continue
+
+            tags = list(etiquetas.get(lugar, []))
+            if palabra_clave:
+                tags.append(palabra_clave)
+            yield {
+                'titulo': titulo or "",
+                'url': url or "",
+                'categoria': _categoria(ruta_carpeta(padre)),
+                'tags': tags,
+                # Firefox guarda microsegundos Unix
+                'creado_en': _desde_epoch((creado or 0) // 1_000_000),
+                'actualizado_en': _desde_epoch((modificado or creado or 0) // 1_000_000),
+            }
+
+
+def abrir_lector(ruta: Path):
+    """
+    Elige el lector adecuado para un archivo de enlaces o marcadores.
+
+    Args:
+        ruta: Ruta al archivo
+
+    Returns:
+        Lector iterable de registros con progreso y categorías
+    """
+    from .lectores import LectorEnlaces
+
+    extension = ruta.suffix.lower()
+    if extension in ('.html', '.htm'):
+        return LectorMarcadoresHTML(ruta)
+    if extension in ('.sqlite', '.db') or ruta.name == 'places.sqlite':
+        return LectorMarcadoresFirefox(ruta)
+
+    with open(ruta, 'rb') as archivo:
+        inicio = archivo.read(TAMANO_BLOQUE).decode('utf-8', errors='ignore').lstrip('﻿ \t\r\n')
+    if inicio.startswith('<'):
+        return LectorMarcadoresHTML(ruta)
+    if inicio.startswith('SQLite format 3'):
+        return LectorMarcadoresFirefox(ruta)
+    if inicio.startswith('{') and '"roots"' in inicio:
+        return LectorMarcadoresChromium(ruta)
+    return LectorEnlaces(ruta)
@@ -0,0 +1,69 @@
+"""
+Validación y normalización de registros de enlaces importados.
+"""
+import uuid
+from typing import Any, Dict, Optional
+from ..utils.esquema import CATEGORIA_POR_DEFECTO
+from ..utils.time import obtener_timestamp_actual, parsear_timestamp
+from ..utils.validators import validar_url, limpiar_url, limpiar_tags
+
+
+def _texto(valor: Any) -> str:
+    """Convierte un valor opcional a texto sin espacios sobrantes."""
+    if valor is None:
+        return ""
+    return str(valor).strip()
+
+
+def _timestamp(valor: Any, por_defecto: str) -> str:
+    """Devuelve el timestamp si es ISO válido o el valor por defecto."""
+    if isinstance(valor, str) and parsear_timestamp(valor) is not None:
+        return valor
+    return por_defecto
+
+
+def normalizar_registro(registro: Any, timestamp_actual: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Valida un registro externo y lo convierte al formato de enlace de links.json.
+
+    Solo la URL es obligatoria: sin título se usa la URL, sin categoría se usa
+    la categoría por defecto, los tags pueden venir como lista o como texto
+    separado por comas y los timestamps inválidos se sustituyen por el actual.
+
+    Args:
+        registro: Registro leído del archivo de origen
+        timestamp_actual: Timestamp para campos ausentes (por defecto el actual)
+
+    Returns:
+        Enlace normalizado o None si el registro no es válido
+    """
+    if not isinstance(registro, dict):
+        return None
+
+    url = limpiar_url(_texto(registro.get('url')))
+    if not validar_url(url):
+        return None
+
+    tags = registro.get('tags')
+    if isinstance(tags, str):
+        tags = tags.split(',')
+    elif not isinstance(tags, (list, tuple)):
+        tags = []
+
+    enlace_id = registro.get('id')
+    if not isinstance(enlace_id, str) or not enlace_id.strip():
+        enlace_id = str(uuid.uuid4())
+
+    timestamp_actual = timestamp_actual or obtener_timestamp_actual()
+    creado_en = _timestamp(registro.get('creado_en'), timestamp_actual)
+
+    return {
+        "id": enlace_id.strip(),
+        "titulo": _texto(registro.get('titulo')) or url,
+        "url": url,
+        "categoria": _texto(registro.get('categoria')) or CATEGORIA_POR_DEFECTO,
+        "tags": limpiar_tags(list(tags)),
+        "es_favorito": bool(registro.get('es_favorito', False)),
+        "creado_en": creado_en,
+        "actualizado_en": _timestamp(registro.get('actualizado_en'), creado_en)
+    }
@@ -0,0 +1,131 @@
+"""
+Hilos de trabajo para importar y exportar sin bloquear la interfaz.
+"""
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+from PyQt6.QtCore import QThread, pyqtSignal
+from .escritores import exportar_enlaces, ExportacionCancelada
+from .importador import normalizar_en_lotes, TAMANO_LOTE
+from .navegadores import abrir_lector
+
+
+logger = logging.getLogger(__name__)
+
+
+class TrabajadorImportacion(QThread):
+    """
+    Lee y normaliza un archivo de enlaces o marcadores en segundo plano.
+
+    Los lotes se entregan al hilo de la interfaz con la señal lote_listo, que
+    es quien los incorpora al repositorio. Como mucho hay max_lotes_pendientes
+    lotes en vuelo: el hilo espera a que la interfaz llame a lote_procesado
+    antes de leer más, así la memoria no crece con el tamaño del archivo.
+    """
+
+    lote_listo = pyqtSignal(list)
+    progreso = pyqtSignal(int)
+    terminado = pyqtSignal(dict)
+    error = pyqtSignal(str)
+
+    def __init__(self, ruta: Path, tamano_lote: int = TAMANO_LOTE,
+                 max_lotes_pendientes: int = 4, timestamp_actual: Optional[str] = None,
+                 parent=None):
+        """
+        Inicializa el trabajador.
+
+        Args:
+            ruta: Archivo a importar
+            tamano_lote: Enlaces por lote
+            max_lotes_pendientes: Lotes emitidos sin procesar como máximo
+            timestamp_actual: Timestamp para registros sin fecha (el de la sesión)
+            parent: Objeto padre
+        """
+        super().__init__(parent)
+        self.ruta = ruta
+        self.tamano_lote = tamano_lote
+        self.timestamp_actual = timestamp_actual
+        self._pendientes = threading.Semaphore(max_lotes_pendientes)
+
+    def lote_procesado(self) -> None:
+        """Indica que la interfaz terminó de incorporar un lote."""
+        self._pendientes.release()
+
+    def _esperar_turno(self) -> bool:
+        """Espera hueco para emitir un lote; False si se canceló mientras tanto."""
+        while not self._pendientes.acquire(timeout=0.1):
+            if self.isInterruptionRequested():
+                return False
+        return True
+
+    def run(self) -> None:
+        try:
+            lector = abrir_lector(self.ruta)
+            estadisticas = {}
+            for lote in normalizar_en_lotes(lector, self.tamano_lote, estadisticas,
+                                            self.isInterruptionRequested, self.timestamp_actual):
+                if not self._esperar_turno():
+                    return
+                self.lote_listo.emit(lote)
+                self.progreso.emit(lector.progreso)
+
+            if self.isInterruptionRequested():
+                return
+
+            estadisticas['invalidos'] += lector.lineas_invalidas
+            estadisticas['categorias'] = lector.categorias
+            self.progreso.emit(100)
+            self.terminado.emit(estadisticas)
+
+        except (OSError, ValueError, sqlite3.Error) as e:
+            # ErrorFormato y los errores de JSON son ValueError
+            logger.error(f"Error al importar {self.ruta}: {e}")
+            self.error.emit(str(e))
+
+
+class TrabajadorExportacion(QThread):
+    """
+    Exporta una lista de enlaces a un archivo en segundo plano.
+
+    Los enlaces se reciben ya capturados (normalmente los de una instantánea
+    del repositorio) para que la interfaz pueda seguir modificándolo.
+    """
+
+    progreso = pyqtSignal(int)
+    terminado = pyqtSignal(int)
+    error = pyqtSignal(str)
+
+    def __init__(self, enlaces: Sequence[Dict[str, Any]], ruta: Path,
+                 formato: Optional[str] = None, categorias: Optional[List[str]] = None,
+                 parent=None):
+        """
+        Inicializa el trabajador.
+
+        Args:
+            enlaces: Enlaces a exportar
+            ruta: Archivo de destino
+            formato: Formato de salida (por defecto según la extensión)
+            categorias: Categorías del documento
+            parent: Objeto padre
+        """
+        super().__init__(parent)
+        self.enlaces = enlaces
+        self.ruta = ruta
+        self.formato = formato
+        self.categorias = categorias
+
+    def _notificar(self, hechos: int, total: int) -> None:
+        self.progreso.emit(hechos * 100 // total if total else 100)
+
+    def run(self) -> None:
+        try:
+            exportados = exportar_enlaces(self.enlaces, self.ruta, self.formato, self.categorias,
+                                          self._notificar, self.isInterruptionRequested)
+            self.terminado.emit(exportados)
+        except ExportacionCancelada:
+            logger.info(f"Exportación a {self.ruta} cancelada")
+        except OSError as e:
+            logger.error(f"Error al exportar a {self.ruta}: {e}")
+            self.error.emit(str(e))
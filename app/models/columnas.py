@@ -0,0 +1,361 @@
+"""
+Filtrado de enlaces por columnas con máscaras vectorizadas.
+
+Si NumPy está instalado el repositorio mantiene un AlmacenColumnar con una
+columna por campo filtrable (códigos de categoría, favorito, fechas en
+microsegundos y los tags en formato CSR). Los filtros compuestos se evalúan
+como máscaras booleanas y devuelven los índices de las filas que cumplen,
+que la tabla muestra sin copiar los enlaces. Sin NumPy se usa un recorrido
+en Python con el mismo resultado.
+"""
+import logging
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Union
+from .enlace import SIN_FECHA, EnlaceCompacto, clave_fecha, fecha_a_microsegundos, fecha_enlace
+from .eventos import EventoCambio
+from ..utils.validators import normalizar
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional
+    np = None
+
+
+logger = logging.getLogger(__name__)
+
+NUMPY_DISPONIBLE = np is not None
+
+Fecha = Union[datetime, str, int, None]
+
+
+class FiltroEnlaces(NamedTuple):
+    """
+    Criterios de filtrado combinables (todos deben cumplirse).
+
+    Attributes:
+        categoria: Categoría exacta ("" o "Todas" para no filtrar)
+        tag: Tag (se compara normalizado)
+        solo_favoritos: Mostrar solo favoritos
+        creado_desde: Fecha de creación mínima (incluida)
+        creado_hasta: Fecha de creación máxima (incluida)
+        actualizado_desde: Fecha de actualización mínima (incluida)
+        actualizado_hasta: Fecha de actualización máxima (incluida)
+    """
+    categoria: str = ""
+    tag: str = ""
+    solo_favoritos: bool = False
+    creado_desde: Fecha = None
+    creado_hasta: Fecha = None
+    actualizado_desde: Fecha = None
+    actualizado_hasta: Fecha = None
+
+
+def _limite(valor: Fecha) -> Optional[int]:
+    """Convierte un límite de fecha a microsegundos (None si no hay límite)."""
+    if valor is None:
+        return None
+    if isinstance(valor, datetime):
+        valor = valor.isoformat()
+    microsegundos = fecha_a_microsegundos(valor)
+    if microsegundos is None:
+        raise ValueError(f"Fecha de filtro no válida: {valor!r}")
+    return microsegundos
+
+
+def _tags_enlace(enlace: Any) -> Sequence:
+    """Tags del enlace sin crear una lista nueva si es compacto."""
+    tags = enlace.tags if isinstance(enlace, EnlaceCompacto) else enlace.get('tags', [])
+    return tags if isinstance(tags, (list, tuple)) else ()
+
+
+def _categoria_filtrada(filtro: FiltroEnlaces) -> str:
+    return "" if filtro.categoria == "Todas" else filtro.categoria
+
+
+def filtrar_filas_python(enlaces: Sequence, filtro: FiltroEnlaces) -> List[int]:
+    """
+    Filtra enlaces recorriéndolos en Python (sin NumPy).
+
+    Args:
+        enlaces: Enlaces del repositorio
+        filtro: Criterios de filtrado
+
+    Returns:
+        Índices de las filas que cumplen el filtro, en orden
+    """
+    categoria = _categoria_filtrada(filtro)
+    tag = normalizar(filtro.tag) if filtro.tag else ""
+    rangos = [
+        (campo, _limite(desde), _limite(hasta))
+        for campo, desde, hasta in (('creado_en', filtro.creado_desde, filtro.creado_hasta),
+                                    ('actualizado_en', filtro.actualizado_desde, filtro.actualizado_hasta))
+        if desde is not None or hasta is not None
+    ]
+
+    filas = []
+    for fila, enlace in enumerate(enlaces):
+        if categoria and enlace.get('categoria') != categoria:
+            continue
+        if filtro.solo_favoritos and not enlace.get('es_favorito', False):
+            continue
+        if tag and not any(normalizar(etiqueta) == tag for etiqueta in _tags_enlace(enlace)):
+            continue
+        fuera_de_rango = False
+        for campo, desde, hasta in rangos:
+            valor = fecha_enlace(enlace, campo)
+            if valor is None or (desde is not None and valor < desde) or (hasta is not None and valor > hasta):
+                fuera_de_rango = True
+                break
+        if not fuera_de_rango:
+            filas.append(fila)
+    return filas
+
+
+class AlmacenColumnar:
+    """
+    Columnas NumPy de los enlaces del repositorio.
+
+    Las filas siguen el orden de la lista de enlaces. El repositorio llama a
+    aplicar_evento tras cada cambio: las ediciones se aplican en su fila, los
+    enlaces agregados al final se anexan y los eliminados se quitan de las
+    columnas. Las recargas (o un cambio que no encaje con las filas
+    conocidas) marcan el almacén para reconstruirlo en el siguiente filtrado.
+    """
+
+    def __init__(self):
+        if np is None:
+            raise RuntimeError("AlmacenColumnar necesita NumPy")
+        self.filas = 0
+        self._sucio = True
+        self._tags_sucios = True
+        self._codigo_categoria: Dict[Any, int] = {}
+        self._codigo_tag: Dict[str, int] = {}
+        self._codigo_tag_original: Dict[Any, int] = {}
+        self._fila_por_id: Dict[Any, int] = {}
+        self.categoria = self.favorito = self.creado = self.actualizado = None
+        self.tag_inicio = self.tag_codigos = None
+
+    def _codigo_de_tag(self, tag: Any) -> int:
+        """Código del tag normalizado (cacheado por cadena original)."""
+        codigo = self._codigo_tag_original.get(tag)
+        if codigo is None:
+            normalizado = normalizar(tag) if isinstance(tag, str) else tag
+            codigo = self._codigo_tag.setdefault(normalizado, len(self._codigo_tag))
+            self._codigo_tag_original[tag] = codigo
+        return codigo
+
+    def _columnas(self, enlaces: Sequence) -> tuple:
+        """Construye las columnas escalares de una secuencia de enlaces (una sola pasada)."""
+        codigos = self._codigo_categoria
+        categorias: List[int] = []
+        favoritos: List[bool] = []
+        creados: List[int] = []
+        actualizados: List[int] = []
+        for enlace in enlaces:
+            categoria = enlace.get('categoria')
+            codigo = codigos.get(categoria)
+            if codigo is None:
+                codigo = codigos[categoria] = len(codigos)
+            categorias.append(codigo)
+            favoritos.append(bool(enlace.get('es_favorito', False)))
+            creados.append(clave_fecha(enlace, 'creado_en'))
+            actualizados.append(clave_fecha(enlace, 'actualizado_en'))
+        return (np.array(categorias, dtype=np.int32), np.array(favoritos, dtype=np.bool_),
+                np.array(creados, dtype=np.int64), np.array(actualizados, dtype=np.int64))
+
+    def _tags_csr(self, enlaces: Sequence, desplazamiento: int = 0) -> tuple:
+        """Construye los desplazamientos y códigos de tags (formato CSR)."""
+        codigos: List[int] = []
+        finales: List[int] = []
+        cache = self._codigo_tag_original
+        for enlace in enlaces:
+            for tag in _tags_enlace(enlace):
+                codigo = cache.get(tag)
+                codigos.append(self._codigo_de_tag(tag) if codigo is None else codigo)
+            finales.append(len(codigos))
+        return np.array(finales, dtype=np.int64) + desplazamiento, np.array(codigos, dtype=np.int32)
+
+    def reconstruir(self, enlaces: Sequence) -> None:
+        """
+        Reconstruye todas las columnas.
+
+        Args:
+            enlaces: Enlaces del repositorio
+        """
+        self._codigo_categoria = {}
+        self.categoria, self.favorito, self.creado, self.actualizado = self._columnas(enlaces)
+        self._fila_por_id = {enlace.get('id'): fila for fila, enlace in enumerate(enlaces)}
+        self.filas = len(enlaces)
+        self._sucio = False
+        self._reconstruir_tags(enlaces)
+        logger.debug(f"Almacén columnar reconstruido: {self.filas} filas")
+
+    def _reconstruir_tags(self, enlaces: Sequence) -> None:
+        finales, self.tag_codigos = self._tags_csr(enlaces)
+        self.tag_inicio = np.concatenate((np.zeros(1, dtype=np.int64), finales))
+        self._tags_sucios = False
+
+    def _anexar(self, enlaces: Sequence) -> None:
+        """Agrega filas al final sin reconstruir las existentes."""
+        nuevas = self._columnas(enlaces)
+        self.categoria, self.favorito, self.creado, self.actualizado = (
+            np.concatenate((actual, nueva)) for actual, nueva in
+            zip((self.categoria, self.favorito, self.creado, self.actualizado), nuevas)
+        )
+        for desplazamiento, enlace in enumerate(enlaces):
+            self._fila_por_id[enlace.get('id')] = self.filas + desplazamiento
+        self.filas += len(enlaces)
+
+        if not self._tags_sucios:
+            finales, codigos = self._tags_csr(enlaces, len(self.tag_codigos))
+            self.tag_inicio = np.concatenate((self.tag_inicio, finales))
+            self.tag_codigos = np.concatenate((self.tag_codigos, codigos))
+
+    def _actualizar_fila(self, fila: int, enlace: Any) -> None:
+        """Vuelve a leer los campos de un enlace editado."""
+        self.categoria[fila] = self._codigo_categoria.setdefault(enlace.get('categoria'), len(self._codigo_categoria))
+        self.favorito[fila] = bool(enlace.get('es_favorito', False))
+        self.creado[fila] = clave_fecha(enlace, 'creado_en')
+        self.actualizado[fila] = clave_fecha(enlace, 'actualizado_en')
+
+        if not self._tags_sucios:
+            codigos = [self._codigo_de_tag(tag) for tag in _tags_enlace(enlace)]
+            actuales = self.tag_codigos[self.tag_inicio[fila]:self.tag_inicio[fila + 1]]
+            if codigos != actuales.tolist():
+                # Cambiar la longitud de una fila desplaza todo el CSR
+                self._tags_sucios = True
+
+    def _quitar_filas(self, filas: List[int], enlaces: Sequence) -> None:
+        """Elimina filas conservando el orden relativo de las demás."""
+        conservar = np.ones(self.filas, dtype=np.bool_)
+        conservar[filas] = False
+        self.categoria, self.favorito, self.creado, self.actualizado = (
+            columna[conservar] for columna in (self.categoria, self.favorito, self.creado, self.actualizado)
+        )
+        if not self._tags_sucios:
+            longitudes = np.diff(self.tag_inicio)
+            self.tag_codigos = self.tag_codigos[np.repeat(conservar, longitudes)]
+            self.tag_inicio = np.concatenate((np.zeros(1, dtype=np.int64), np.cumsum(longitudes[conservar])))
+        self.filas -= len(filas)
+        # Las posiciones posteriores a cada fila eliminada se desplazan
+        self._fila_por_id = {enlace.get('id'): fila for fila, enlace in enumerate(enlaces[:self.filas])}
+
+    def aplicar_evento(self, evento: EventoCambio, enlaces: Sequence) -> None:
+        """
+        Sincroniza las columnas con un cambio del repositorio.
+
+        Args:
+            evento: Cambios emitidos por el repositorio
+            enlaces: Enlaces del repositorio tras el cambio
+        """
+        if self._sucio:
+            return
+        if evento.recarga:
+            self._sucio = True
+            return
+
+        if evento.eliminados:
+            filas = [self._fila_por_id.get(enlace_id) for enlace_id in evento.eliminados]
+            if None in filas or self.filas - len(filas) + len(evento.agregados) != len(enlaces):
+                self._sucio = True
+                return
+            self._quitar_filas(filas, enlaces)
+
+        if evento.agregados:
+            nuevos = enlaces[self.filas:]
+            if (len(nuevos) != len(evento.agregados)
+                    or any(enlace.get('id') not in evento.agregados for enlace in nuevos)):
+                self._sucio = True
+                return
+            self._anexar(nuevos)
+
+        for enlace_id in evento.actualizados:
+            fila = self._fila_por_id.get(enlace_id)
+            if fila is None or fila >= len(enlaces) or enlaces[fila].get('id') != enlace_id:
+                self._sucio = True
+                return
+            self._actualizar_fila(fila, enlaces[fila])
+
+    def filtrar(self, enlaces: Sequence, filtro: FiltroEnlaces) -> 'np.ndarray':
+        """
+        Evalúa un filtro compuesto como máscara booleana.
+
+        Args:
+            enlaces: Enlaces del repositorio (para reconstruir si hace falta)
+            filtro: Criterios de filtrado
+
+        Returns:
+            Array con los índices de las filas que cumplen el filtro, en orden
+        """
+        if self._sucio or self.filas != len(enlaces):
+            self.reconstruir(enlaces)
+
+        mascara = np.ones(self.filas, dtype=np.bool_)
+
+        categoria = _categoria_filtrada(filtro)
+        if categoria:
+            codigo = self._codigo_categoria.get(categoria)
+            if codigo is None:
+                return np.empty(0, dtype=np.intp)
+            mascara &= self.categoria == codigo
+
+        if filtro.solo_favoritos:
+            mascara &= self.favorito
+
+        for columna, desde, hasta in ((self.creado, filtro.creado_desde, filtro.creado_hasta),
+                                      (self.actualizado, filtro.actualizado_desde, filtro.actualizado_hasta)):
+            desde, hasta = _limite(desde), _limite(hasta)
+            if desde is not None:
+                mascara &= columna >= desde
+            if hasta is not None:
+                mascara &= (columna <= hasta) & (columna != SIN_FECHA)
+
+        if filtro.tag:
+            # Con los tags sucios _anexar no registra los códigos de tags
+            # nuevos: hay que reconstruir antes de buscar el código
+            if self._tags_sucios:
+                self._reconstruir_tags(enlaces)
+            codigo = self._codigo_tag.get(normalizar(filtro.tag))
+            if codigo is None:
+                return np.empty(0, dtype=np.intp)
+            posiciones = np.flatnonzero(self.tag_codigos == codigo)
+            con_tag = np.zeros(self.filas, dtype=np.bool_)
+            con_tag[np.searchsorted(self.tag_inicio, posiciones, side='right') - 1] = True
+            mascara &= con_tag
+
+        return np.flatnonzero(mascara)
+
+
+class VistaFilas(Sequence):
+    """
+    Secuencia de solo lectura con algunas filas de una lista de enlaces.
+
+    Permite mostrar el resultado de un filtro (índices) sin copiar los enlaces.
+    """
+
+    __slots__ = ('_enlaces', '_filas')
+
+    def __init__(self, enlaces: Sequence, filas: Sequence[int]):
+        """
+        Inicializa la vista.
+
+        Args:
+            enlaces: Lista completa de enlaces
+            filas: Índices de las filas visibles
+        """
+        self._enlaces = enlaces
+        self._filas = filas
+
+    def __len__(self) -> int:
+        return len(self._filas)
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return [self._enlaces[fila] for fila in self._filas[indice]]
+        return self._enlaces[self._filas[indice]]
+
+    def __iter__(self) -> Iterator[Any]:
+        enlaces = self._enlaces
+        for fila in self._filas:
+            yield enlaces[fila]
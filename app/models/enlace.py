@@ -0,0 +1,380 @@
+"""
+Representación compacta en memoria de los enlaces.
+
+Cada enlace del JSON es un diccionario con ocho claves, dos timestamps ISO y
+una lista nueva de tags. Con cientos de miles de enlaces eso ocupa cientos de
+MB y repite miles de veces las mismas cadenas de categoría y tag.
+
+EnlaceCompacto guarda los mismos campos en __slots__ (sin __dict__ por
+instancia), comparte una sola copia de cada categoría y tag, guarda los tags
+en tuplas y los timestamps como microsegundos enteros. Se comporta como un
+diccionario (MutableMapping), así que el resto de la aplicación y el formato
+en disco no cambian.
+"""
+import gc
+import sys
+from collections.abc import Mapping, MutableMapping
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+from ..utils.time import EPOCA
+
+
+CAMPOS_ENLACE = ('id', 'titulo', 'url', 'categoria', 'tags', 'es_favorito', 'creado_en', 'actualizado_en')
+_CONJUNTO_CAMPOS = frozenset(CAMPOS_ENLACE)
+_CAMPOS_FECHA = frozenset(('creado_en', 'actualizado_en'))
+
+_EPOCA = EPOCA
+_MICROSEGUNDO = timedelta(microseconds=1)
+
+
+class _Ausente:
+    """Marca de campo ausente (la clave no existe en el enlace)."""
+
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return '<ausente>'
+
+    def __reduce__(self) -> str:
+        # Al deserializar se recupera la misma instancia del módulo
+        return '_AUSENTE'
+
+
+_AUSENTE = _Ausente()
+
+
+def codificar_fecha(valor: Any) -> Union[int, Any]:
+    """
+    Convierte un timestamp ISO sin zona horaria a microsegundos enteros.
+
+    Solo se convierte si la conversión inversa reproduce exactamente la misma
+    cadena; en otro caso (zona horaria, otro formato) se conserva el valor.
+
+    Args:
+        valor: Timestamp leído del JSON
+
+    Returns:
+        Microsegundos desde 1970-01-01 o el valor original
+
+    >>> codificar_fecha('2024-05-01T10:30:00.250000')
+    1714559400250000
+    >>> codificar_fecha('2024-05-01T10:30:00+02:00')
+    '2024-05-01T10:30:00+02:00'
+    """
+    # isoformat() de un datetime sin zona produce exactamente
+    # AAAA-MM-DDTHH:MM:SS (19) o AAAA-MM-DDTHH:MM:SS.ffffff (26)
+    if type(valor) is not str or len(valor) not in (19, 26) or valor[10] != 'T' or valor[7] != '-':
+        return valor
+    try:
+        fecha = datetime.fromisoformat(valor)
+    except ValueError:
+        return valor
+    if fecha.tzinfo is not None or (len(valor) == 26) != bool(fecha.microsecond):
+        return valor
+
+    return (fecha - _EPOCA) // _MICROSEGUNDO
+
+
+def decodificar_fecha(valor: Any) -> Any:
+    """
+    Convierte un timestamp codificado con codificar_fecha a cadena ISO.
+
+    Args:
+        valor: Microsegundos enteros o valor original
+
+    Returns:
+        Timestamp ISO
+    """
+    if type(valor) is int:
+        return (_EPOCA + timedelta(microseconds=valor)).isoformat()
+    return valor
+
+
+def fecha_a_microsegundos(valor: Any) -> Optional[int]:
+    """
+    Obtiene los microsegundos desde 1970 de un timestamp guardado o ISO.
+
+    A diferencia de codificar_fecha acepta cualquier formato ISO; las fechas
+    con zona horaria se pasan a hora local sin zona, como las de la aplicación.
+
+    Args:
+        valor: Microsegundos ya codificados o timestamp ISO
+
+    Returns:
+        Microsegundos o None si el valor no es una fecha válida
+
+    >>> fecha_a_microsegundos('2024-05-01T10:30:00')
+    1714559400000000
+    >>> fecha_a_microsegundos('sin fecha') is None
+    True
+    """
+    if type(valor) is int:
+        return valor
+    try:
+        fecha = datetime.fromisoformat(valor)
+    except (TypeError, ValueError):
+        return None
+    if fecha.tzinfo is not None:
+        fecha = fecha.astimezone().replace(tzinfo=None)
+    return (fecha - _EPOCA) // _MICROSEGUNDO
+
+
+def _exportar(clave: str, valor: Any) -> Any:
+    """Convierte un campo guardado al valor que vería un diccionario de links.json."""
+    if clave in _CAMPOS_FECHA:
+        return decodificar_fecha(valor)
+    if clave == 'tags' and type(valor) is tuple:
+        # Lista nueva en cada acceso: la tupla compartida no se puede modificar por error
+        return list(valor)
+    return valor
+
+
+def _internar(valor: Any) -> Any:
+    """Comparte una única copia de las cadenas repetidas (categorías y tags)."""
+    return sys.intern(valor) if type(valor) is str else valor
+
+
+def _internar_tags(tags: Any) -> Any:
+    """Convierte una lista de tags en una tupla de cadenas compartidas."""
+    if isinstance(tags, (list, tuple)):
+        return tuple([sys.intern(tag) if type(tag) is str else tag for tag in tags])
+    return tags
+
+
+class EnlaceCompacto(MutableMapping):
+    """
+    Enlace con los campos de links.json en __slots__ y acceso de diccionario.
+
+    Los campos conocidos se guardan como atributos con el mismo nombre que la
+    clave; los tags como tupla y las fechas codificadas. El acceso como
+    diccionario devuelve los valores de links.json (tags en lista, fechas
+    ISO); el código que solo lee puede usar los atributos directamente. Las
+    claves que no forman parte del esquema se conservan en un diccionario aparte.
+    """
+
+    __slots__ = CAMPOS_ENLACE + ('extra',)
+
+    def __init__(self, datos: Union[Mapping, Iterable] = ()):
+        """
+        Inicializa el enlace.
+
+        Args:
+            datos: Diccionario (o pares clave-valor) con los campos del enlace
+        """
+        for campo in CAMPOS_ENLACE:
+            setattr(self, campo, _AUSENTE)
+        self.extra = None
+        self.update(datos)
+
+    @classmethod
+    def desde_dict(cls, datos: Dict[str, Any]) -> 'EnlaceCompacto':
+        """
+        Crea un enlace compacto a partir de un diccionario de links.json.
+
+        Es la vía rápida usada al cargar: asigna los campos directamente.
+
+        Args:
+            datos: Enlace con el formato de links.json
+
+        Returns:
+            Enlace compacto equivalente
+        """
+        enlace = cls.__new__(cls)
+        obtener = datos.get
+        enlace.id = obtener('id', _AUSENTE)
+        enlace.titulo = obtener('titulo', _AUSENTE)
+        enlace.url = obtener('url', _AUSENTE)
+        enlace.categoria = _internar(obtener('categoria', _AUSENTE))
+        enlace.tags = _internar_tags(obtener('tags', _AUSENTE))
+        enlace.es_favorito = obtener('es_favorito', _AUSENTE)
+        enlace.creado_en = codificar_fecha(obtener('creado_en', _AUSENTE))
+        enlace.actualizado_en = codificar_fecha(obtener('actualizado_en', _AUSENTE))
+        if datos.keys() <= _CONJUNTO_CAMPOS:
+            enlace.extra = None
+        else:
+            enlace.extra = {clave: valor for clave, valor in datos.items() if clave not in _CONJUNTO_CAMPOS}
+        return enlace
+
+    def __getitem__(self, clave: str) -> Any:
+        if clave in _CONJUNTO_CAMPOS:
+            valor = getattr(self, clave)
+            if valor is _AUSENTE:
+                raise KeyError(clave)
+            return _exportar(clave, valor)
+        if self.extra is None:
+            raise KeyError(clave)
+        return self.extra[clave]
+
+    def get(self, clave: str, por_defecto: Any = None) -> Any:
+        if clave in _CONJUNTO_CAMPOS:
+            valor = getattr(self, clave)
+            if valor is _AUSENTE:
+                return por_defecto
+            return _exportar(clave, valor)
+        if self.extra is None:
+            return por_defecto
+        return self.extra.get(clave, por_defecto)
+
+    def __setitem__(self, clave: str, valor: Any) -> None:
+        if clave == 'tags':
+            valor = _internar_tags(valor)
+        elif clave == 'categoria':
+            valor = _internar(valor)
+        elif clave in _CAMPOS_FECHA:
+            valor = codificar_fecha(valor)
+        elif clave not in _CONJUNTO_CAMPOS:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[clave] = valor
+            return
+        setattr(self, clave, valor)
+
+    def __delitem__(self, clave: str) -> None:
+        if clave in _CONJUNTO_CAMPOS:
+            if getattr(self, clave) is _AUSENTE:
+                raise KeyError(clave)
+            setattr(self, clave, _AUSENTE)
+            return
+        if self.extra is None:
+            raise KeyError(clave)
+        del self.extra[clave]
+        if not self.extra:
+            self.extra = None
+
+    def __contains__(self, clave: object) -> bool:
+        if clave in _CONJUNTO_CAMPOS:
+            return getattr(self, clave) is not _AUSENTE
+        return self.extra is not None and clave in self.extra
+
+    def __iter__(self) -> Iterator[str]:
+        for campo in CAMPOS_ENLACE:
+            if getattr(self, campo) is not _AUSENTE:
+                yield campo
+        if self.extra:
+            yield from self.extra
+
+    def __len__(self) -> int:
+        presentes = sum(1 for campo in CAMPOS_ENLACE if getattr(self, campo) is not _AUSENTE)
+        return presentes + (len(self.extra) if self.extra else 0)
+
+    def __eq__(self, otro: object) -> bool:
+        if isinstance(otro, EnlaceCompacto):
+            return self.a_dict() == otro.a_dict()
+        if isinstance(otro, Mapping):
+            return self.a_dict() == dict(otro)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"EnlaceCompacto({self.a_dict()!r})"
+
+    def __reduce__(self):
+        return (_restaurar, tuple(getattr(self, campo) for campo in self.__slots__))
+
+    def a_dict(self) -> Dict[str, Any]:
+        """
+        Convierte el enlace al diccionario de links.json.
+
+        Returns:
+            Diccionario nuevo con los tags en lista y las fechas en ISO
+        """
+        return dict(self.items())
+
+    def copy(self) -> Dict[str, Any]:
+        """Copia el enlace como diccionario independiente (igual que dict.copy)."""
+        return self.a_dict()
+
+
+def _restaurar(*valores: Any) -> EnlaceCompacto:
+    """Reconstruye un enlace serializado con pickle."""
+    enlace = EnlaceCompacto.__new__(EnlaceCompacto)
+    for campo, valor in zip(EnlaceCompacto.__slots__, valores):
+        setattr(enlace, campo, valor)
+    return enlace
+
+
+def compactar(enlace: Mapping) -> EnlaceCompacto:
+    """
+    Obtiene la versión compacta de un enlace.
+
+    Args:
+        enlace: Enlace como diccionario o ya compacto
+
+    Returns:
+        El mismo enlace si ya era compacto o uno nuevo equivalente
+    """
+    if isinstance(enlace, EnlaceCompacto):
+        return enlace
+    return EnlaceCompacto.desde_dict(enlace)
+
+
+def compactar_enlaces(enlaces: Iterable[Mapping]) -> List[EnlaceCompacto]:
+    """
+    Convierte una lista de enlaces a su representación compacta.
+
+    Args:
+        enlaces: Enlaces como diccionarios (los ya compactos se reutilizan)
+
+    Returns:
+        Lista nueva de enlaces compactos
+    """
+    # Crear cientos de miles de objetos dispara recolecciones completas que
+    # no liberan nada: se pausa el recolector mientras tanto
+    recolector_activo = gc.isenabled()
+    gc.disable()
+    try:
+        return [compactar(enlace) for enlace in enlaces]
+    finally:
+        if recolector_activo:
+            gc.enable()
+
+
+# Clave de ordenación de los enlaces sin fecha válida (antes que cualquier fecha)
+SIN_FECHA = -(2 ** 63)
+
+
+def fecha_guardada(enlace: Any, campo: str) -> Any:
+    """
+    Valor de una fecha tal como está guardada, sin convertirla a ISO.
+
+    Args:
+        enlace: Enlace compacto o diccionario
+        campo: 'creado_en' o 'actualizado_en'
+
+    Returns:
+        Microsegundos (enlaces compactos), el texto original o None si no hay fecha
+    """
+    if type(enlace) is EnlaceCompacto:
+        valor = getattr(enlace, campo)
+        return None if valor is _AUSENTE else valor
+    return enlace.get(campo)
+
+
+def fecha_enlace(enlace: Any, campo: str) -> Optional[int]:
+    """
+    Microsegundos de una fecha del enlace (sin pasar por la cadena ISO si es compacto).
+
+    Args:
+        enlace: Enlace compacto o diccionario
+        campo: 'creado_en' o 'actualizado_en'
+
+    Returns:
+        Microsegundos o None si la fecha falta o no es válida
+    """
+    return fecha_a_microsegundos(fecha_guardada(enlace, campo))
+
+
+def clave_fecha(enlace: Any, campo: str) -> int:
+    """
+    Clave entera para ordenar o comparar enlaces por fecha.
+
+    Args:
+        enlace: Enlace compacto o diccionario
+        campo: 'creado_en' o 'actualizado_en'
+
+    Returns:
+        Microsegundos, o SIN_FECHA si la fecha falta o no es válida
+    """
+    valor = fecha_enlace(enlace, campo)
+    return SIN_FECHA if valor is None else valor
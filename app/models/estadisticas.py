@@ -0,0 +1,258 @@
+"""
+Estadísticas de los enlaces mantenidas de forma incremental.
+
+En lugar de recorrer todos los enlaces en cada consulta, EstadisticasEnlaces
+guarda contadores (total, favoritos, enlaces por categoría, por tag y por mes
+de creación) y los ajusta con cada EventoCambio del repositorio: por cada
+enlace afectado se resta su aportación anterior y se suma la nueva. Los tags
+se cuentan por referencias, así que el número de tags únicos es el número de
+claves con contador positivo.
+"""
+import heapq
+import logging
+from collections import Counter
+from functools import lru_cache
+from itertools import chain
+from operator import attrgetter
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+from .enlace import _AUSENTE, EnlaceCompacto, decodificar_fecha
+from .eventos import EventoCambio
+
+
+logger = logging.getLogger(__name__)
+
+SIN_CATEGORIA = 'Sin categoría'
+
+_MICROSEGUNDOS_DIA = 86_400_000_000
+
+
+class _Aporte(NamedTuple):
+    """
+    Lo que un enlace suma a los contadores (para poder restarlo después).
+
+    Guarda los mismos objetos que tenía el enlace (sin copias): al editarlo
+    el enlace recibe objetos nuevos y estos conservan los valores anteriores.
+    """
+    enlace: Any
+    categoria: Any
+    tags: Sequence
+    favorito: bool
+    creado: Any
+
+
+@lru_cache(maxsize=65536)
+def _mes_de_dia(dia: int) -> str:
+    """Mes 'AAAA-MM' de un día contado desde 1970 (cacheado: hay pocos días distintos)."""
+    return decodificar_fecha(dia * _MICROSEGUNDOS_DIA)[:7]
+
+
+def _mes_creacion(creado: Any) -> Optional[str]:
+    """Mes de creación como 'AAAA-MM' (None si no hay fecha)."""
+    if type(creado) is int:
+        return _mes_de_dia(creado // _MICROSEGUNDOS_DIA)
+    if isinstance(creado, str) and len(creado) >= 7 and creado[4] == '-':
+        return creado[:7]
+    return None
+
+
+# Los tags se repiten mucho: cachear la versión en minúsculas evita crear
+# una cadena nueva por cada aparición
+_minuscula = lru_cache(maxsize=65536)(str.lower)
+
+
+def _tags_contables(tags: Any) -> Iterator[str]:
+    """Tags en minúsculas tal como se cuentan."""
+    for tag in tags:
+        if isinstance(tag, str):
+            yield _minuscula(tag)
+
+
+def _id_enlace(enlace: Any) -> Any:
+    if type(enlace) is EnlaceCompacto:
+        return None if enlace.id is _AUSENTE else enlace.id
+    return enlace.get('id')
+
+
+def _aporte(enlace: Any) -> _Aporte:
+    if type(enlace) is EnlaceCompacto:
+        # Lectura directa de los atributos: sin convertir tags ni fechas
+        categoria = enlace.categoria
+        tags = enlace.tags
+        favorito = enlace.es_favorito
+        return _Aporte(
+            enlace,
+            SIN_CATEGORIA if categoria is _AUSENTE else categoria,
+            tags if type(tags) is tuple else (),
+            favorito is not _AUSENTE and bool(favorito),
+            enlace.creado_en,
+        )
+    tags = enlace.get('tags', [])
+    return _Aporte(
+        enlace,
+        enlace.get('categoria', SIN_CATEGORIA),
+        tuple(tags) if isinstance(tags, (list, tuple)) else (),
+        bool(enlace.get('es_favorito', False)),
+        enlace.get('creado_en'),
+    )
+
+
+def _incrementar(contador: Dict[Any, int], clave: Any) -> None:
+    contador[clave] = contador.get(clave, 0) + 1
+
+
+def _decrementar(contador: Dict[Any, int], clave: Any) -> None:
+    restante = contador[clave] - 1
+    if restante:
+        contador[clave] = restante
+    else:
+        # La clave desaparece con su última referencia
+        del contador[clave]
+
+
+class EstadisticasEnlaces:
+    """
+    Contadores agregados de los enlaces del repositorio.
+
+    El repositorio llama a aplicar_evento tras cada cambio; el coste es
+    proporcional al número de enlaces afectados, no al total. Las recargas (o
+    un evento que no encaje con los enlaces conocidos) marcan los contadores
+    para reconstruirlos en la siguiente consulta.
+    """
+
+    def __init__(self):
+        self._sucio = True
+        self._vaciar()
+
+    def _vaciar(self) -> None:
+        self._aportes: Dict[Any, _Aporte] = {}
+        self.total = 0
+        self.favoritos = 0
+        self._por_categoria: Dict[Any, int] = {}
+        self._por_tag: Dict[str, int] = {}
+        self._por_mes: Dict[str, int] = {}
+
+    def _sumar(self, aporte: _Aporte) -> None:
+        self.total += 1
+        self.favoritos += aporte.favorito
+        _incrementar(self._por_categoria, aporte.categoria)
+        for tag in _tags_contables(aporte.tags):
+            _incrementar(self._por_tag, tag)
+        mes = _mes_creacion(aporte.creado)
+        if mes is not None:
+            _incrementar(self._por_mes, mes)
+
+    def _restar(self, aporte: _Aporte) -> None:
+        self.total -= 1
+        self.favoritos -= aporte.favorito
+        _decrementar(self._por_categoria, aporte.categoria)
+        for tag in _tags_contables(aporte.tags):
+            _decrementar(self._por_tag, tag)
+        mes = _mes_creacion(aporte.creado)
+        if mes is not None:
+            _decrementar(self._por_mes, mes)
+
+    def reconstruir(self, enlaces: Sequence) -> None:
+        """
+        Recalcula todos los contadores recorriendo los enlaces.
+
+        Args:
+            enlaces: Enlaces del repositorio
+        """
+        aportes = [_aporte(enlace) for enlace in enlaces]
+        self._aportes = {_id_enlace(aporte.enlace): aporte for aporte in aportes}
+        self.total = len(aportes)
+        self.favoritos = sum(map(attrgetter('favorito'), aportes))
+        # Counter cuenta en C; los contadores siguen siendo diccionarios normales
+        self._por_categoria = Counter(map(attrgetter('categoria'), aportes))
+        self._por_tag = Counter(_tags_contables(chain.from_iterable(map(attrgetter('tags'), aportes))))
+        self._por_mes = Counter(map(_mes_creacion, map(attrgetter('creado'), aportes)))
+        self._por_mes.pop(None, None)
+        self._sucio = False
+        logger.debug(f"Estadísticas reconstruidas: {self.total} enlaces")
+
+    def aplicar_evento(self, evento: EventoCambio, enlaces: Sequence) -> None:
+        """
+        Ajusta los contadores con un cambio del repositorio.
+
+        Args:
+            evento: Cambios emitidos por el repositorio
+            enlaces: Enlaces del repositorio tras el cambio
+        """
+        if self._sucio:
+            return
+        if evento.recarga:
+            self._sucio = True
+            return
+
+        for enlace_id in evento.eliminados:
+            aporte = self._aportes.pop(enlace_id, None)
+            if aporte is None:
+                self._sucio = True
+                return
+            self._restar(aporte)
+
+        if evento.agregados:
+            # Los enlaces nuevos se agregan siempre al final de la lista
+            nuevos = enlaces[len(enlaces) - len(evento.agregados):]
+            if any(enlace.get('id') not in evento.agregados for enlace in nuevos):
+                self._sucio = True
+                return
+            for enlace in nuevos:
+                aporte = _aporte(enlace)
+                self._aportes[enlace.get('id')] = aporte
+                self._sumar(aporte)
+
+        for enlace_id in evento.actualizados - evento.agregados:
+            anterior = self._aportes.get(enlace_id)
+            if anterior is None:
+                self._sucio = True
+                return
+            # Los enlaces se editan en su sitio: el mismo objeto tiene los valores nuevos
+            aporte = _aporte(anterior.enlace)
+            self._aportes[enlace_id] = aporte
+            self._restar(anterior)
+            self._sumar(aporte)
+
+        if self.total != len(enlaces):
+            self._sucio = True
+
+    def sincronizar(self, enlaces: Sequence) -> None:
+        """
+        Reconstruye los contadores si están pendientes de reconstrucción.
+
+        Args:
+            enlaces: Enlaces del repositorio
+        """
+        if self._sucio or self.total != len(enlaces):
+            self.reconstruir(enlaces)
+
+    def por_categoria(self) -> Dict[Any, int]:
+        """Número de enlaces de cada categoría."""
+        return dict(self._por_categoria)
+
+    @property
+    def total_tags_unicos(self) -> int:
+        """Número de tags distintos (sin distinguir mayúsculas)."""
+        return len(self._por_tag)
+
+    def tags_frecuentes(self, cantidad: int = 10) -> List[Tuple[str, int]]:
+        """
+        Tags más usados.
+
+        Args:
+            cantidad: Número máximo de tags a devolver
+
+        Returns:
+            Pares (tag, enlaces) de mayor a menor frecuencia
+        """
+        # Empates en orden alfabético
+        return heapq.nsmallest(cantidad, self._por_tag.items(), key=lambda par: (-par[1], par[0]))
+
+    def por_mes(self) -> List[Tuple[str, int]]:
+        """
+        Enlaces creados por mes.
+
+        Returns:
+            Pares ('AAAA-MM', enlaces) en orden cronológico
+        """
+        return sorted(self._por_mes.items())
@@ -0,0 +1,121 @@
+"""
+Eventos de cambio emitidos por el repositorio de enlaces.
+
+Cada operación que modifica el repositorio acumula los ids y categorías
+afectados y, al terminar, se notifica a los suscriptores un único
+EventoCambio con un número de generación creciente. Así las vistas y cachés
+pueden actualizar solo lo que cambió en lugar de reconstruirse.
+"""
+from typing import FrozenSet, NamedTuple, Set, Tuple
+
+
+class EventoCambio(NamedTuple):
+    """
+    Cambios producidos por una operación (o grupo de operaciones) del repositorio.
+
+    Attributes:
+        generacion: Número de generación del repositorio tras el cambio
+        agregados: Ids de enlaces nuevos
+        actualizados: Ids de enlaces existentes modificados
+        eliminados: Ids de enlaces eliminados
+        favoritos: Ids cuyo estado de favorito cambió (también en agregados/actualizados/eliminados)
+        categorias_renombradas: Pares (antigua, nueva) de categorías renombradas
+        categorias_cambiadas: True si cambió la lista de categorías
+        recarga: True si los datos se sustituyeron por completo (no hay detalle por id)
+    """
+    generacion: int
+    agregados: FrozenSet[str] = frozenset()
+    actualizados: FrozenSet[str] = frozenset()
+    eliminados: FrozenSet[str] = frozenset()
+    favoritos: FrozenSet[str] = frozenset()
+    categorias_renombradas: Tuple[Tuple[str, str], ...] = ()
+    categorias_cambiadas: bool = False
+    recarga: bool = False
+
+    @property
+    def cambia_filas(self) -> bool:
+        """True si se agregaron o eliminaron enlaces (o se recargó todo)."""
+        return self.recarga or bool(self.agregados or self.eliminados)
+
+    @property
+    def cambia_categorias(self) -> bool:
+        """True si la lista de categorías o los enlaces por categoría pueden haber cambiado."""
+        return (self.recarga or self.categorias_cambiadas or bool(self.categorias_renombradas)
+                or self.cambia_filas)
+
+
+class CambiosPendientes:
+    """
+    Acumula los cambios de una operación hasta emitir el evento.
+
+    Los cambios sobre un mismo id se combinan: un enlace agregado y luego
+    actualizado cuenta solo como agregado, y uno agregado y luego eliminado
+    desaparece del evento.
+    """
+
+    def __init__(self):
+        self.agregados: Set[str] = set()
+        self.actualizados: Set[str] = set()
+        self.eliminados: Set[str] = set()
+        self.favoritos: Set[str] = set()
+        self.categorias_renombradas = []
+        self.categorias_cambiadas = False
+        self.recarga = False
+
+    def copiar(self) -> 'CambiosPendientes':
+        """Copia independiente de los cambios acumulados."""
+        copia = CambiosPendientes()
+        copia.agregados = set(self.agregados)
+        copia.actualizados = set(self.actualizados)
+        copia.eliminados = set(self.eliminados)
+        copia.favoritos = set(self.favoritos)
+        copia.categorias_renombradas = list(self.categorias_renombradas)
+        copia.categorias_cambiadas = self.categorias_cambiadas
+        copia.recarga = self.recarga
+        return copia
+
+    def vacio(self) -> bool:
+        """True si no hay cambios acumulados."""
+        return not (self.agregados or self.actualizados or self.eliminados or self.favoritos
+                    or self.categorias_renombradas or self.categorias_cambiadas or self.recarga)
+
+    def agregar(self, enlace_id: str) -> None:
+        self.eliminados.discard(enlace_id)
+        self.agregados.add(enlace_id)
+
+    def actualizar(self, enlace_id: str, favorito: bool = False) -> None:
+        if enlace_id not in self.agregados:
+            self.actualizados.add(enlace_id)
+        if favorito:
+            self.favoritos.add(enlace_id)
+
+    def eliminar(self, enlace_id: str, favorito: bool = False) -> None:
+        self.actualizados.discard(enlace_id)
+        if enlace_id in self.agregados:
+            self.agregados.discard(enlace_id)
+            self.favoritos.discard(enlace_id)
+            return
+        self.eliminados.add(enlace_id)
+        if favorito:
+            self.favoritos.add(enlace_id)
+
+    def a_evento(self, generacion: int) -> EventoCambio:
+        """
+        Convierte los cambios acumulados en un evento inmutable.
+
+        Args:
+            generacion: Generación del repositorio tras aplicar los cambios
+
+        Returns:
+            Evento con los cambios
+        """
+        return EventoCambio(
+            generacion=generacion,
+            agregados=frozenset(self.agregados),
+            actualizados=frozenset(self.actualizados),
+            eliminados=frozenset(self.eliminados),
+            favoritos=frozenset(self.favoritos),
+            categorias_renombradas=tuple(self.categorias_renombradas),
+            categorias_cambiadas=self.categorias_cambiadas,
+            recarga=self.recarga,
+        )
@@ -0,0 +1,125 @@
+"""
+Fusión de enlaces importados con los existentes.
+
+Los enlaces entrantes se emparejan con los existentes por id y por URL
+canónica mediante un índice hash, de modo que fusionar M enlaces sobre N
+existentes cuesta O(N + M) en lugar de O(N * M).
+"""
+from typing import Any, Dict, Iterable, Optional
+from .enlace import fecha_enlace
+from ..utils.validators import canonicalizar_url
+
+
+# Campos que se resuelven por "gana la última escritura" según actualizado_en
+CAMPOS_ULTIMA_ESCRITURA = ('titulo', 'url', 'categoria', 'es_favorito', 'actualizado_en')
+
+
+class IndiceFusion:
+    """
+    Índice de enlaces por id y por URL canónica.
+    """
+
+    def __init__(self, enlaces: Iterable[Dict[str, Any]], timestamp_sin_fecha: Optional[str] = None):
+        """
+        Construye el índice.
+
+        Args:
+            enlaces: Enlaces existentes
+            timestamp_sin_fecha: Timestamp asignado durante la normalización a los
+                registros que no traían fecha; esos registros nunca ganan por fecha
+        """
+        self.timestamp_sin_fecha = timestamp_sin_fecha
+        self.por_id: Dict[str, Dict[str, Any]] = {}
+        self.por_url: Dict[str, Dict[str, Any]] = {}
+        for enlace in enlaces:
+            self.registrar(enlace)
+
+    def registrar(self, enlace: Dict[str, Any]) -> None:
+        """
+        Añade un enlace al índice.
+
+        Args:
+            enlace: Enlace a indexar
+        """
+        self.por_id[enlace.get('id')] = enlace
+        self.por_url.setdefault(canonicalizar_url(enlace.get('url', '')), enlace)
+
+    def buscar(self, enlace: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Busca el enlace existente que corresponde a uno entrante.
+
+        Args:
+            enlace: Enlace entrante
+
+        Returns:
+            Enlace existente o None si es nuevo
+        """
+        existente = self.por_id.get(enlace.get('id'))
+        if existente is None:
+            existente = self.por_url.get(canonicalizar_url(enlace.get('url', '')))
+        return existente
+
+    def cambiar_url(self, enlace: Dict[str, Any], url_anterior: str) -> None:
+        """
+        Reindexa un enlace cuya URL ha cambiado.
+
+        Args:
+            enlace: Enlace ya actualizado
+            url_anterior: URL antes del cambio
+        """
+        clave_anterior = canonicalizar_url(url_anterior)
+        if self.por_url.get(clave_anterior) is enlace:
+            del self.por_url[clave_anterior]
+        self.por_url.setdefault(canonicalizar_url(enlace['url']), enlace)
+
+
+def _es_mas_reciente(entrante: Dict[str, Any], existente: Dict[str, Any]) -> bool:
+    """True si el actualizado_en del entrante es posterior al del existente."""
+    # Comparación de enteros: los enlaces compactos ya guardan microsegundos
+    reciente = fecha_enlace(entrante, 'actualizado_en')
+    anterior = fecha_enlace(existente, 'actualizado_en')
+    return reciente is not None and (anterior is None or reciente > anterior)
+
+
+def calcular_fusion(existente: Dict[str, Any], entrante: Dict[str, Any],
+                    indice: IndiceFusion) -> Dict[str, Any]:
+    """
+    Calcula los cambios que produce fusionar un enlace entrante sobre uno existente.
+
+    Los campos simples se toman del entrante solo si su actualizado_en es
+    posterior; los tags se unen siempre. La URL no cambia si la nueva ya
+    pertenece a otro enlace.
+
+    Args:
+        existente: Enlace existente
+        entrante: Enlace entrante normalizado
+        indice: Índice de la fusión en curso
+
+    Returns:
+        Diccionario con los campos que cambian (vacío si no hay cambios)
+    """
+    cambios = {}
+
+    actualizado_en = entrante.get('actualizado_en', '')
+    if (actualizado_en != indice.timestamp_sin_fecha
+            and _es_mas_reciente(entrante, existente)):
+        for campo in CAMPOS_ULTIMA_ESCRITURA:
+            if campo in entrante and entrante[campo] != existente.get(campo):
+                cambios[campo] = entrante[campo]
+
+        if 'url' in cambios:
+            duenio = indice.por_url.get(canonicalizar_url(cambios['url']))
+            if duenio is not None and duenio is not existente:
+                del cambios['url']
+
+    tags_existentes = existente.get('tags', [])
+    tags = list(tags_existentes)
+    vistos = set(tags)
+    for tag in entrante.get('tags', []):
+        if tag not in vistos:
+            tags.append(tag)
+            vistos.add(tag)
+    if len(tags) != len(tags_existentes):
+        cambios['tags'] = tags
+
+    return cambios
@@ -0,0 +1,131 @@
+"""
+Índice de enlaces por categoría.
+
+Renombrar, mover o eliminar una categoría solo necesita los enlaces que la
+usan. El índice los agrupa por categoría (y por id dentro de cada una) para
+que esas operaciones cuesten O(enlaces afectados) en lugar de recorrer todo
+el repositorio.
+"""
+from typing import Any, Dict, Iterable, List, Optional
+
+
+class IndiceCategorias:
+    """
+    Índice categoría → enlaces miembros, indexados por id.
+
+    El repositorio lo construye la primera vez que lo necesita y lo mantiene
+    al agregar, editar y eliminar enlaces mientras exista.
+    """
+
+    def __init__(self, enlaces: Iterable[Dict[str, Any]]):
+        """
+        Construye el índice.
+
+        Args:
+            enlaces: Enlaces del repositorio
+        """
+        self._miembros: Dict[Any, Dict[Any, Dict[str, Any]]] = {}
+        self._categoria_por_id: Dict[Any, Any] = {}
+        # Igual que agregar() pero sin una llamada por enlace
+        miembros = self._miembros
+        categoria_por_id = self._categoria_por_id
+        for enlace in enlaces:
+            enlace_id = enlace.get('id')
+            categoria = enlace.get('categoria')
+            grupo = miembros.get(categoria)
+            if grupo is None:
+                grupo = miembros[categoria] = {}
+            grupo[enlace_id] = enlace
+            categoria_por_id[enlace_id] = categoria
+
+    def agregar(self, enlace: Dict[str, Any]) -> None:
+        """
+        Añade un enlace nuevo al índice.
+
+        Args:
+            enlace: Enlace agregado al repositorio
+        """
+        enlace_id = enlace.get('id')
+        categoria = enlace.get('categoria')
+        self._miembros.setdefault(categoria, {})[enlace_id] = enlace
+        self._categoria_por_id[enlace_id] = categoria
+
+    def quitar(self, enlace_id: Any) -> Optional[Dict[str, Any]]:
+        """
+        Retira un enlace del índice.
+
+        Args:
+            enlace_id: ID del enlace eliminado
+
+        Returns:
+            El enlace retirado o None si no estaba indexado
+        """
+        if enlace_id not in self._categoria_por_id:
+            return None
+        categoria = self._categoria_por_id.pop(enlace_id)
+        miembros = self._miembros[categoria]
+        enlace = miembros.pop(enlace_id)
+        if not miembros:
+            del self._miembros[categoria]
+        return enlace
+
+    def actualizar(self, enlace: Dict[str, Any]) -> None:
+        """
+        Mueve un enlace editado si ha cambiado de categoría.
+
+        Args:
+            enlace: Enlace ya modificado
+        """
+        enlace_id = enlace.get('id')
+        if enlace_id not in self._categoria_por_id:
+            self.agregar(enlace)
+        elif self._categoria_por_id[enlace_id] != enlace.get('categoria'):
+            self.quitar(enlace_id)
+            self.agregar(enlace)
+
+    def miembros(self, categoria: Any) -> List[Dict[str, Any]]:
+        """
+        Obtiene los enlaces de una categoría.
+
+        Args:
+            categoria: Nombre de la categoría
+
+        Returns:
+            Lista (nueva) con los enlaces de la categoría
+        """
+        return list(self._miembros.get(categoria, {}).values())
+
+    def contar(self, categoria: Any) -> int:
+        """
+        Cuenta los enlaces de una categoría.
+
+        Args:
+            categoria: Nombre de la categoría
+
+        Returns:
+            Número de enlaces de la categoría
+        """
+        return len(self._miembros.get(categoria, ()))
+
+    def renombrar(self, categoria_antigua: Any, categoria_nueva: Any) -> None:
+        """
+        Pasa todos los miembros de una categoría a otra (se fusionan si ya existe).
+
+        Los enlaces deben tener ya la categoría nueva.
+
+        Args:
+            categoria_antigua: Categoría de origen
+            categoria_nueva: Categoría de destino
+        """
+        if categoria_antigua == categoria_nueva:
+            return
+        miembros = self._miembros.pop(categoria_antigua, None)
+        if not miembros:
+            return
+        destino = self._miembros.get(categoria_nueva)
+        if destino is None:
+            self._miembros[categoria_nueva] = miembros
+        else:
+            destino.update(miembros)
+        for enlace_id in miembros:
+            self._categoria_por_id[enlace_id] = categoria_nueva
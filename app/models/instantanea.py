@@ -0,0 +1,97 @@
+"""
+Instantáneas inmutables del repositorio para leer desde hilos de trabajo.
+
+El repositorio modifica sus enlaces en su sitio desde el hilo de la interfaz,
+así que un hilo de trabajo no puede recorrerlos mientras tanto. En su lugar
+recibe una InstantaneaEnlaces: una tupla de enlaces congelados sellada con la
+generación del repositorio. Nada de la instantánea cambia después de crearla
+y se puede leer sin cerrojos.
+
+Las instantáneas comparten estructura: el repositorio guarda la copia
+congelada de cada enlace y solo la descarta cuando un evento lo marca como
+modificado. La instantánea siguiente reutiliza los mismos objetos para todos
+los enlaces que no cambiaron, de modo que tras editar un enlace entre 100.000
+solo se congela uno.
+"""
+from types import MappingProxyType
+from typing import Any, Mapping, NamedTuple, Tuple
+from .enlace import CAMPOS_ENLACE, EnlaceCompacto, compactar
+
+
+class EnlaceCongelado(EnlaceCompacto):
+    """
+    Copia de solo lectura de un enlace compacto.
+
+    Se lee igual que un EnlaceCompacto (como diccionario o por atributos);
+    cualquier intento de modificarlo, por clave, por atributo o a través de
+    las claves extra, lanza TypeError. Solo congelar asigna sus campos.
+    """
+
+    __slots__ = ()
+
+    def __setattr__(self, campo: str, valor: Any) -> None:
+        raise TypeError("Los enlaces de una instantánea son de solo lectura")
+
+    def __delattr__(self, campo: str) -> None:
+        raise TypeError("Los enlaces de una instantánea son de solo lectura")
+
+    def __setitem__(self, clave: str, valor: Any) -> None:
+        raise TypeError("Los enlaces de una instantánea son de solo lectura")
+
+    def __delitem__(self, clave: str) -> None:
+        raise TypeError("Los enlaces de una instantánea son de solo lectura")
+
+    def __repr__(self) -> str:
+        return f"EnlaceCongelado({self.a_dict()!r})"
+
+    def __reduce__(self):
+        # El proxy de las claves extra no se serializa: se vuelve a congelar
+        return (congelar, (self.a_dict(),))
+
+
+def congelar(enlace: Mapping) -> EnlaceCongelado:
+    """
+    Crea la copia de solo lectura de un enlace.
+
+    Los valores de los campos conocidos ya son inmutables (textos, tupla de
+    tags, fechas enteras), así que basta con copiar las referencias; solo el
+    diccionario de claves extra se duplica, tras un MappingProxyType.
+
+    Args:
+        enlace: Enlace como diccionario o compacto
+
+    Returns:
+        Enlace congelado equivalente
+    """
+    if isinstance(enlace, EnlaceCongelado):
+        return enlace
+    origen = compactar(enlace)
+    congelado = EnlaceCongelado.__new__(EnlaceCongelado)
+    for campo in CAMPOS_ENLACE:
+        object.__setattr__(congelado, campo, getattr(origen, campo))
+    extra = MappingProxyType(dict(origen.extra)) if origen.extra else None
+    object.__setattr__(congelado, 'extra', extra)
+    return congelado
+
+
+def restaurar_enlace(enlace: EnlaceCompacto, congelado: EnlaceCongelado) -> None:
+    """
+    Devuelve un enlace al estado guardado en una copia congelada.
+
+    El enlace conserva su identidad, así que las estructuras que lo
+    referencian (índices, estadísticas) siguen siendo válidas.
+
+    Args:
+        enlace: Enlace a modificar en su sitio
+        congelado: Estado que debe recuperar
+    """
+    for campo in CAMPOS_ENLACE:
+        setattr(enlace, campo, getattr(congelado, campo))
+    enlace.extra = dict(congelado.extra) if congelado.extra else None
+
+
+class InstantaneaEnlaces(NamedTuple):
+    """Estado del repositorio en una generación, de solo lectura."""
+    generacion: int
+    enlaces: Tuple[EnlaceCongelado, ...]
+    categorias: Tuple[str, ...]
@@ -1,13 +1,93 @@
 """
 Modelo de tabla para mostrar enlaces en PyQt6.
 """
-from typing import List, Dict, Any, Optional, Tuple
+from itertools import islice, repeat
+from typing import AbstractSet, Iterable, List, Dict, Any, NamedTuple, Optional, Sequence, Tuple
 from PyQt6.QtCore import QAbstractTableModel, Qt, QModelIndex, QVariant, pyqtSignal
-from PyQt6.QtGui import QFont, QColor
+from PyQt6.QtGui import QBrush, QColor, QFont
+from .columnas import VistaFilas
+from .enlace import EnlaceCompacto, fecha_guardada
+from ..theme.colors import Colors
+from ..theme.fonts import Fonts
 from ..utils.time import formatear_fecha
 from ..config import obtener_config_tabla
 
 
+# Con más tramos de filas insertadas o eliminadas se reinicia el modelo:
+# muchas señales pequeñas cuestan más que un reinicio
+MAX_TRAMOS_INCREMENTALES = 64
+# Filas por página si la configuración no lo indica
+FILAS_POR_PAGINA = 500
+# Campo de ordenación de cada columna (ver RepositorioEnlaces.ordenar_filas)
+CAMPOS_ORDEN_COLUMNAS = ('favorito', 'titulo', 'host', 'categoria', 'tags', 'actualizado')
+
+# Respuesta para las celdas y roles sin datos (se devuelve siempre el mismo objeto)
+_SIN_DATOS = QVariant()
+
+# Formato de cada columna: (tamaño de punto, negrita, cursiva, color del tema);
+# None deja el valor por defecto
+_FORMATO_COLUMNAS = (
+    (Fonts.SIZE_LARGE, False, False, None),              # ⭐ Favorito - más grande
+    (None, True, False, Colors.ACCENT_CYAN),             # Título en negrita
+    (None, False, False, None),                          # URL
+    (None, False, False, Colors.FG_DIM),                 # Categoría en gris
+    (Fonts.SIZE_SMALL, False, True, Colors.FG_DIM),      # Tags en cursiva
+    (None, False, False, None),                          # Actualizado
+)
+
+
+class _EstilosColumnas(NamedTuple):
+    """Fuentes y pinceles compartidos por todas las celdas de cada columna."""
+    fuentes: Tuple[QFont, ...]
+    pinceles: Tuple[Optional[QBrush], ...]  # None: color de la vista
+    cabecera: QFont
+
+
+_estilos: Optional[_EstilosColumnas] = None
+
+class _TextosFila(NamedTuple):
+    """Textos ya calculados de una fila y el estado del enlace con el que se calcularon."""
+    enlace: Any  # Objeto del enlace
+    fecha: Any  # actualizado_en guardado
+    textos: Tuple[str, ...]  # Uno por columna
+
+
+def _estilos_columnas() -> _EstilosColumnas:
+    """
+    Fuentes y pinceles de las columnas, creados una sola vez a partir del tema.
+    
+    Se crean al primer uso porque QFont necesita una aplicación gráfica. Los
+    objetos se comparten entre todas las celdas y no deben modificarse.
+    """
+    global _estilos
+    if _estilos is None:
+        fuentes = []
+        pinceles = []
+        for tamano, negrita, cursiva, color in _FORMATO_COLUMNAS:
+            fuente = QFont()
+            if tamano is not None:
+                fuente.setPointSize(tamano)
+            fuente.setBold(negrita)
+            fuente.setItalic(cursiva)
+            fuentes.append(fuente)
+            pinceles.append(QBrush(QColor(color)) if color else None)
+        cabecera = QFont()
+        cabecera.setBold(True)
+        _estilos = _EstilosColumnas(tuple(fuentes), tuple(pinceles), cabecera)
+    return _estilos
+
+
+def _tramos(filas: List[int]) -> List[Tuple[int, int]]:
+    """Agrupa filas ordenadas en tramos contiguos (inicio, fin)."""
+    tramos = []
+    for fila in filas:
+        if tramos and tramos[-1][1] == fila - 1:
+            tramos[-1] = (tramos[-1][0], fila)
+        else:
+            tramos.append((fila, fila))
+    return tramos
+
+
 def truncar_url_inteligente(url: str, max_chars: int = 60) -> str:
     """
     Trunca una URL de manera inteligente preservando información importante.
@@ -53,22 +133,62 @@ def truncar_url_inteligente(url: str, max_chars: int = 60) -> str:
 class ModeloTablaEnlaces(QAbstractTableModel):
     """
     Modelo personalizado para mostrar enlaces en QTableView.
+    
+    El resultado completo (una lista o una VistaFilas sobre los enlaces del
+    repositorio) se guarda sin copiar, pero a la vista solo se le entregan
+    filas por páginas: canFetchMore/fetchMore añaden la siguiente cuando el
+    desplazamiento llega al final y cargar_todo() las entrega todas. Los
+    enlaces de las filas no cargadas no se recorren.
+    
+    Por eso el modelo no ordena sus filas: sort() recuerda la columna y el
+    sentido y emite orden_cambiado para que quien le entrega los enlaces
+    vuelva a pedirlos ordenados al repositorio.
     """
     
     # Señales personalizadas
     enlace_doble_click = pyqtSignal(str)  # Emite ID del enlace
     tag_clickeado = pyqtSignal(str)       # Emite tag clickeado
+    orden_cambiado = pyqtSignal()         # Hay que volver a entregar las filas ordenadas
     
-    def __init__(self):
+    def __init__(self, filas_por_pagina: Optional[int] = None):
+        """
+        Inicializa el modelo.
+        
+        Args:
+            filas_por_pagina: Filas de cada página (por defecto, las de la configuración)
+        """
         super().__init__()
-        self._enlaces: List[Dict[str, Any]] = []
-        self._enlaces_con_score: List[Tuple[Dict[str, Any], float]] = []
+        self._enlaces: Sequence[Dict[str, Any]] = []
+        # Filas del resultado entregadas a la vista (las primeras de _enlaces)
+        self._cargadas = 0
+        self._filas_por_pagina = max(1, filas_por_pagina or
+                                     obtener_config_tabla().get('filas_por_pagina', FILAS_POR_PAGINA))
+        self._scores: Dict[str, float] = {}  # id -> score de la búsqueda actual
         self._columnas = ["⭐", "Título", "URL", "Categoría", "Tags", "Actualizado"]  # ⭐ Nueva columna favorito
         self._usar_scores = False
+        # Ids de las filas mostradas y firma de cada enlace al mostrarlo, para
+        # calcular la diferencia con la siguiente lista
+        self._ids: List[str] = []
+        self._firmas: Dict[str, tuple] = {}
+        # Textos y tooltips por id: pintar una fila ya vista no recalcula nada
+        self._textos: Dict[str, _TextosFila] = {}
+        self._tooltips: Dict[str, _TextosFila] = {}
+        self._url_max_chars = obtener_config_tabla()['url_max_chars']
+        # (campo, descendente) elegido en la cabecera, None para el orden natural
+        self._orden: Optional[Tuple[str, bool]] = None
+        # Rol -> función (enlace, columna) que da el dato de la celda
+        self._roles = {
+            Qt.ItemDataRole.DisplayRole: self._obtener_texto,
+            Qt.ItemDataRole.FontRole: self._obtener_fuente,
+            Qt.ItemDataRole.ForegroundRole: self._obtener_color_texto,
+            Qt.ItemDataRole.ToolTipRole: self._obtener_tooltip_cacheado,
+            # Rol personalizado para obtener el ID del enlace
+            Qt.ItemDataRole.UserRole: self._obtener_id,
+        }
     
     def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
-        """Retorna el número de filas."""
-        return len(self._enlaces)
+        """Retorna el número de filas cargadas."""
+        return self._cargadas
     
     def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
         """Retorna el número de columnas."""
@@ -85,25 +205,60 @@ class ModeloTablaEnlaces(QAbstractTableModel):
         Returns:
             Datos a mostrar
         """
-        if not index.isValid() or not (0 <= index.row() < len(self._enlaces)):
-            return QVariant()
+        # La vista pide muchos roles que el modelo no usa: se descartan antes
+        # de mirar la fila
+        obtener = self._roles.get(role)
+        fila = index.row()
+        if obtener is None or not index.isValid() or not (0 <= fila < self._cargadas):
+            return _SIN_DATOS
+        return obtener(self._enlaces[fila], index.column())
+    
+    def _obtener_texto(self, enlace: Dict[str, Any], columna: int) -> str:
+        """Texto de una celda, desde la caché de la fila."""
+        return self._textos_fila(enlace, self._textos, self._obtener_dato_display)[columna]
+    
+    def _obtener_tooltip_cacheado(self, enlace: Dict[str, Any], columna: int) -> str:
+        """Tooltip de una celda, desde la caché de la fila."""
+        return self._textos_fila(enlace, self._tooltips, self._obtener_tooltip)[columna]
+    
+    @staticmethod
+    def _obtener_id(enlace: Dict[str, Any], columna: int) -> str:
+        """ID del enlace de la fila."""
+        return enlace.get('id', '')
+    
+    def _textos_fila(self, enlace: Dict[str, Any], cache: Dict[str, _TextosFila], calcular) -> Tuple[str, ...]:
+        """
+        Textos de todas las columnas de un enlace, calculados una sola vez.
         
-        enlace = self._enlaces[index.row()]
-        columna = index.column()
+        La entrada se reutiliza mientras el enlace sea el mismo objeto con el
+        mismo actualizado_en; los cambios de score invalidan la caché al
+        actualizar las filas.
         
-        if role == Qt.ItemDataRole.DisplayRole:
-            return self._obtener_dato_display(enlace, columna)
-        elif role == Qt.ItemDataRole.FontRole:
-            return self._obtener_fuente(enlace, columna)
-        elif role == Qt.ItemDataRole.ForegroundRole:
-            return self._obtener_color_texto(enlace, columna)
-        elif role == Qt.ItemDataRole.ToolTipRole:
-            return self._obtener_tooltip(enlace, columna)
-        elif role == Qt.ItemDataRole.UserRole:
-            # Rol personalizado para obtener el ID del enlace
-            return enlace.get('id', '')
+        Args:
+            enlace: Enlace de la fila
+            cache: Caché de textos o de tooltips
+            calcular: Función (enlace, columna) -> texto
         
-        return QVariant()
+        Returns:
+            Un texto por columna
+        """
+        if type(enlace) is EnlaceCompacto:
+            enlace_id, fecha = enlace.id, enlace.actualizado_en
+        else:
+            enlace_id, fecha = enlace.get('id'), enlace.get('actualizado_en')
+        # Sin construir claves: una celda ya vista no reserva memoria
+        cacheado = cache.get(enlace_id)
+        if cacheado is not None and cacheado.enlace is enlace and cacheado.fecha == fecha:
+            return cacheado.textos
+        textos = tuple(calcular(enlace, columna) for columna in range(len(self._columnas)))
+        cache[enlace_id] = _TextosFila(enlace, fecha, textos)
+        return textos
+    
+    def _olvidar_textos(self, ids: Iterable[str]) -> None:
+        """Descarta los textos calculados de unos enlaces."""
+        for enlace_id in ids:
+            self._textos.pop(enlace_id, None)
+            self._tooltips.pop(enlace_id, None)
     
     def _obtener_dato_display(self, enlace: Dict[str, Any], columna: int) -> str:
         """Obtiene el dato a mostrar para una columna específica."""
@@ -122,8 +277,7 @@ class ModeloTablaEnlaces(QAbstractTableModel):
             
         elif columna == 2:  # URL
             url = enlace.get('url', '')
-            config = obtener_config_tabla()
-            return truncar_url_inteligente(url, max_chars=config['url_max_chars'])
+            return truncar_url_inteligente(url, max_chars=self._url_max_chars)
             
         elif columna == 3:  # Categoría
             return enlace.get('categoria', '')
@@ -135,35 +289,22 @@ class ModeloTablaEnlaces(QAbstractTableModel):
             return ""
             
         elif columna == 5:  # Fecha actualización
-            timestamp = enlace.get('actualizado_en', '')
-            return formatear_fecha(timestamp)
+            # Sin convertir a ISO: el texto sale de la caché por minuto
+            return formatear_fecha(fecha_guardada(enlace, 'actualizado_en'))
         
         return ""
     
-    def _obtener_fuente(self, enlace: Dict[str, Any], columna: int) -> Optional[QFont]:
-        """Obtiene la fuente para una celda específica."""
-        fuente = QFont()
-        
-        if columna == 0:  # ⭐ Favorito - más grande
-            fuente.setPointSize(14)
-        elif columna == 1:  # Título en negrita
-            fuente.setBold(True)
-        elif columna == 4:  # Tags en cursiva
-            fuente.setItalic(True)
-            fuente.setPointSize(9)
-        
-        return fuente
-    
-    def _obtener_color_texto(self, enlace: Dict[str, Any], columna: int) -> Optional[QColor]:
-        """Obtiene el color del texto para una celda específica."""
-        if columna == 1:  # URL en azul
-            return QColor(0, 0, 255)
-        elif columna == 3:  # Tags en gris
-            return QColor(100, 100, 100)
-        elif columna == 4:  # Fecha en gris claro
-            return QColor(150, 150, 150)
-        
-        return None
+    @staticmethod
+    def _obtener_fuente(enlace: Dict[str, Any], columna: int) -> Optional[QFont]:
+        """Obtiene la fuente (compartida) para una celda específica."""
+        fuentes = _estilos_columnas().fuentes
+        return fuentes[columna] if 0 <= columna < len(fuentes) else None
+    
+    @staticmethod
+    def _obtener_color_texto(enlace: Dict[str, Any], columna: int) -> Optional[QBrush]:
+        """Obtiene el pincel (compartido) del texto para una celda específica."""
+        pinceles = _estilos_columnas().pinceles
+        return pinceles[columna] if 0 <= columna < len(pinceles) else None
     
     def _obtener_tooltip(self, enlace: Dict[str, Any], columna: int) -> str:
         """Obtiene el tooltip para una celda específica."""
@@ -204,19 +345,15 @@ class ModeloTablaEnlaces(QAbstractTableModel):
                 return f"Tags: {', '.join(tags)}\nClic en un tag para filtrar"
             return "Sin tags"
         elif columna == 4:  # Información de fechas
-            creado = enlace.get('creado_en', '')
-            actualizado = enlace.get('actualizado_en', '')
-            return f"Creado: {formatear_fecha(creado)}\nActualizado: {formatear_fecha(actualizado)}"
+            creado = formatear_fecha(fecha_guardada(enlace, 'creado_en'))
+            actualizado = formatear_fecha(fecha_guardada(enlace, 'actualizado_en'))
+            return f"Creado: {creado}\nActualizado: {actualizado}"
         
         return ""
     
     def _obtener_score_enlace(self, enlace: Dict[str, Any]) -> float:
         """Obtiene el score de un enlace si está disponible."""
-        enlace_id = enlace.get('id', '')
-        for enlace_score, score in self._enlaces_con_score:
-            if enlace_score.get('id') == enlace_id:
-                return score
-        return 1.0
+        return self._scores.get(enlace.get('id', ''), 1.0)
     
     def headerData(self, section: int, orientation: Qt.Orientation, 
                   role: int = Qt.ItemDataRole.DisplayRole) -> Any:
@@ -238,11 +375,9 @@ class ModeloTablaEnlaces(QAbstractTableModel):
             else:
                 return str(section + 1)
         elif role == Qt.ItemDataRole.FontRole and orientation == Qt.Orientation.Horizontal:
-            fuente = QFont()
-            fuente.setBold(True)
-            return fuente
+            return _estilos_columnas().cabecera
         
-        return QVariant()
+        return _SIN_DATOS
     
     def flags(self, index: QModelIndex) -> Qt.ItemFlag:
         """Retorna las flags para una celda específica."""
@@ -251,31 +386,296 @@ class ModeloTablaEnlaces(QAbstractTableModel):
         
         return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
     
-    def actualizar_enlaces(self, enlaces: List[Dict[str, Any]]) -> None:
+    def sort(self, column: int, order: Qt.SortOrder = Qt.SortOrder.AscendingOrder) -> None:
+        """
+        Cambia el orden pedido desde la cabecera (columna -1: orden natural).
+        
+        Args:
+            column: Columna por la que ordenar
+            order: Sentido del orden
+        """
+        orden = None
+        if 0 <= column < len(CAMPOS_ORDEN_COLUMNAS):
+            orden = (CAMPOS_ORDEN_COLUMNAS[column], order == Qt.SortOrder.DescendingOrder)
+        if orden != self._orden:
+            self._orden = orden
+            self.orden_cambiado.emit()
+    
+    def obtener_orden(self) -> Optional[Tuple[str, bool]]:
+        """Retorna el orden pedido (campo, descendente) o None para el orden natural."""
+        return self._orden
+    
+    def canFetchMore(self, parent: QModelIndex = QModelIndex()) -> bool:
+        """Indica si quedan filas del resultado por entregar a la vista."""
+        return not parent.isValid() and self._cargadas < len(self._enlaces)
+    
+    def fetchMore(self, parent: QModelIndex = QModelIndex()) -> None:
+        """Entrega a la vista la siguiente página de filas."""
+        if not parent.isValid():
+            self._cargar(self._cargadas + self._filas_por_pagina)
+    
+    def cargar_todo(self) -> int:
+        """
+        Entrega a la vista todas las filas que quedan del resultado.
+        
+        Returns:
+            Número de filas añadidas
+        """
+        return self._cargar(len(self._enlaces))
+    
+    def _cargar(self, hasta: int) -> int:
+        """Añade las filas del resultado hasta la posición indicada (excluida)."""
+        inicio = self._cargadas
+        hasta = min(hasta, len(self._enlaces))
+        if hasta <= inicio:
+            return 0
+        nuevos = self._enlaces[inicio:hasta]
+        puntuaciones = self._scores if self._usar_scores else {}
+        ids, firmas = self._identificar((enlace, puntuaciones.get(enlace.get('id'))) for enlace in nuevos)
+        self.beginInsertRows(QModelIndex(), inicio, hasta - 1)
+        self._ids.extend(ids)
+        self._firmas.update(firmas)
+        self._cargadas = hasta
+        self.endInsertRows()
+        return hasta - inicio
+    
+    def actualizar_enlaces(self, enlaces: List[Dict[str, Any]]) -> bool:
         """
         Actualiza la lista de enlaces mostrados.
         
         Args:
             enlaces: Nueva lista de enlaces
+            
+        Returns:
+            True si hubo que reiniciar el modelo
         """
-        self.beginResetModel()
-        self._enlaces = enlaces.copy()
-        self._enlaces_con_score = []
-        self._usar_scores = False
-        self.endResetModel()
+        return self._sustituir_filas(list(enlaces), None)
     
-    def actualizar_enlaces_con_score(self, enlaces_con_score: List[Tuple[Dict[str, Any], float]]) -> None:
+    def actualizar_enlaces_con_score(self, enlaces_con_score: List[Tuple[Dict[str, Any], float]]) -> bool:
         """
         Actualiza la lista de enlaces con scores de búsqueda.
         
         Args:
             enlaces_con_score: Lista de tuplas (enlace, score)
+            
+        Returns:
+            True si hubo que reiniciar el modelo
         """
-        self.beginResetModel()
-        self._enlaces = [enlace for enlace, _ in enlaces_con_score]
-        self._enlaces_con_score = enlaces_con_score.copy()
-        self._usar_scores = True
-        self.endResetModel()
+        return self._sustituir_filas([enlace for enlace, _ in enlaces_con_score], enlaces_con_score)
+    
+    def actualizar_filas(self, enlaces: Sequence[Dict[str, Any]], filas: Sequence[int]) -> bool:
+        """
+        Muestra las filas seleccionadas por un filtro sin copiar los enlaces.
+        
+        Args:
+            enlaces: Lista completa de enlaces del repositorio
+            filas: Índices de los enlaces a mostrar (lista o array de NumPy)
+            
+        Returns:
+            True si hubo que reiniciar el modelo
+        """
+        return self._sustituir_filas(VistaFilas(enlaces, filas), None)
+    
+    @staticmethod
+    def _identificar(pares: Iterable[Tuple[Dict[str, Any], Optional[float]]]) -> Tuple[List[str], Dict[str, tuple]]:
+        """
+        Ids en orden de fila y firma de cada enlace en una pasada.
+        
+        La firma reúne aquello de lo que depende cómo se pinta la fila: el
+        objeto, su fecha de actualización y el score de búsqueda.
+        """
+        ids = []
+        firmas = {}
+        for enlace, score in pares:
+            if type(enlace) is EnlaceCompacto:
+                # Atributos directos: es el bucle más repetido al actualizar
+                enlace_id, fecha = enlace.id, enlace.actualizado_en
+            else:
+                enlace_id, fecha = enlace.get('id'), enlace.get('actualizado_en')
+            ids.append(enlace_id)
+            firmas[enlace_id] = (id(enlace), fecha, score)
+        return ids, firmas
+    
+    def _sustituir_filas(self, enlaces: Sequence[Dict[str, Any]],
+                         enlaces_con_score: Optional[List[Tuple[Dict[str, Any], float]]]) -> bool:
+        """
+        Cambia las filas mostradas emitiendo solo las señales de lo que cambió.
+        
+        Solo se comparan las filas cargadas: se conservan tantas como había
+        (al menos una página) para no perder la posición de desplazamiento,
+        y el resto del resultado no se recorre.
+        
+        Se compara la secuencia de ids anterior con la nueva: las filas que
+        desaparecen se quitan con beginRemoveRows, las que cambian de orden se
+        recolocan con layoutChanged (conservando selección y desplazamiento),
+        las nuevas se insertan con beginInsertRows y solo se repintan las que
+        se mantienen pero cambiaron desde la última vez. Si la diferencia se
+        reparte en demasiados tramos se aplica como un único layoutChanged; el
+        modelo solo se reinicia cuando antes o después no hay filas.
+        
+        Args:
+            enlaces: Enlaces a mostrar, en orden
+            enlaces_con_score: Pares (enlace, score) si vienen de una búsqueda
+            
+        Returns:
+            True si hubo que reiniciar el modelo
+        """
+        pares = enlaces_con_score if enlaces_con_score is not None else zip(enlaces, repeat(None))
+        pagina = self._filas_por_pagina
+        cargadas = min(len(enlaces), max(self._cargadas, pagina) if self._ids else pagina)
+        ids_nuevos, firmas_nuevas = self._identificar(islice(pares, cargadas))
+        
+        ids_viejos = self._ids
+        firmas_viejas = self._firmas
+        reiniciar = (not ids_viejos or not ids_nuevos
+                     # Ids repetidos (o ausentes): la diferencia no se puede calcular
+                     or len(firmas_nuevas) != len(ids_nuevos) or len(firmas_viejas) != len(ids_viejos))
+        url_max_chars = obtener_config_tabla()['url_max_chars']
+        if reiniciar or url_max_chars != self._url_max_chars:
+            self.beginResetModel()
+            self._enlaces = enlaces
+            self._cargadas = cargadas
+            self._scores = self._puntuaciones(enlaces_con_score)
+            self._usar_scores = enlaces_con_score is not None
+            self._ids = ids_nuevos
+            self._firmas = firmas_nuevas
+            self._textos = {}
+            self._tooltips = {}
+            self._url_max_chars = url_max_chars
+            self.endResetModel()
+            return True
+        
+        if ids_nuevos != ids_viejos:
+            self._mover_filas(ids_viejos, ids_nuevos, firmas_viejas, firmas_nuevas, enlaces)
+        
+        # Mismas filas y en el mismo orden que ya conoce la vista
+        self._enlaces = enlaces
+        self._cargadas = cargadas
+        self._scores = self._puntuaciones(enlaces_con_score)
+        self._usar_scores = enlaces_con_score is not None
+        self._ids = ids_nuevos
+        self._firmas = firmas_nuevas
+        
+        # Sin ids repetidos, las firmas están en orden de fila
+        cambiadas = []
+        for fila, (enlace_id, firma) in enumerate(firmas_nuevas.items()):
+            anterior = firmas_viejas.get(enlace_id)
+            if anterior is not None and anterior != firma:
+                cambiadas.append(fila)
+        self._olvidar_textos(ids_nuevos[fila] for fila in cambiadas)
+        if len(self._textos) > len(ids_nuevos):
+            # Textos de enlaces que ya no se muestran
+            self._olvidar_textos([enlace_id for enlace_id in self._textos if enlace_id not in firmas_nuevas])
+        ultima_columna = self.columnCount() - 1
+        for inicio, fin in _tramos(cambiadas):
+            self.dataChanged.emit(self.index(inicio, 0), self.index(fin, ultima_columna))
+        return False
+    
+    @staticmethod
+    def _puntuaciones(enlaces_con_score: Optional[List[Tuple[Dict[str, Any], float]]]) -> Dict[str, float]:
+        """Score de cada enlace de una búsqueda, por id."""
+        return {enlace.get('id'): score for enlace, score in enlaces_con_score or ()}
+    
+    def _mover_filas(self, ids_viejos: List[str], ids_nuevos: List[str], firmas_viejas: Dict[str, tuple],
+                     firmas_nuevas: Dict[str, tuple], enlaces: Sequence[Dict[str, Any]]) -> None:
+        """Quita, recoloca e inserta filas hasta tener las nuevas, avisando a la vista."""
+        eliminadas = [fila for fila, enlace_id in enumerate(ids_viejos) if enlace_id not in firmas_nuevas]
+        insertadas = [fila for fila, enlace_id in enumerate(ids_nuevos) if enlace_id not in firmas_viejas]
+        tramos_eliminados = _tramos(eliminadas)
+        tramos_insertados = _tramos(insertadas)
+        
+        if len(tramos_eliminados) + len(tramos_insertados) > MAX_TRAMOS_INCREMENTALES:
+            # Un único cambio de disposición: las filas que siguen conservan
+            # la selección y las eliminadas la pierden
+            self.layoutAboutToBeChanged.emit()
+            anteriores = self.persistentIndexList()
+            self._enlaces = enlaces
+            self._cargadas = len(ids_nuevos)
+            posicion = {enlace_id: fila for fila, enlace_id in enumerate(ids_nuevos)}
+            self.changePersistentIndexList(anteriores, [
+                self.index(posicion[ids_viejos[indice.row()]], indice.column())
+                if ids_viejos[indice.row()] in posicion else QModelIndex()
+                for indice in anteriores
+            ])
+            self.layoutChanged.emit()
+            return
+        
+        # Solo las filas cargadas: el resto del resultado anterior no se copia
+        actual = list(self._enlaces[:self._cargadas])
+        ids_actual = list(ids_viejos)
+        for inicio, fin in reversed(tramos_eliminados):
+            self.beginRemoveRows(QModelIndex(), inicio, fin)
+            del actual[inicio:fin + 1]
+            del ids_actual[inicio:fin + 1]
+            self._enlaces = actual
+            self._cargadas = len(actual)
+            self.endRemoveRows()
+        
+        conservados = [enlace_id for enlace_id in ids_nuevos if enlace_id in firmas_viejas]
+        if conservados != ids_actual:
+            self.layoutAboutToBeChanged.emit()
+            posicion = {enlace_id: fila for fila, enlace_id in enumerate(conservados)}
+            anteriores = self.persistentIndexList()
+            self.changePersistentIndexList(anteriores, [
+                self.index(posicion[ids_actual[indice.row()]], indice.column()) for indice in anteriores
+            ])
+            por_id = dict(zip(ids_actual, actual))
+            actual = [por_id[enlace_id] for enlace_id in conservados]
+            self._enlaces = actual
+            self.layoutChanged.emit()
+        
+        for inicio, fin in tramos_insertados:
+            self.beginInsertRows(QModelIndex(), inicio, fin)
+            actual[inicio:inicio] = [enlaces[fila] for fila in range(inicio, fin + 1)]
+            self._enlaces = actual
+            self._cargadas = len(actual)
+            self.endInsertRows()
+    
+    def refrescar_enlaces(self, ids: AbstractSet[str]) -> int:
+        """
+        Notifica a la vista que cambiaron los datos de algunos enlaces mostrados.
+        
+        Los enlaces se muestran por referencia, así que basta con repintar sus
+        filas; no se reinicia el modelo.
+        
+        Args:
+            ids: IDs de los enlaces modificados
+        
+        Returns:
+            Número de filas repintadas
+        """
+        filas = [fila for fila, enlace_id in enumerate(self._ids) if enlace_id in ids]
+        puntuaciones = self._scores if self._usar_scores else {}
+        _, firmas = self._identificar(
+            (self._enlaces[fila], puntuaciones.get(self._ids[fila])) for fila in filas)
+        self._firmas.update(firmas)
+        self._olvidar_textos(firmas)
+        ultima_columna = self.columnCount() - 1
+        for inicio, fin in _tramos(filas):
+            self.dataChanged.emit(self.index(inicio, 0), self.index(fin, ultima_columna))
+        return len(filas)
+    
+    def obtener_fila_por_id(self, enlace_id: str, cargar: bool = False) -> int:
+        """
+        Busca la fila en la que se muestra un enlace.
+        
+        Args:
+            enlace_id: ID del enlace
+            cargar: Si el enlace está en el resultado pero aún no se cargó,
+                cargar las páginas necesarias hasta su fila
+            
+        Returns:
+            Número de fila o -1 si el enlace no se muestra
+        """
+        if enlace_id in self._firmas:
+            return self._ids.index(enlace_id)
+        if cargar:
+            for fila in range(self._cargadas, len(self._enlaces)):
+                if self._enlaces[fila].get('id') == enlace_id:
+                    pagina = self._filas_por_pagina
+                    self._cargar((fila // pagina + 1) * pagina)
+                    return fila
+        return -1
     
     def obtener_enlace_por_fila(self, fila: int) -> Optional[Dict[str, Any]]:
         """
@@ -287,7 +687,7 @@ class ModeloTablaEnlaces(QAbstractTableModel):
         Returns:
             Diccionario con el enlace o None si la fila no es válida
         """
-        if 0 <= fila < len(self._enlaces):
+        if 0 <= fila < self._cargadas:
             return self._enlaces[fila]
         return None
     
@@ -344,8 +744,13 @@ class ModeloTablaEnlaces(QAbstractTableModel):
         """Limpia todos los datos del modelo."""
         self.beginResetModel()
         self._enlaces = []
-        self._enlaces_con_score = []
+        self._cargadas = 0
+        self._scores = {}
         self._usar_scores = False
+        self._ids = []
+        self._firmas = {}
+        self._textos = {}
+        self._tooltips = {}
         self.endResetModel()
     
     def esta_vacio(self) -> bool:
@@ -353,5 +758,9 @@ class ModeloTablaEnlaces(QAbstractTableModel):
         return len(self._enlaces) == 0
     
     def obtener_numero_enlaces(self) -> int:
-        """Retorna el número total de enlaces."""
-        return len(self._enlaces)
\ No newline at end of file
+        """Retorna el número total de enlaces del resultado (cargados o no)."""
+        return len(self._enlaces)
+    
+    def obtener_numero_sin_cargar(self) -> int:
+        """Retorna el número de enlaces del resultado que aún no se cargaron."""
+        return len(self._enlaces) - self._cargadas
\ No newline at end of file
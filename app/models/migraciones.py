@@ -0,0 +1,101 @@
+"""
+Migraciones del formato de datos según el campo 'version' del documento.
+
+Cada migración lleva los enlaces de la versión anterior a la suya. Al cargar
+un documento se aplican, en orden y en una sola pasada por los enlaces, las
+migraciones posteriores a su versión; después el documento queda con
+VERSION_ACTUAL y se guarda una vez. Un documento al día no recorre ningún
+enlace.
+
+Para añadir una migración basta con una función que modifique un enlace
+(devolviendo True si lo cambió) y una entrada nueva al final de MIGRACIONES.
+"""
+import logging
+from typing import Any, Callable, Dict, List, MutableMapping, NamedTuple
+
+
+logger = logging.getLogger(__name__)
+
+
+class Migracion(NamedTuple):
+    """Paso de la versión version - 1 a version."""
+    version: int
+    descripcion: str
+    migrar_enlace: Callable[[MutableMapping[str, Any]], bool]
+
+
+def _agregar_favorito(enlace: MutableMapping[str, Any]) -> bool:
+    if 'es_favorito' in enlace:
+        return False
+    enlace['es_favorito'] = False
+    return True
+
+
+# En orden de versión, sin huecos
+MIGRACIONES: List[Migracion] = [
+    Migracion(2, "Campo es_favorito en todos los enlaces", _agregar_favorito),
+]
+
+VERSION_ACTUAL = MIGRACIONES[-1].version
+
+
+def version_documento(datos: Dict[str, Any]) -> int:
+    """
+    Versión de formato de un documento.
+
+    Args:
+        datos: Documento con el formato de links.json
+
+    Returns:
+        Valor del campo 'version' (1 si no lo tiene)
+    """
+    version = datos.get('version', 1)
+    return version if isinstance(version, int) else 1
+
+
+def necesita_migracion(datos: Dict[str, Any]) -> bool:
+    """
+    Indica si un documento tiene una versión anterior a la actual.
+
+    Args:
+        datos: Documento con el formato de links.json
+
+    Returns:
+        True si hay migraciones pendientes
+    """
+    return version_documento(datos) < VERSION_ACTUAL
+
+
+def migrar_documento(datos: Dict[str, Any]) -> List[MutableMapping[str, Any]]:
+    """
+    Aplica las migraciones pendientes y actualiza la versión del documento.
+
+    Args:
+        datos: Documento con el formato de links.json (se modifica en su sitio)
+
+    Returns:
+        Enlaces modificados
+    """
+    version = version_documento(datos)
+    if version > VERSION_ACTUAL:
+        logger.warning(f"Los datos tienen la versión {version}, posterior a la soportada "
+                       f"({VERSION_ACTUAL}); no se migran")
+        return []
+
+    pendientes = [migracion.migrar_enlace for migracion in MIGRACIONES if migracion.version > version]
+    if not pendientes:
+        return []
+
+    modificados = []
+    for enlace in datos.get('links', []):
+        cambiado = False
+        for migrar_enlace in pendientes:
+            # Sin cortocircuito: todas las migraciones se aplican a cada enlace
+            cambiado = migrar_enlace(enlace) or cambiado
+        if cambiado:
+            modificados.append(enlace)
+
+    datos['version'] = VERSION_ACTUAL
+    logger.info(f"Datos migrados de la versión {version} a la {VERSION_ACTUAL}: "
+                f"{len(modificados)} enlaces modificados")
+    return modificados
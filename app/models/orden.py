@@ -0,0 +1,227 @@
+"""
+Ordenación de enlaces por columna con claves precalculadas.
+
+Para ordenar por un campo se calcula una sola vez la clave normalizada de
+cada enlace del repositorio (título en casefold, host de la URL, número de
+tags, fecha en microsegundos...) y con ella la permutación ordenada de todas
+las filas y el rango de cada fila. Ordenar el resultado de un filtro es
+entonces ordenar sus índices por rango, enteros (con NumPy si está
+instalado), sin volver a calcular claves ni comparar textos; el mismo rango
+sirve para todos los filtros mientras no cambien los enlaces.
+
+Cada orden calculado se guarda por campo y sentido. Los empates conservan el
+orden del repositorio en los dos sentidos. Tras editar enlaces solo se
+descartan los órdenes en los que un enlace editado ya no encaja entre sus
+vecinos; agregar o eliminar enlaces los descarta todos.
+"""
+import logging
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from .enlace import EnlaceCompacto, clave_fecha
+from .eventos import EventoCambio
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional
+    np = None
+
+
+logger = logging.getLogger(__name__)
+
+# Órdenes (campo, sentido) que se conservan a la vez
+MAX_ORDENES = 4
+
+
+def _clave_titulo(enlace: Any) -> str:
+    return (enlace.get('titulo') or '').casefold()
+
+
+def _clave_host(enlace: Any) -> str:
+    # Cortes de texto en lugar de urlsplit, varias veces más lento con
+    # cientos de miles de enlaces
+    url = enlace.get('url') or ''
+    inicio = url.find('://')
+    host = url[inicio + 3:] if inicio >= 0 else url
+    for separador in '/?#':
+        host = host.partition(separador)[0]
+    host = host.rpartition('@')[2].partition(':')[0].lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+def _clave_categoria(enlace: Any) -> str:
+    return (enlace.get('categoria') or '').casefold()
+
+
+def _clave_tags(enlace: Any) -> int:
+    tags = enlace.tags if isinstance(enlace, EnlaceCompacto) else enlace.get('tags')
+    return len(tags) if isinstance(tags, (list, tuple)) else 0
+
+
+def _clave_actualizado(enlace: Any) -> int:
+    return clave_fecha(enlace, 'actualizado_en')
+
+
+def _clave_favorito(enlace: Any) -> bool:
+    return bool(enlace.get('es_favorito', False))
+
+
+# Campo ordenable -> clave normalizada de un enlace
+CLAVES_ORDEN: Dict[str, Callable[[Any], Any]] = {
+    'titulo': _clave_titulo,
+    'host': _clave_host,
+    'categoria': _clave_categoria,
+    'tags': _clave_tags,
+    'actualizado': _clave_actualizado,
+    'favorito': _clave_favorito,
+}
+
+
+def _precede(clave_a: Any, fila_a: int, clave_b: Any, fila_b: int, descendente: bool) -> bool:
+    """True si la fila a va antes que la b (los empates, por fila)."""
+    if clave_a != clave_b:
+        return clave_a > clave_b if descendente else clave_a < clave_b
+    return fila_a < fila_b
+
+
+def _sigue_en_su_sitio(enlaces: Sequence, orden: Sequence[int], rango: Sequence[int], fila: int,
+                       campo: str, descendente: bool) -> bool:
+    """True si la clave actual de una fila sigue encajando entre sus vecinas del orden."""
+    calcular = CLAVES_ORDEN[campo]
+    posicion = int(rango[fila])
+    clave = calcular(enlaces[fila])
+    if posicion > 0:
+        anterior = int(orden[posicion - 1])
+        if not _precede(calcular(enlaces[anterior]), anterior, clave, fila, descendente):
+            return False
+    if posicion + 1 < len(orden):
+        siguiente = int(orden[posicion + 1])
+        if not _precede(clave, fila, calcular(enlaces[siguiente]), siguiente, descendente):
+            return False
+    return True
+
+
+class OrdenEnlaces:
+    """
+    Órdenes por columna de los enlaces del repositorio.
+
+    El repositorio llama a aplicar_evento tras cada cambio, como con el
+    AlmacenColumnar; los órdenes se calculan la primera vez que se piden.
+    """
+
+    def __init__(self):
+        # (campo, descendente) -> (filas en orden, rango de cada fila)
+        self._ordenes: 'OrderedDict[Tuple[str, bool], Tuple[Sequence[int], Sequence[int]]]' = OrderedDict()
+        self._fila_por_id: Optional[Dict[Any, int]] = None
+        self._filas = 0
+
+    def invalidar(self) -> None:
+        """Descarta todos los órdenes calculados."""
+        self._ordenes.clear()
+        self._fila_por_id = None
+
+    def _filas_de(self, enlaces: Sequence) -> Dict[Any, int]:
+        """Fila de cada enlace por id (se calcula al primer uso)."""
+        if self._fila_por_id is None:
+            self._fila_por_id = {enlace.get('id'): fila for fila, enlace in enumerate(enlaces)}
+        return self._fila_por_id
+
+    def aplicar_evento(self, evento: EventoCambio, enlaces: Sequence) -> None:
+        """
+        Descarta los órdenes que un cambio del repositorio deja desfasados.
+
+        Args:
+            evento: Cambios emitidos por el repositorio
+            enlaces: Enlaces del repositorio tras el cambio
+        """
+        if not self._ordenes and self._fila_por_id is None:
+            return
+        if evento.cambia_filas:
+            self.invalidar()
+            return
+        if not evento.actualizados or not self._ordenes:
+            return
+
+        fila_por_id = self._filas_de(enlaces)
+        filas = [fila_por_id.get(enlace_id) for enlace_id in evento.actualizados]
+        if None in filas or len(enlaces) != self._filas:
+            self.invalidar()
+            return
+
+        for clave_orden, (orden, rango) in list(self._ordenes.items()):
+            if not all(_sigue_en_su_sitio(enlaces, orden, rango, fila, *clave_orden) for fila in filas):
+                del self._ordenes[clave_orden]
+
+    def _orden(self, enlaces: Sequence, campo: str, descendente: bool) -> Tuple[Sequence[int], Sequence[int]]:
+        """Permutación ordenada de todas las filas y rango de cada fila."""
+        if len(enlaces) != self._filas:
+            self.invalidar()
+            self._filas = len(enlaces)
+        clave_orden = (campo, descendente)
+        calculado = self._ordenes.get(clave_orden)
+        if calculado is not None:
+            self._ordenes.move_to_end(clave_orden)
+            return calculado
+
+        calcular = CLAVES_ORDEN[campo]
+        claves = [calcular(enlace) for enlace in enlaces]
+        # sorted es estable también con reverse: los empates siguen por fila
+        orden = sorted(range(len(claves)), key=claves.__getitem__, reverse=descendente)
+        if np is not None:
+            orden = np.array(orden, dtype=np.int64)
+            rango = np.empty(len(orden), dtype=np.int64)
+            rango[orden] = np.arange(len(orden), dtype=np.int64)
+        else:
+            rango = [0] * len(orden)
+            for posicion, fila in enumerate(orden):
+                rango[fila] = posicion
+
+        self._ordenes[clave_orden] = calculado = (orden, rango)
+        while len(self._ordenes) > MAX_ORDENES:
+            self._ordenes.popitem(last=False)
+        logger.debug(f"Orden por {campo} ({'desc' if descendente else 'asc'}) calculado: {len(orden)} filas")
+        return calculado
+
+    def ordenar_filas(self, enlaces: Sequence, filas: Sequence[int], campo: str,
+                      descendente: bool = False) -> Sequence[int]:
+        """
+        Ordena índices de filas por un campo.
+
+        Args:
+            enlaces: Enlaces del repositorio
+            filas: Índices (en enlaces) a ordenar, sin repetir
+            campo: Clave de CLAVES_ORDEN
+            descendente: Orden descendente
+
+        Returns:
+            Los mismos índices ordenados (de solo lectura: puede ser el orden cacheado)
+        """
+        orden, rango = self._orden(enlaces, campo, descendente)
+        if len(filas) == len(orden):
+            # Sin filtrar: todas las filas, ya ordenadas
+            return orden
+        if np is not None:
+            filas = np.asarray(filas, dtype=np.int64)
+            return filas[np.argsort(rango[filas], kind='stable')]
+        return sorted(filas, key=rango.__getitem__)
+
+    def ordenar_pares(self, enlaces: Sequence, pares: List[Tuple[Any, Any]], campo: str,
+                      descendente: bool = False) -> List[Tuple[Any, Any]]:
+        """
+        Ordena pares (enlace, valor), como los resultados de una búsqueda.
+
+        Args:
+            enlaces: Enlaces del repositorio
+            pares: Pares cuyo primer elemento es un enlace del repositorio
+            campo: Clave de CLAVES_ORDEN
+            descendente: Orden descendente
+
+        Returns:
+            Lista nueva con los pares ordenados (los enlaces que no están en el
+            repositorio, al final)
+        """
+        _, rango = self._orden(enlaces, campo, descendente)
+        fila_por_id = self._filas_de(enlaces)
+        final = len(enlaces)
+        posiciones = [rango[fila] if (fila := fila_por_id.get(enlace.get('id'))) is not None else final
+                      for enlace, _ in pares]
+        return [pares[indice] for indice in sorted(range(len(pares)), key=posiciones.__getitem__)]
@@ -1,12 +1,32 @@
 """
-Repositorio para gestión de datos de enlaces en formato JSON.
+Repositorio para gestión de datos de enlaces.
+
+La persistencia se delega en un backend de almacenamiento intercambiable
+(JSON por defecto, SQLite opcional).
 """
 import json
 import logging
 import uuid
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Set
-from ..utils.io import cargar_json, guardar_json, validar_estructura_json, crear_backup
+from typing import Callable, Iterable, Iterator, List, Dict, Any, Optional, Sequence, Set, Tuple
+from .columnas import AlmacenColumnar, FiltroEnlaces, NUMPY_DISPONIBLE, filtrar_filas_python
+from .enlace import clave_fecha, compactar, compactar_enlaces
+from .estadisticas import EstadisticasEnlaces
+from .eventos import CambiosPendientes, EventoCambio
+from .fusion import IndiceFusion, calcular_fusion
+from .indice_categorias import IndiceCategorias
+from .instantanea import EnlaceCongelado, InstantaneaEnlaces, congelar, restaurar_enlace
+from .migraciones import VERSION_ACTUAL, migrar_documento, necesita_migracion
+from .orden import OrdenEnlaces
+from .search import buscar_enlaces
+from ..intercambio.normalizacion import normalizar_registro
+from ..config import obtener_config_almacenamiento
+from ..storage import (
+    BackendAlmacenamiento, BackendJSON, CopiaSeguridad, Mutacion, crear_backend,
+    AGREGAR, ACTUALIZAR, ELIMINAR, CATEGORIAS, REEMPLAZAR
+)
+from ..utils.esquema import MAX_ERRORES_LOG, registrar_diagnostico, validar_documento
 from ..utils.time import obtener_timestamp_actual
 from ..utils.validators import (
     validar_url, validar_titulo, validar_categoria, 
@@ -17,38 +37,302 @@ from ..utils.validators import (
 logger = logging.getLogger(__name__)
 
 
+class TransaccionCancelada(Exception):
+    """Se lanza dentro de una transacción para deshacerla sin propagar el error."""
+
+
+class _EstadoTransaccion:
+    """Lo necesario para deshacer una transacción abierta."""
+    
+    def __init__(self, datos: Dict[str, Any], cambios: CambiosPendientes):
+        # Copia superficial: los enlaces se modifican en su sitio y su estado
+        # anterior se guarda en el diario la primera vez que se tocan
+        self.datos = {**datos, 'links': list(datos.get('links', [])),
+                      'categorias': list(datos.get('categorias', []))}
+        self.cambios = cambios.copiar()
+        # id(enlace) -> (enlace, copia congelada anterior a la transacción)
+        self.diario: Dict[int, Tuple[Dict[str, Any], EnlaceCongelado]] = {}
+        self.mutaciones: List[Mutacion] = []
+        self.guardado_pendiente = False
+        self.instantanea: Optional[InstantaneaEnlaces] = None
+
+
 class RepositorioEnlaces:
     """
-    Repositorio para gestionar la persistencia de enlaces en JSON.
+    Repositorio para gestionar los enlaces y su persistencia.
+    
+    Cada operación que modifica los datos notifica a los suscriptores un
+    EventoCambio con los ids afectados y una generación creciente.
     """
     
-    def __init__(self, ruta_archivo: Path):
+    def __init__(self, ruta_archivo: Path, backend: Optional[BackendAlmacenamiento] = None):
         """
         Inicializa el repositorio.
         
         Args:
-            ruta_archivo: Ruta al archivo JSON de datos
+            ruta_archivo: Ruta al archivo de datos
+            backend: Backend de almacenamiento (por defecto JSON sobre ruta_archivo)
         """
         self.ruta_archivo = ruta_archivo
+        self._backend = backend or BackendJSON(ruta_archivo)
+        self._suscriptores: List[Callable[[EventoCambio], None]] = []
+        self._generacion = 0
+        self._cambios = CambiosPendientes()
+        self._nivel_agrupacion = 0
+        self._transaccion: Optional[_EstadoTransaccion] = None
+        usar_columnas = NUMPY_DISPONIBLE and obtener_config_almacenamiento().get('almacen_columnar', True)
+        self._columnas = AlmacenColumnar() if usar_columnas else None
+        self._estadisticas = EstadisticasEnlaces()
+        self._orden = OrdenEnlaces()
+        self._indice_categorias: Optional[IndiceCategorias] = None
+        # Copias congeladas por id que comparten las instantáneas sucesivas
+        self._congelados: Dict[str, EnlaceCongelado] = {}
+        self._instantanea: Optional[InstantaneaEnlaces] = None
         self._datos = self._cargar_o_crear_datos()
+        # La carga inicial no se notifica: todavía no hay suscriptores
+        self._cambios = CambiosPendientes()
+    
+    @property
+    def generacion(self) -> int:
+        """Generación actual de los datos; aumenta con cada evento emitido."""
+        return self._generacion
+    
+    def suscribir(self, funcion: Callable[[EventoCambio], None]) -> None:
+        """
+        Registra una función que recibirá los eventos de cambio.
+        
+        Args:
+            funcion: Función llamada con cada EventoCambio
+        """
+        if funcion not in self._suscriptores:
+            self._suscriptores.append(funcion)
+    
+    def desuscribir(self, funcion: Callable[[EventoCambio], None]) -> None:
+        """
+        Deja de notificar a una función registrada con suscribir.
         
-        # ⭐ Migrar enlaces existentes para soporte de favoritos
-        self.migrar_favoritos()
+        Args:
+            funcion: Función a retirar
+        """
+        if funcion in self._suscriptores:
+            self._suscriptores.remove(funcion)
+    
+    @contextmanager
+    def agrupar_cambios(self) -> Iterator[None]:
+        """
+        Agrupa varias operaciones para emitir un único evento al terminar.
+        
+        Los bloques se pueden anidar; el evento se emite al salir del más externo.
+        """
+        self._nivel_agrupacion += 1
+        try:
+            yield
+        finally:
+            self._nivel_agrupacion -= 1
+            self._emitir_cambios()
+    
+    @contextmanager
+    def transaccion(self, guardar: bool = True) -> Iterator[None]:
+        """
+        Agrupa varias operaciones en una transacción.
+        
+        Dentro del bloque las mutaciones del backend se acumulan; al salir se
+        aplican de una vez, se emite un único evento y, si guardar es True,
+        se persiste una sola vez. Si el bloque lanza una excepción los datos
+        vuelven al estado anterior a la transacción, no se emite ningún
+        evento ni se toca el backend. TransaccionCancelada deshace la
+        transacción sin propagarse. Las transacciones anidadas forman parte
+        de la más externa.
+        
+        Args:
+            guardar: Persistir los cambios al confirmar la transacción
+        """
+        if self._transaccion is not None:
+            yield
+            return
+        
+        self._transaccion = estado = _EstadoTransaccion(self._datos, self._cambios)
+        estado.instantanea = self._instantanea
+        self._nivel_agrupacion += 1
+        try:
+            yield
+        except BaseException as e:
+            self._transaccion = None
+            self._deshacer(estado)
+            self._nivel_agrupacion -= 1
+            if isinstance(e, TransaccionCancelada):
+                logger.info("Transacción cancelada")
+                return
+            logger.error(f"Transacción deshecha por un error: {e}")
+            raise
+        
+        self._transaccion = None
+        self._nivel_agrupacion -= 1
+        if estado.mutaciones:
+            self._backend.aplicar(estado.mutaciones)
+        if ((guardar and estado.mutaciones) or estado.guardado_pendiente) and not self.guardar():
+            logger.error("No se pudo guardar el resultado de la transacción")
+        self._emitir_cambios()
+    
+    def _aplicar(self, mutaciones: List[Mutacion]) -> None:
+        """Envía mutaciones al backend, o las acumula si hay una transacción abierta."""
+        if self._transaccion is not None:
+            self._transaccion.mutaciones.extend(mutaciones)
+        else:
+            self._backend.aplicar(mutaciones)
+    
+    def _antes_de_modificar(self, enlace: Dict[str, Any]) -> None:
+        """Guarda el estado de un enlace que se va a modificar en su sitio."""
+        if self._transaccion is not None and id(enlace) not in self._transaccion.diario:
+            self._transaccion.diario[id(enlace)] = (enlace, congelar(enlace))
+    
+    def _deshacer(self, estado: _EstadoTransaccion) -> None:
+        """Devuelve los datos en memoria al estado anterior a una transacción."""
+        cambios = self._cambios
+        tocados = cambios.agregados | cambios.actualizados | cambios.eliminados
+        for enlace, anterior in estado.diario.values():
+            restaurar_enlace(enlace, anterior)
+            tocados.add(anterior.id)
+        self._datos = estado.datos
+        self._cambios = estado.cambios
+        # Los enlaces vuelven a ser los mismos objetos, pero el índice pudo
+        # quedar a medias: se reconstruye cuando se necesite
+        self._indice_categorias = None
+        self._orden.invalidar()
+        self._descartar_congelados(cambios.recarga, tocados)
+        # Los datos vuelven a coincidir con la última instantánea publicada
+        self._instantanea = estado.instantanea
+        logger.info(f"Transacción deshecha: {len(estado.diario)} enlaces restaurados")
+    
+    def _emitir_cambios(self) -> None:
+        """Notifica los cambios acumulados si no hay un grupo abierto."""
+        if self._nivel_agrupacion or self._cambios.vacio():
+            return
+        
+        self._generacion += 1
+        evento = self._cambios.a_evento(self._generacion)
+        self._cambios = CambiosPendientes()
+        self._descartar_congelados(evento.recarga, evento.agregados | evento.actualizados | evento.eliminados)
+        # Columnas y estadísticas se sincronizan antes de que los suscriptores consulten
+        if self._columnas is not None:
+            self._columnas.aplicar_evento(evento, self.obtener_enlaces())
+        self._estadisticas.aplicar_evento(evento, self.obtener_enlaces())
+        self._orden.aplicar_evento(evento, self.obtener_enlaces())
+        for funcion in list(self._suscriptores):
+            try:
+                funcion(evento)
+            except Exception as e:
+                logger.error(f"Error al notificar cambio a {funcion}: {e}")
+    
+    def _descartar_congelados(self, todos: bool, ids: Set[str]) -> None:
+        """Olvida las copias congeladas de los enlaces que cambiaron."""
+        self._instantanea = None
+        if todos:
+            self._congelados = {}
+            return
+        for enlace_id in ids:
+            self._congelados.pop(enlace_id, None)
+    
+    def obtener_instantanea(self) -> InstantaneaEnlaces:
+        """
+        Obtiene una instantánea inmutable de los enlaces y categorías.
+        
+        La instantánea se puede pasar a un hilo de trabajo y leerse sin
+        cerrojos mientras la interfaz sigue modificando el repositorio. Solo
+        se congelan los enlaces que cambiaron desde la instantánea anterior;
+        el resto se comparten. Debe llamarse desde el hilo de la interfaz.
+        
+        Returns:
+            Instantánea sellada con la generación actual
+        """
+        pendientes = not self._cambios.vacio()
+        if self._instantanea is not None and not pendientes:
+            return self._instantanea
+        
+        if pendientes:
+            # Dentro de un grupo abierto los cambios aún no se han emitido
+            cambios = self._cambios
+            self._descartar_congelados(cambios.recarga, cambios.agregados | cambios.actualizados)
+        
+        congelados = self._congelados
+        enlaces = []
+        for enlace in self.obtener_enlaces():
+            congelado = congelados.get(enlace['id'])
+            if congelado is None:
+                congelado = congelados[enlace['id']] = congelar(enlace)
+            enlaces.append(congelado)
+        if len(congelados) > len(enlaces):
+            # Quedan copias de enlaces eliminados
+            vigentes = {enlace.id for enlace in enlaces}
+            self._congelados = {enlace_id: congelado for enlace_id, congelado in congelados.items()
+                                if enlace_id in vigentes}
+        
+        instantanea = InstantaneaEnlaces(self._generacion, tuple(enlaces), tuple(self.obtener_categorias()))
+        if not pendientes:
+            self._instantanea = instantanea
+        return instantanea
     
     def _cargar_o_crear_datos(self) -> Dict[str, Any]:
         """
         Carga los datos desde el archivo o crea datos por defecto.
         
+        Si el backend devuelve datos ya validados (instantánea vigente o
+        contenido con veredicto conocido) se omite la validación. Los enlaces
+        con arreglo se reparan y los que no lo tienen se descartan (el archivo
+        original queda en las copias de seguridad); solo un documento
+        inutilizable se sustituye por los datos por defecto. Las migraciones
+        solo recorren los enlaces si la versión de los datos es anterior a la
+        actual.
+        
         Returns:
             Diccionario con los datos
         """
-        datos = cargar_json(self.ruta_archivo)
-        
-        if datos is None or not validar_estructura_json(datos):
+        datos = self._backend.cargar()
+        self._cambios.recarga = True
+        self._indice_categorias = None
+        
+        if datos is not None and self._backend.carga_validada:
+            # Ya validados; solo hace falta migrar si vienen de una versión anterior
+            self._datos = datos
+            if self._migrar_formato():
+                self.guardar()
+            return datos
+        
+        resultado = None
+        if datos is not None:
+            resultado = validar_documento(datos, reparar=True, hash_contenido=self._backend.hash_contenido)
+            registrar_diagnostico(resultado, self.ruta_archivo)
+        
+        reparado = False
+        if resultado is None or not resultado.documento_valido:
             logger.warning("Datos no válidos o no existen, creando datos por defecto")
+            # El archivo que se va a sustituir queda en las copias de seguridad
+            self._backend.crear_backup()
             datos = self._crear_datos_por_defecto()
             # Guardar los datos por defecto directamente sin usar self.guardar()
-            guardar_json(datos, self.ruta_archivo)
+            self._backend.aplicar([Mutacion(REEMPLAZAR, datos=datos)])
+            self._backend.persistir(datos)
+        elif resultado.reparados or not resultado.valido:
+            irreparables = resultado.enlaces_irreparables
+            if irreparables:
+                # Solo se descartan los enlaces sin arreglo; el archivo
+                # original queda en las copias de seguridad
+                logger.error(f"Se descartan {len(irreparables)} enlaces que no se pueden reparar "
+                             f"(posiciones {irreparables[:MAX_ERRORES_LOG]})")
+                self._backend.crear_backup()
+                descartar = set(irreparables)
+                datos['links'] = [enlace for indice, enlace in enumerate(datos['links'])
+                                  if indice not in descartar]
+            self._backend.aplicar([Mutacion(REEMPLAZAR, datos=datos)])
+            reparado = True
+        
+        # Representación compacta en memoria; el formato en disco no cambia
+        datos['links'] = compactar_enlaces(datos['links'])
+        self._datos = datos
+        # Reparaciones y migraciones se guardan juntas, una sola vez
+        if self._migrar_formato() or reparado:
+            self.guardar()
+        self._backend.confirmar_carga(datos)
         
         return datos
     
@@ -60,13 +344,38 @@ class RepositorioEnlaces:
             True si la carga fue exitosa, False en caso contrario
         """
         try:
-            self._datos = self._cargar_o_crear_datos()
+            with self.agrupar_cambios():
+                self._datos = self._cargar_o_crear_datos()
             logger.info("Datos recargados desde archivo")
             return True
         except Exception as e:
             logger.error(f"Error al recargar datos: {e}")
             return False
     
+    def descartar_cambios(self) -> bool:
+        """
+        Descarta los cambios sin guardar y vuelve a los datos persistidos.
+        
+        Los backends que escriben cada mutación en una transacción abierta
+        (SQLite) la deshacen antes de recargar; si no, la recarga leería esas
+        mutaciones y el siguiente guardado las confirmaría.
+        
+        Returns:
+            True si la recarga fue exitosa, False en caso contrario
+        """
+        self._backend.descartar()
+        return self.cargar()
+    
+    def cerrar(self) -> None:
+        """
+        Cierra el backend al salir de la aplicación.
+        
+        Antes le pasa los datos en memoria para que actualice sus cachés (la
+        instantánea binaria del JSON) una sola vez en lugar de en cada guardado.
+        """
+        self._backend.confirmar_cierre(self._datos)
+        self._backend.cerrar()
+    
     def _crear_datos_por_defecto(self) -> Dict[str, Any]:
         """
         Crea los datos por defecto con enlaces de ejemplo.
@@ -77,7 +386,7 @@ class RepositorioEnlaces:
         timestamp_actual = obtener_timestamp_actual()
         
         return {
-            "version": 1,
+            "version": VERSION_ACTUAL,
             "categorias": ["Personal", "Trabajo"],
             "links": [
                 {
@@ -103,6 +412,110 @@ class RepositorioEnlaces:
             ]
         }
     
+    def rutas_observadas(self) -> List[Path]:
+        """
+        Archivos cuya modificación por otro proceso hay que incorporar.
+        
+        Returns:
+            Rutas indicadas por el backend
+        """
+        return self._backend.rutas_observadas()
+    
+    def sincronizar_cambios_externos(self, forzar: bool = False) -> Optional[Dict[str, int]]:
+        """
+        Incorpora los cambios que otro proceso haya guardado en los datos.
+        
+        Lee el documento guardado, lo compara con la memoria por id y
+        actualizado_en y aplica solo la diferencia: los enlaces nuevos se
+        agregan al final, los modificados se actualizan en su sitio y los que
+        ya no existen se eliminan. Se emite un único evento con los ids
+        afectados, como en cualquier otra operación.
+        
+        Args:
+            forzar: Releer aunque el backend no detecte cambios ajenos
+            
+        Returns:
+            Contadores 'agregados', 'actualizados' y 'eliminados', o None si
+            no había cambios o no se pudieron leer los datos
+        """
+        if not forzar and not self._backend.cambiado_externamente():
+            return None
+        
+        datos = self._backend.cargar()
+        if datos is None or not (self._backend.carga_validada or validar_documento(
+                datos, hash_contenido=self._backend.hash_contenido).valido):
+            logger.warning("No se pudieron leer los cambios externos; se mantienen los datos en memoria")
+            return None
+        # Un cliente anterior puede haber guardado una versión antigua: se
+        # migra como al cargar para no comparar con enlaces sin migrar
+        if necesita_migracion(datos):
+            migrar_documento(datos)
+        
+        guardados = {enlace.get('id'): enlace for enlace in datos['links']}
+        enlaces = self._datos.setdefault('links', [])
+        actuales = {enlace.get('id'): enlace for enlace in enlaces}
+        indice = self._indice_categorias
+        nuevos = []
+        actualizados = 0
+        
+        with self.agrupar_cambios():
+            eliminados = actuales.keys() - guardados.keys()
+            if eliminados:
+                objetos = set()
+                for enlace_id in eliminados:
+                    enlace = actuales[enlace_id]
+                    objetos.add(id(enlace))
+                    if indice is not None:
+                        indice.quitar(enlace_id)
+                    self._cambios.eliminar(enlace_id, enlace.get('es_favorito', False))
+                self._datos['links'] = enlaces = [enlace for enlace in enlaces if id(enlace) not in objetos]
+            
+            for enlace_id, guardado in guardados.items():
+                actual = actuales.get(enlace_id)
+                if actual is None:
+                    guardado.setdefault('es_favorito', False)
+                    nuevos.append(guardado)
+                    continue
+                if actual.get('actualizado_en') == guardado.get('actualizado_en'):
+                    continue
+                
+                favorito_anterior = actual.get('es_favorito', False)
+                categoria_anterior = actual.get('categoria')
+                self._antes_de_modificar(actual)
+                for clave in [clave for clave in actual if clave not in guardado]:
+                    del actual[clave]
+                actual.update(guardado)
+                if indice is not None:
+                    indice.actualizar(actual)
+                self._cambios.actualizar(enlace_id, favorito_anterior != actual.get('es_favorito', False))
+                if actual.get('categoria') != categoria_anterior:
+                    self._cambios.categorias_cambiadas = True
+                actualizados += 1
+            
+            if nuevos:
+                nuevos = compactar_enlaces(nuevos)
+                enlaces.extend(nuevos)
+                for enlace in nuevos:
+                    if indice is not None:
+                        indice.agregar(enlace)
+                    self._cambios.agregar(enlace['id'])
+                    if enlace.get('es_favorito', False):
+                        self._cambios.favoritos.add(enlace['id'])
+            
+            for clave, valor in datos.items():
+                # La versión en memoria es la del formato ya migrado; nunca se
+                # toma la del documento externo
+                if clave in ('links', 'version'):
+                    continue
+                if self._datos.get(clave) != valor:
+                    self._datos[clave] = valor
+                    if clave == 'categorias':
+                        self._cambios.categorias_cambiadas = True
+        
+        resumen = {'agregados': len(nuevos), 'actualizados': actualizados, 'eliminados': len(eliminados)}
+        logger.info(f"Cambios externos incorporados: {resumen}")
+        return resumen
+    
     def guardar(self) -> bool:
         """
         Guarda los datos actuales en el archivo.
@@ -110,7 +523,11 @@ class RepositorioEnlaces:
         Returns:
             True si se guardó correctamente, False en caso contrario
         """
-        return guardar_json(self._datos, self.ruta_archivo)
+        if self._transaccion is not None:
+            # Se guarda al confirmar la transacción, nunca un estado intermedio
+            self._transaccion.guardado_pendiente = True
+            return True
+        return self._backend.persistir(self._datos)
     
     def crear_backup(self) -> bool:
         """
@@ -119,7 +536,36 @@ class RepositorioEnlaces:
         Returns:
             True si se creó el backup correctamente, False en caso contrario
         """
-        return crear_backup(self.ruta_archivo)
+        return self._backend.crear_backup()
+    
+    def listar_copias(self) -> List[CopiaSeguridad]:
+        """
+        Lista las copias de seguridad disponibles.
+        
+        Returns:
+            Copias ordenadas de más reciente a más antigua
+        """
+        return self._backend.copias.listar()
+    
+    def restaurar_copia(self, copia: CopiaSeguridad) -> bool:
+        """
+        Sustituye los datos por una copia de seguridad y los recarga.
+        
+        Antes se guarda una copia del estado actual, así que la restauración
+        también se puede deshacer desde el almacén de copias.
+        
+        Args:
+            copia: Copia a restaurar
+            
+        Returns:
+            True si se restauró correctamente, False en caso contrario
+        """
+        if not self.guardar() or not self.crear_backup():
+            logger.error("No se pudo guardar el estado actual; restauración cancelada")
+            return False
+        if not self._backend.restaurar_copia(copia):
+            return False
+        return self.cargar()
     
     def obtener_enlaces(self) -> List[Dict[str, Any]]:
         """
@@ -139,6 +585,89 @@ class RepositorioEnlaces:
         """
         return self._datos.get('categorias', [])
     
+    def buscar_enlaces(self, termino_busqueda: str = "", categoria_filtro: str = "",
+                       tag_filtro: str = "",
+                       filtro: Optional[FiltroEnlaces] = None) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        Busca enlaces aplicando filtros y scoring fuzzy.
+        
+        Los backends con índice de texto completo preseleccionan los candidatos;
+        si el índice no encuentra nada se puntúan todos, para tolerar errores de tipeo.
+        
+        Args:
+            termino_busqueda: Término de búsqueda libre
+            categoria_filtro: Categoría por la que filtrar
+            tag_filtro: Tag por el que filtrar
+            filtro: Criterios de filtrar_filas (favoritos, fechas...) que deben
+                cumplir los resultados, los mismos que sin término de búsqueda
+            
+        Returns:
+            Lista de tuplas (enlace, score) ordenadas por relevancia
+        """
+        enlaces = self.obtener_enlaces()
+        if filtro is not None:
+            enlaces = [enlaces[fila] for fila in self.filtrar_filas(filtro)]
+        
+        # Si el backend tiene índice de texto, puntuar solo sus candidatos
+        candidatos = self._backend.buscar_candidatos(termino_busqueda) if termino_busqueda else None
+        if candidatos:
+            enlaces = [enlace for enlace in enlaces if enlace.get('id') in candidatos]
+        
+        return buscar_enlaces(enlaces, termino_busqueda, categoria_filtro, tag_filtro)
+    
+    def filtrar_filas(self, filtro: FiltroEnlaces) -> Sequence[int]:
+        """
+        Filtra los enlaces por categoría, tag, favorito y rangos de fechas.
+        
+        Con NumPy el filtro se evalúa con máscaras sobre el almacén columnar;
+        sin NumPy se recorren los enlaces.
+        
+        Args:
+            filtro: Criterios de filtrado
+            
+        Returns:
+            Índices (en obtener_enlaces()) de los enlaces que cumplen el filtro
+        """
+        enlaces = self.obtener_enlaces()
+        if filtro == FiltroEnlaces() or filtro == FiltroEnlaces(categoria="Todas"):
+            # Sin criterios no hace falta construir las columnas
+            return range(len(enlaces))
+        if self._columnas is not None:
+            return self._columnas.filtrar(enlaces, filtro)
+        return filtrar_filas_python(enlaces, filtro)
+    
+    def ordenar_filas(self, filas: Sequence[int], campo: str, descendente: bool = False) -> Sequence[int]:
+        """
+        Ordena el resultado de filtrar_filas por un campo.
+        
+        El orden de todos los enlaces por cada campo y sentido se calcula una
+        vez y se reutiliza para cualquier filtro hasta que cambian los enlaces.
+        
+        Args:
+            filas: Índices (en obtener_enlaces()) a ordenar
+            campo: 'titulo', 'host', 'categoria', 'tags', 'actualizado' o 'favorito'
+            descendente: Orden descendente
+            
+        Returns:
+            Los mismos índices ordenados
+        """
+        return self._orden.ordenar_filas(self.obtener_enlaces(), filas, campo, descendente)
+    
+    def ordenar_resultados(self, resultados: List[Tuple[Dict[str, Any], float]], campo: str,
+                           descendente: bool = False) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        Ordena los resultados de buscar_enlaces por un campo en lugar de por relevancia.
+        
+        Args:
+            resultados: Pares (enlace, score)
+            campo: 'titulo', 'host', 'categoria', 'tags', 'actualizado' o 'favorito'
+            descendente: Orden descendente
+            
+        Returns:
+            Los mismos pares ordenados
+        """
+        return self._orden.ordenar_pares(self.obtener_enlaces(), resultados, campo, descendente)
+    
     def obtener_enlace_por_id(self, enlace_id: str) -> Optional[Dict[str, Any]]:
         """
         Obtiene un enlace por su ID.
@@ -215,7 +744,7 @@ class RepositorioEnlaces:
         enlace_id = str(uuid.uuid4())
         
         # Crear enlace
-        nuevo_enlace = {
+        nuevo_enlace = compactar({
             "id": enlace_id,
             "titulo": titulo.strip(),
             "url": url_limpia,
@@ -224,19 +753,63 @@ class RepositorioEnlaces:
             "es_favorito": es_favorito,  # ⭐ Nuevo campo favorito
             "creado_en": timestamp_actual,
             "actualizado_en": timestamp_actual
-        }
+        })
         
         # Agregar a los datos
         self._datos.setdefault('links', []).append(nuevo_enlace)
+        if self._indice_categorias is not None:
+            self._indice_categorias.agregar(nuevo_enlace)
+        self._aplicar([Mutacion(AGREGAR, enlace_id, nuevo_enlace)])
+        self._cambios.agregar(enlace_id)
+        if es_favorito:
+            self._cambios.favoritos.add(enlace_id)
         
         # Agregar categoría si no existe
-        if categoria not in self._datos.setdefault('categorias', []):
-            self._datos['categorias'].append(categoria)
-            self._datos['categorias'].sort()
+        self._asegurar_categoria(categoria)
+        self._emitir_cambios()
         
         logger.info(f"Enlace agregado: {titulo} -> {url_limpia}")
         return enlace_id
     
+    def agregar_enlaces_lote(self, enlaces: List[Dict[str, Any]]) -> int:
+        """
+        Agrega un lote de enlaces ya validados y normalizados.
+        
+        No comprueba duplicados: el llamador (importación) filtra el lote con
+        un índice propio para no recorrer el repositorio en cada enlace.
+        
+        Args:
+            enlaces: Enlaces con el formato completo de links.json
+            
+        Returns:
+            Número de enlaces agregados
+        """
+        if not enlaces:
+            return 0
+        
+        enlaces = compactar_enlaces(enlaces)
+        self._datos.setdefault('links', []).extend(enlaces)
+        if self._indice_categorias is not None:
+            for enlace in enlaces:
+                self._indice_categorias.agregar(enlace)
+        self._aplicar([Mutacion(AGREGAR, enlace['id'], enlace) for enlace in enlaces])
+        for enlace in enlaces:
+            self._cambios.agregar(enlace['id'])
+            if enlace.get('es_favorito', False):
+                self._cambios.favoritos.add(enlace['id'])
+        
+        categorias = self._datos.setdefault('categorias', [])
+        nuevas = {enlace['categoria'] for enlace in enlaces} - set(categorias)
+        if nuevas:
+            categorias.extend(nuevas)
+            categorias.sort()
+            self._aplicar([Mutacion(CATEGORIAS, datos=categorias)])
+            self._cambios.categorias_cambiadas = True
+        self._emitir_cambios()
+        
+        logger.info(f"Lote de {len(enlaces)} enlaces agregado")
+        return len(enlaces)
+    
     def actualizar_enlace(self, enlace_id: str, titulo: str, url: str, 
                          categoria: str, tags: List[str], es_favorito: bool = None) -> bool:
         """
@@ -289,12 +862,20 @@ class RepositorioEnlaces:
                 if es_favorito is not None:
                     datos_actualizacion["es_favorito"] = es_favorito
                 
+                favorito_anterior = enlace.get('es_favorito', False)
+                categoria_anterior = enlace.get('categoria')
+                self._antes_de_modificar(enlace)
                 enlace.update(datos_actualizacion)
+                if self._indice_categorias is not None:
+                    self._indice_categorias.actualizar(enlace)
+                self._aplicar([Mutacion(ACTUALIZAR, enlace_id, enlace)])
+                self._cambios.actualizar(enlace_id, favorito_anterior != enlace.get('es_favorito', False))
+                if enlace['categoria'] != categoria_anterior:
+                    self._cambios.categorias_cambiadas = True
                 
                 # Agregar categoría si no existe
-                if categoria not in self._datos.setdefault('categorias', []):
-                    self._datos['categorias'].append(categoria)
-                    self._datos['categorias'].sort()
+                self._asegurar_categoria(categoria)
+                self._emitir_cambios()
                 
                 logger.info(f"Enlace actualizado: {enlace_id}")
                 return True
@@ -312,20 +893,146 @@ class RepositorioEnlaces:
         Returns:
             True si se eliminó correctamente, False en caso contrario
         """
-        enlaces_originales = len(self._datos.get('links', []))
+        enlaces_originales = self._datos.get('links', [])
         self._datos['links'] = [
-            enlace for enlace in self._datos.get('links', [])
+            enlace for enlace in enlaces_originales
             if enlace.get('id') != enlace_id
         ]
         
-        eliminado = len(self._datos['links']) < enlaces_originales
+        eliminado = len(self._datos['links']) < len(enlaces_originales)
         if eliminado:
+            era_favorito = any(enlace.get('id') == enlace_id and enlace.get('es_favorito', False)
+                               for enlace in enlaces_originales)
+            if self._indice_categorias is not None:
+                self._indice_categorias.quitar(enlace_id)
+            self._aplicar([Mutacion(ELIMINAR, enlace_id)])
+            self._cambios.eliminar(enlace_id, era_favorito)
+            self._emitir_cambios()
             logger.info(f"Enlace eliminado: {enlace_id}")
         else:
             logger.error(f"Enlace no encontrado para eliminar: {enlace_id}")
         
         return eliminado
     
+    def editar_enlaces_lote(self, enlace_ids: Iterable[str], categoria: Optional[str] = None,
+                            agregar_tags: Sequence[str] = (), quitar_tags: Sequence[str] = (),
+                            es_favorito: Optional[bool] = None) -> int:
+        """
+        Aplica el mismo cambio a varios enlaces en una sola operación.
+        
+        Los enlaces se recorren una vez y se emite un único evento; los que
+        ya tienen los valores pedidos no se modifican.
+        
+        Args:
+            enlace_ids: IDs de los enlaces a modificar
+            categoria: Nueva categoría (None para no cambiarla)
+            agregar_tags: Tags que se añaden a cada enlace
+            quitar_tags: Tags que se quitan de cada enlace
+            es_favorito: Nuevo estado de favorito (None para no cambiarlo)
+            
+        Returns:
+            Número de enlaces modificados
+        """
+        if categoria is not None:
+            if not validar_categoria(categoria):
+                logger.error("Categoría inválida")
+                return 0
+            categoria = categoria.strip()
+        
+        pendientes = set(enlace_ids)
+        agregar = limpiar_tags(list(agregar_tags))
+        quitar = set(limpiar_tags(list(quitar_tags)))
+        timestamp_actual = obtener_timestamp_actual()
+        indice = self._indice_categorias
+        mutaciones = []
+        for enlace in self._datos.get('links', []):
+            if not pendientes:
+                break
+            enlace_id = enlace.get('id')
+            if enlace_id not in pendientes:
+                continue
+            pendientes.discard(enlace_id)
+            
+            cambios = {}
+            if categoria is not None and enlace.get('categoria') != categoria:
+                cambios['categoria'] = categoria
+            if agregar or quitar:
+                tags = enlace.get('tags', [])
+                nuevos = [tag for tag in tags if tag.lower() not in quitar]
+                presentes = {tag.lower() for tag in nuevos}
+                nuevos.extend(tag for tag in agregar if tag not in presentes)
+                if nuevos != tags:
+                    cambios['tags'] = nuevos
+            if es_favorito is not None and enlace.get('es_favorito', False) != es_favorito:
+                cambios['es_favorito'] = es_favorito
+            if not cambios:
+                continue
+            
+            cambios['actualizado_en'] = timestamp_actual
+            self._antes_de_modificar(enlace)
+            enlace.update(cambios)
+            if indice is not None and 'categoria' in cambios:
+                indice.actualizar(enlace)
+            mutaciones.append(Mutacion(ACTUALIZAR, enlace_id, enlace))
+            self._cambios.actualizar(enlace_id, 'es_favorito' in cambios)
+            if 'categoria' in cambios:
+                self._cambios.categorias_cambiadas = True
+        
+        if mutaciones:
+            self._aplicar(mutaciones)
+            if categoria is not None:
+                self._asegurar_categoria(categoria)
+            self._emitir_cambios()
+        
+        logger.info(f"Edición en lote: {len(mutaciones)} enlaces modificados")
+        return len(mutaciones)
+    
+    def eliminar_enlaces(self, enlace_ids: Iterable[str]) -> int:
+        """
+        Elimina varios enlaces reconstruyendo la lista una sola vez.
+        
+        Args:
+            enlace_ids: IDs de los enlaces a eliminar
+            
+        Returns:
+            Número de enlaces eliminados
+        """
+        pendientes = set(enlace_ids)
+        conservados = []
+        mutaciones = []
+        for enlace in self._datos.get('links', []):
+            enlace_id = enlace.get('id')
+            if enlace_id not in pendientes:
+                conservados.append(enlace)
+                continue
+            if self._indice_categorias is not None:
+                self._indice_categorias.quitar(enlace_id)
+            mutaciones.append(Mutacion(ELIMINAR, enlace_id))
+            self._cambios.eliminar(enlace_id, enlace.get('es_favorito', False))
+        
+        if mutaciones:
+            self._datos['links'] = conservados
+            self._aplicar(mutaciones)
+            self._emitir_cambios()
+        
+        logger.info(f"Eliminación en lote: {len(mutaciones)} enlaces eliminados")
+        return len(mutaciones)
+    
+    def _obtener_indice_categorias(self) -> IndiceCategorias:
+        """Devuelve el índice de categorías, construyéndolo la primera vez."""
+        if self._indice_categorias is None:
+            self._indice_categorias = IndiceCategorias(self._datos.get('links', []))
+        return self._indice_categorias
+    
+    def _asegurar_categoria(self, categoria: str) -> None:
+        """Agrega una categoría a la lista si todavía no existe."""
+        categorias = self._datos.setdefault('categorias', [])
+        if categoria not in categorias:
+            categorias.append(categoria)
+            categorias.sort()
+            self._aplicar([Mutacion(CATEGORIAS, datos=categorias)])
+            self._cambios.categorias_cambiadas = True
+    
     def agregar_categoria(self, categoria: str) -> bool:
         """
         Agrega una nueva categoría.
@@ -345,11 +1052,37 @@ class RepositorioEnlaces:
         if categoria not in categorias:
             categorias.append(categoria)
             categorias.sort()
+            self._aplicar([Mutacion(CATEGORIAS, datos=categorias)])
+            self._cambios.categorias_cambiadas = True
+            self._emitir_cambios()
             logger.info(f"Categoría agregada: {categoria}")
             return True
         
         return False
     
+    def _mover_miembros(self, categoria_origen: str, categoria_destino: str) -> List[Mutacion]:
+        """
+        Cambia la categoría de todos los enlaces de otra usando el índice.
+        
+        Args:
+            categoria_origen: Categoría actual de los enlaces
+            categoria_destino: Nueva categoría
+            
+        Returns:
+            Mutaciones de actualización para el backend
+        """
+        indice = self._obtener_indice_categorias()
+        timestamp_actual = obtener_timestamp_actual()
+        mutaciones = []
+        for enlace in indice.miembros(categoria_origen):
+            self._antes_de_modificar(enlace)
+            enlace['categoria'] = categoria_destino
+            enlace['actualizado_en'] = timestamp_actual
+            mutaciones.append(Mutacion(ACTUALIZAR, enlace['id'], enlace))
+            self._cambios.actualizar(enlace['id'])
+        indice.renombrar(categoria_origen, categoria_destino)
+        return mutaciones
+    
     def renombrar_categoria(self, categoria_antigua: str, categoria_nueva: str) -> bool:
         """
         Renombra una categoría existente.
@@ -375,11 +1108,12 @@ class RepositorioEnlaces:
         categorias[categorias.index(categoria_antigua)] = categoria_nueva
         categorias.sort()
         
-        # Actualizar enlaces que usan esta categoría
-        for enlace in self._datos.get('links', []):
-            if enlace.get('categoria') == categoria_antigua:
-                enlace['categoria'] = categoria_nueva
-                enlace['actualizado_en'] = obtener_timestamp_actual()
+        # Actualizar solo los enlaces que usan esta categoría
+        mutaciones = self._mover_miembros(categoria_antigua, categoria_nueva)
+        mutaciones.append(Mutacion(CATEGORIAS, datos=categorias))
+        self._aplicar(mutaciones)
+        self._cambios.categorias_renombradas.append((categoria_antigua, categoria_nueva))
+        self._emitir_cambios()
         
         logger.info(f"Categoría renombrada: {categoria_antigua} -> {categoria_nueva}")
         return True
@@ -403,28 +1137,33 @@ class RepositorioEnlaces:
         # Remover de lista de categorías
         categorias.remove(categoria)
         
-        # Procesar enlaces de esta categoría
-        enlaces_a_eliminar = []
-        for i, enlace in enumerate(self._datos.get('links', [])):
-            if enlace.get('categoria') == categoria:
-                if mover_a and validar_categoria(mover_a):
-                    # Mover a nueva categoría
-                    enlace['categoria'] = mover_a
-                    enlace['actualizado_en'] = obtener_timestamp_actual()
-                    
-                    # Agregar categoría destino si no existe
-                    if mover_a not in categorias:
-                        categorias.append(mover_a)
-                        categorias.sort()
-                else:
-                    # Marcar para eliminar
-                    enlaces_a_eliminar.append(i)
-        
-        # Eliminar enlaces marcados (en orden inverso para mantener índices)
-        for i in reversed(enlaces_a_eliminar):
-            del self._datos['links'][i]
-        
-        logger.info(f"Categoría eliminada: {categoria}, enlaces afectados: {len(enlaces_a_eliminar)}")
+        indice = self._obtener_indice_categorias()
+        afectados = indice.contar(categoria)
+        if mover_a and validar_categoria(mover_a):
+            # Mover los enlaces a la categoría destino
+            mutaciones = self._mover_miembros(categoria, mover_a)
+            if afectados and mover_a not in categorias:
+                categorias.append(mover_a)
+                categorias.sort()
+        else:
+            # Eliminar los enlaces reconstruyendo la lista una sola vez
+            mutaciones = []
+            eliminados = set()
+            for enlace in indice.miembros(categoria):
+                indice.quitar(enlace['id'])
+                eliminados.add(id(enlace))
+                mutaciones.append(Mutacion(ELIMINAR, enlace['id']))
+                self._cambios.eliminar(enlace['id'], enlace.get('es_favorito', False))
+            if eliminados:
+                self._datos['links'] = [enlace for enlace in self._datos.get('links', [])
+                                        if id(enlace) not in eliminados]
+        
+        mutaciones.append(Mutacion(CATEGORIAS, datos=categorias))
+        self._aplicar(mutaciones)
+        self._cambios.categorias_cambiadas = True
+        self._emitir_cambios()
+        
+        logger.info(f"Categoría eliminada: {categoria}, enlaces afectados: {afectados}")
         return True
     
     def importar_datos(self, datos_importados: Dict[str, Any]) -> bool:
@@ -437,19 +1176,136 @@ class RepositorioEnlaces:
         Returns:
             True si se importó correctamente, False en caso contrario
         """
-        if not validar_estructura_json(datos_importados):
+        resultado = validar_documento(datos_importados, reparar=True)
+        registrar_diagnostico(resultado, "datos importados")
+        if not resultado.valido:
             logger.error("Estructura de datos inválida para importar")
             return False
         
+        migrar_documento(datos_importados)
+        
         # Crear backup antes de importar
         self.crear_backup()
         
         # Reemplazar datos actuales
+        datos_importados['links'] = compactar_enlaces(datos_importados['links'])
         self._datos = datos_importados
+        self._indice_categorias = None
+        self._aplicar([Mutacion(REEMPLAZAR, datos=datos_importados)])
+        self._cambios.recarga = True
+        self._emitir_cambios()
         
         logger.info("Datos importados correctamente")
         return True
     
+    def crear_indice_fusion(self, timestamp_sin_fecha: Optional[str] = None) -> IndiceFusion:
+        """
+        Crea un índice de los enlaces actuales para fusionar importaciones.
+        
+        Args:
+            timestamp_sin_fecha: Timestamp usado al normalizar registros sin fecha
+            
+        Returns:
+            Índice por id y URL canónica
+        """
+        return IndiceFusion(self._datos.get('links', []), timestamp_sin_fecha)
+    
+    def fusionar_enlaces(self, enlaces: List[Dict[str, Any]], 
+                         indice: Optional[IndiceFusion] = None) -> Dict[str, int]:
+        """
+        Fusiona enlaces normalizados con los existentes sin guardar.
+        
+        Los enlaces nuevos se agregan; los que ya existen (mismo id o URL
+        canónica) se actualizan por última escritura según actualizado_en y
+        unen sus tags. Para fusionar varios lotes se reutiliza el mismo índice.
+        
+        Args:
+            enlaces: Enlaces con el formato completo de links.json
+            indice: Índice creado con crear_indice_fusion (se crea si no se indica)
+            
+        Returns:
+            Diccionario con 'agregados', 'actualizados' y 'omitidos'
+        """
+        if indice is None:
+            indice = self.crear_indice_fusion()
+        
+        nuevos = []
+        mutaciones = []
+        categorias = set()
+        actualizados = omitidos = 0
+        
+        for entrante in enlaces:
+            existente = indice.buscar(entrante)
+            if existente is None:
+                nuevo = compactar(entrante)
+                indice.registrar(nuevo)
+                nuevos.append(nuevo)
+                continue
+            
+            cambios = calcular_fusion(existente, entrante, indice)
+            if not cambios:
+                omitidos += 1
+                continue
+            
+            url_anterior = existente.get('url', '')
+            self._antes_de_modificar(existente)
+            existente.update(cambios)
+            if 'url' in cambios:
+                indice.cambiar_url(existente, url_anterior)
+            if 'categoria' in cambios:
+                categorias.add(cambios['categoria'])
+                if self._indice_categorias is not None:
+                    self._indice_categorias.actualizar(existente)
+            mutaciones.append(Mutacion(ACTUALIZAR, existente.get('id'), existente))
+            self._cambios.actualizar(existente.get('id'), 'es_favorito' in cambios)
+            actualizados += 1
+        
+        with self.agrupar_cambios():
+            if mutaciones:
+                self._aplicar(mutaciones)
+            if categorias:
+                self._cambios.categorias_cambiadas = True
+            for categoria in categorias:
+                self._asegurar_categoria(categoria)
+            agregados = self.agregar_enlaces_lote(nuevos)
+        
+        return {'agregados': agregados, 'actualizados': actualizados, 'omitidos': omitidos}
+    
+    def fusionar_datos(self, datos_importados: Dict[str, Any]) -> Optional[Dict[str, int]]:
+        """
+        Fusiona un documento externo con los datos actuales en lugar de reemplazarlos.
+        
+        Args:
+            datos_importados: Documento con el formato de links.json
+            
+        Returns:
+            Contadores de la fusión ('agregados', 'actualizados', 'omitidos',
+            'invalidos') o None si la estructura no es válida
+        """
+        resultado = validar_documento(datos_importados)
+        registrar_diagnostico(resultado, "datos a fusionar")
+        if not resultado.valido:
+            logger.error("Estructura de datos inválida para fusionar")
+            return None
+        
+        # Crear backup antes de importar
+        self.crear_backup()
+        
+        timestamp_actual = obtener_timestamp_actual()
+        enlaces = [normalizar_registro(enlace, timestamp_actual) for enlace in datos_importados['links']]
+        validos = [enlace for enlace in enlaces if enlace is not None]
+        
+        with self.agrupar_cambios():
+            resultado = self.fusionar_enlaces(validos, self.crear_indice_fusion(timestamp_actual))
+            resultado['invalidos'] = len(enlaces) - len(validos)
+            
+            for categoria in datos_importados['categorias']:
+                if isinstance(categoria, str) and validar_categoria(categoria):
+                    self._asegurar_categoria(categoria.strip())
+        
+        logger.info(f"Datos fusionados: {resultado}")
+        return resultado
+    
     def exportar_datos(self) -> Dict[str, Any]:
         """
         Exporta los datos actuales.
@@ -459,36 +1315,51 @@ class RepositorioEnlaces:
         """
         return self._datos.copy()
     
+    def _estadisticas_al_dia(self) -> EstadisticasEnlaces:
+        """Devuelve los contadores agregados, reconstruyéndolos si hace falta."""
+        self._estadisticas.sincronizar(self.obtener_enlaces())
+        return self._estadisticas
+    
     def obtener_estadisticas(self) -> Dict[str, Any]:
         """
         Obtiene estadísticas de los datos.
         
+        Los valores salen de contadores que se mantienen con cada cambio,
+        sin recorrer los enlaces.
+        
         Returns:
             Diccionario con estadísticas
         """
-        enlaces = self._datos.get('links', [])
-        categorias = self._datos.get('categorias', [])
-        
-        # Contar enlaces por categoría
-        contador_categorias = {}
-        for enlace in enlaces:
-            categoria = enlace.get('categoria', 'Sin categoría')
-            contador_categorias[categoria] = contador_categorias.get(categoria, 0) + 1
-        
-        # Contar tags únicos
-        tags_unicos = set()
-        for enlace in enlaces:
-            for tag in enlace.get('tags', []):
-                tags_unicos.add(tag.lower())
-        
+        estadisticas = self._estadisticas_al_dia()
         return {
-            'total_enlaces': len(enlaces),
-            'total_categorias': len(categorias),
-            'total_tags_unicos': len(tags_unicos),
-            'enlaces_por_categoria': contador_categorias,
-            'total_favoritos': self.contar_favoritos()  # ⭐ Nueva estadística
+            'total_enlaces': estadisticas.total,
+            'total_categorias': len(self._datos.get('categorias', [])),
+            'total_tags_unicos': estadisticas.total_tags_unicos,
+            'enlaces_por_categoria': estadisticas.por_categoria(),
+            'total_favoritos': estadisticas.favoritos  # ⭐ Nueva estadística
         }
     
+    def obtener_tags_frecuentes(self, cantidad: int = 10) -> List[Tuple[str, int]]:
+        """
+        Obtiene los tags más usados.
+        
+        Args:
+            cantidad: Número máximo de tags
+            
+        Returns:
+            Pares (tag en minúsculas, número de enlaces) de mayor a menor
+        """
+        return self._estadisticas_al_dia().tags_frecuentes(cantidad)
+    
+    def obtener_enlaces_por_mes(self) -> List[Tuple[str, int]]:
+        """
+        Obtiene el número de enlaces creados cada mes.
+        
+        Returns:
+            Pares ('AAAA-MM', número de enlaces) en orden cronológico
+        """
+        return self._estadisticas_al_dia().por_mes()
+    
     # ⭐ NUEVAS FUNCIONES PARA FAVORITOS
     
     def marcar_favorito(self, enlace_id: str) -> bool:
@@ -503,8 +1374,12 @@ class RepositorioEnlaces:
         """
         for enlace in self._datos.get('links', []):
             if enlace.get('id') == enlace_id:
+                self._antes_de_modificar(enlace)
                 enlace['es_favorito'] = True
                 enlace['actualizado_en'] = obtener_timestamp_actual()
+                self._aplicar([Mutacion(ACTUALIZAR, enlace_id, enlace)])
+                self._cambios.actualizar(enlace_id, favorito=True)
+                self._emitir_cambios()
                 logger.info(f"Enlace marcado como favorito: {enlace.get('titulo')}")
                 return True
         
@@ -523,8 +1398,12 @@ class RepositorioEnlaces:
         """
         for enlace in self._datos.get('links', []):
             if enlace.get('id') == enlace_id:
+                self._antes_de_modificar(enlace)
                 enlace['es_favorito'] = False
                 enlace['actualizado_en'] = obtener_timestamp_actual()
+                self._aplicar([Mutacion(ACTUALIZAR, enlace_id, enlace)])
+                self._cambios.actualizar(enlace_id, favorito=True)
+                self._emitir_cambios()
                 logger.info(f"Enlace desmarcado como favorito: {enlace.get('titulo')}")
                 return True
         
@@ -547,8 +1426,12 @@ class RepositorioEnlaces:
                 es_favorito_actual = enlace.get('es_favorito', False)
                 nuevo_estado = not es_favorito_actual
                 
+                self._antes_de_modificar(enlace)
                 enlace['es_favorito'] = nuevo_estado
                 enlace['actualizado_en'] = obtener_timestamp_actual()
+                self._aplicar([Mutacion(ACTUALIZAR, enlace_id, enlace)])
+                self._cambios.actualizar(enlace_id, favorito=True)
+                self._emitir_cambios()
                 
                 accion = "marcado" if nuevo_estado else "desmarcado"
                 logger.info(f"Enlace {accion} como favorito: {enlace.get('titulo')}")
@@ -564,14 +1447,12 @@ class RepositorioEnlaces:
         Returns:
             Lista de enlaces favoritos
         """
-        favoritos = []
-        for enlace in self._datos.get('links', []):
-            if enlace.get('es_favorito', False):
-                favoritos.append(enlace.copy())
+        favoritos = [enlace for enlace in self._datos.get('links', []) if enlace.get('es_favorito', False)]
         
-        # Ordenar por fecha de actualización (más recientes primero)
-        favoritos.sort(key=lambda x: x.get('actualizado_en', ''), reverse=True)
-        return favoritos
+        # Ordenar por fecha de actualización (más recientes primero) con claves
+        # enteras, antes de copiar los enlaces
+        favoritos.sort(key=lambda enlace: clave_fecha(enlace, 'actualizado_en'), reverse=True)
+        return [enlace.copy() for enlace in favoritos]
     
     def contar_favoritos(self) -> int:
         """
@@ -580,11 +1461,7 @@ class RepositorioEnlaces:
         Returns:
             Número de enlaces favoritos
         """
-        count = 0
-        for enlace in self._datos.get('links', []):
-            if enlace.get('es_favorito', False):
-                count += 1
-        return count
+        return self._estadisticas_al_dia().favoritos
     
     def es_favorito(self, enlace_id: str) -> bool:
         """
@@ -601,18 +1478,30 @@ class RepositorioEnlaces:
                 return enlace.get('es_favorito', False)
         return False
     
-    def migrar_favoritos(self) -> None:
+    def _migrar_formato(self) -> bool:
         """
-        Migra enlaces existentes para agregar el campo es_favorito si no existe.
-        Esta función se ejecuta automáticamente en la carga.
+        Aplica las migraciones de formato pendientes según la versión de los
+        datos. Quien llama debe guardar si hubo cambios.
+        
+        Returns:
+            True si los datos se migraron
         """
-        migrados = 0
-        for enlace in self._datos.get('links', []):
-            if 'es_favorito' not in enlace:
-                enlace['es_favorito'] = False
-                migrados += 1
+        if not necesita_migracion(self._datos):
+            return False
         
-        if migrados > 0:
-            logger.info(f"Migrados {migrados} enlaces para soporte de favoritos")
-            # Guardar automáticamente después de la migración
-            self.guardar()
\ No newline at end of file
+        modificados = migrar_documento(self._datos)
+        self._backend.aplicar([Mutacion(ACTUALIZAR, enlace.get('id'), enlace) for enlace in modificados])
+        return True
+
+def crear_repositorio(ruta_archivo: Path) -> RepositorioEnlaces:
+    """
+    Crea un repositorio con el backend que indique la configuración de almacenamiento.
+    
+    Args:
+        ruta_archivo: Ruta al archivo de datos (JSON o SQLite)
+        
+    Returns:
+        Repositorio listo para usar
+    """
+    backend = crear_backend(ruta_archivo)
+    return RepositorioEnlaces(backend.ruta, backend)
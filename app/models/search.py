@@ -3,6 +3,7 @@ Motor de búsqueda con soporte para búsqueda fuzzy y normalización de texto.
 """
 import re
 from typing import List, Dict, Any, Tuple
+from .enlace import clave_fecha
 from ..utils.validators import normalizar
 
 
@@ -214,7 +215,7 @@ def buscar_enlaces(links: List[Dict[str, Any]],
             resultados.append((link, score))
     
     # Ordenar por score descendente, luego por fecha de actualización
-    resultados.sort(key=lambda x: (x[1], x[0].get('actualizado_en', '')), reverse=True)
+    resultados.sort(key=lambda x: (x[1], clave_fecha(x[0], 'actualizado_en')), reverse=True)
     
     return resultados
 
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Backends de almacenamiento intercambiables para TECH LINK VIEWER
+"""
+
+from pathlib import Path
+
+from .base import (
+    BackendAlmacenamiento, Mutacion,
+    AGREGAR, ACTUALIZAR, ELIMINAR, CATEGORIAS, REEMPLAZAR
+)
+from .copias import AlmacenCopias, CopiaSeguridad
+from .json_backend import BackendJSON
+from .trabajador_copias import TrabajadorCopia
+from .vigilante import VigilanteArchivos
+from ..config import obtener_config_almacenamiento
+
+
+def crear_backend(ruta_archivo: Path) -> BackendAlmacenamiento:
+    """
+    Crea el backend adecuado según la configuración de almacenamiento.
+
+    Con backend 'auto' se usa SQLite si la extensión del archivo es de base de
+    datos; con 'sqlite' se usa siempre, migrando el JSON existente la primera vez.
+
+    Args:
+        ruta_archivo: Ruta al archivo de datos (JSON o SQLite)
+
+    Returns:
+        Backend listo para usar
+    """
+    config = obtener_config_almacenamiento()
+    backend = config.get('backend', 'auto')
+    es_sqlite = ruta_archivo.suffix.lower() in config.get('extensiones_sqlite', ())
+
+    if backend == 'json' or (backend == 'auto' and not es_sqlite):
+        return BackendJSON(ruta_archivo)
+
+    from .sqlite_backend import BackendSQLite, migrar_json_a_sqlite
+
+    ruta_db = ruta_archivo if es_sqlite else ruta_archivo.with_suffix('.db')
+    if not ruta_db.exists() and config.get('migrar_json_a_sqlite', True):
+        ruta_json = ruta_db.with_suffix('.json')
+        if ruta_json.exists():
+            migrar_json_a_sqlite(ruta_json, ruta_db)
+
+    return BackendSQLite(ruta_db)
+
+
+__all__ = [
+    'BackendAlmacenamiento', 'Mutacion',
+    'AGREGAR', 'ACTUALIZAR', 'ELIMINAR', 'CATEGORIAS', 'REEMPLAZAR',
+    'AlmacenCopias', 'CopiaSeguridad', 'BackendJSON', 'TrabajadorCopia',
+    'VigilanteArchivos', 'crear_backend'
+]
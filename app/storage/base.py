@@ -0,0 +1,175 @@
+"""
+Interfaz común de los backends de almacenamiento.
+
+Un backend sabe cargar una instantánea completa de los datos, aplicar
+mutaciones individuales, hacerlas persistentes, crear copias de seguridad
+e indicar qué archivos hay que vigilar para detectar cambios externos.
+"""
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Set
+from .copias import CopiaSeguridad, crear_almacen_copias
+
+
+# Tipos de mutación
+AGREGAR = 'agregar'
+ACTUALIZAR = 'actualizar'
+ELIMINAR = 'eliminar'
+CATEGORIAS = 'categorias'
+REEMPLAZAR = 'reemplazar'
+
+
+class Mutacion(NamedTuple):
+    """
+    Cambio individual sobre los datos.
+
+    - AGREGAR / ACTUALIZAR: enlace_id y el enlace completo en datos
+    - ELIMINAR: solo enlace_id
+    - CATEGORIAS: lista completa de categorías en datos
+    - REEMPLAZAR: documento completo en datos
+    """
+    tipo: str
+    enlace_id: Optional[str] = None
+    datos: Any = None
+
+
+class BackendAlmacenamiento(ABC):
+    """
+    Clase base para los backends de almacenamiento.
+
+    Las subclases deben implementar cargar y persistir; confirmar_carga,
+    aplicar, descartar, crear_backup, restaurar_copia, cambiado_externamente,
+    buscar_candidatos, confirmar_cierre y cerrar tienen implementaciones por
+    defecto.
+    """
+
+    def __init__(self, ruta: Path):
+        """
+        Inicializa el backend.
+
+        Args:
+            ruta: Ruta al archivo de datos
+        """
+        self.ruta = ruta
+        self.copias = crear_almacen_copias(ruta)
+        # True si la última carga devolvió datos ya validados y migrados
+        self.carga_validada = False
+        # Hash del contenido leído en la última carga (si el backend lo calcula)
+        self.hash_contenido: Optional[bytes] = None
+
+    @abstractmethod
+    def cargar(self) -> Optional[Dict[str, Any]]:
+        """
+        Carga una instantánea completa de los datos.
+
+        Returns:
+            Documento con los datos o None si no existe o no se pudo leer
+        """
+
+    def confirmar_carga(self, datos: Dict[str, Any]) -> None:
+        """
+        Notifica que los datos cargados han superado la validación y las
+        migraciones, para que el backend pueda cachearlos.
+
+        Args:
+            datos: Documento validado
+        """
+
+    def aplicar(self, mutaciones: List[Mutacion]) -> None:
+        """
+        Aplica mutaciones individuales. Los backends basados en documento
+        pueden ignorarlas y escribir el documento completo al persistir.
+
+        Args:
+            mutaciones: Lista de mutaciones en orden
+        """
+
+    def descartar(self) -> None:
+        """
+        Deshace las mutaciones aplicadas que todavía no se persistieron.
+
+        Los backends basados en documento no escriben nada hasta persistir y
+        no tienen nada que deshacer. Después hay que volver a cargar los datos.
+        """
+
+    @abstractmethod
+    def persistir(self, datos: Dict[str, Any]) -> bool:
+        """
+        Hace persistentes los cambios aplicados.
+
+        Args:
+            datos: Documento completo en memoria
+
+        Returns:
+            True si se guardó correctamente, False en caso contrario
+        """
+
+    def crear_backup(self) -> bool:
+        """
+        Guarda una generación de los datos persistidos en el almacén de copias.
+
+        No usa el estado en memoria, así que puede llamarse desde un hilo de
+        trabajo.
+
+        Returns:
+            True si se creó el backup correctamente, False en caso contrario
+        """
+        return self.copias.crear_copia(self.ruta) is not None
+
+    def restaurar_copia(self, copia: CopiaSeguridad) -> bool:
+        """
+        Reemplaza los datos persistidos por una copia. Hay que volver a
+        cargar los datos después.
+
+        Args:
+            copia: Copia a restaurar
+
+        Returns:
+            True si se restauró correctamente, False en caso contrario
+        """
+        return self.copias.restaurar(copia, self.ruta)
+
+    def cambiado_externamente(self) -> bool:
+        """
+        Indica si otro proceso modificó los datos persistidos.
+
+        Se compara con la última carga o escritura propia, de modo que las
+        notificaciones de archivo provocadas por persistir() se ignoran.
+
+        Returns:
+            True si hay cambios ajenos (por defecto siempre, por prudencia)
+        """
+        return True
+
+    def rutas_observadas(self) -> List[Path]:
+        """
+        Archivos cuya modificación externa implica recargar los datos.
+
+        Returns:
+            Lista de rutas a vigilar
+        """
+        return [self.ruta]
+
+    def buscar_candidatos(self, termino: str) -> Optional[Set[str]]:
+        """
+        Preselecciona ids de enlaces que pueden coincidir con un término.
+
+        Args:
+            termino: Término de búsqueda libre
+
+        Returns:
+            Conjunto de ids candidatos, o None si el backend no tiene índice
+        """
+        return None
+
+    def confirmar_cierre(self, datos: Dict[str, Any]) -> None:
+        """
+        Notifica que la aplicación se cierra con estos datos en memoria,
+        para que el backend pueda actualizar sus cachés una sola vez.
+
+        Args:
+            datos: Documento completo en memoria
+        """
+
+    def cerrar(self) -> None:
+        """Libera los recursos del backend."""
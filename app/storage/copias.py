@@ -0,0 +1,300 @@
+"""
+Copias de seguridad por generaciones.
+
+Cada copia es un archivo comprimido (gzip o lzma) en la carpeta de copias
+cuyo nombre lleva la fecha y el hash del contenido original:
+
+    links.json.20261019T143000123456.9f86d081884c7d65.gz
+
+Así listar las copias solo lee nombres de archivo, y si el contenido no ha
+cambiado desde la última copia no se crea otra. Tras cada copia nueva se
+aplica la política de retención: se conservan las últimas copias y, además,
+la más reciente de cada una de las últimas N horas, días y semanas.
+"""
+import gzip
+import hashlib
+import logging
+import lzma
+import os
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, Set
+import portalocker
+
+from ..config import obtener_config_almacenamiento
+
+
+logger = logging.getLogger(__name__)
+
+# Tamaño de los bloques de lectura y escritura
+TAMANO_BLOQUE = 1024 * 1024
+FORMATO_FECHA = '%Y%m%dT%H%M%S%f'
+
+# Extensión y función de apertura de cada formato de compresión
+COMPRESORES: Dict[str, tuple] = {
+    # El nivel 9 por defecto de gzip es mucho más lento y apenas reduce más
+    'gzip': ('.gz', lambda ruta, modo: gzip.open(ruta, modo, compresslevel=6)),
+    'lzma': ('.xz', lambda ruta, modo: lzma.open(ruta, modo)),
+}
+
+RETENCION_POR_DEFECTO = {'ultimas': 10, 'horarias': 24, 'diarias': 7, 'semanales': 4}
+
+# Periodo al que pertenece una fecha para cada nivel de retención
+_PERIODOS: Dict[str, Callable[[datetime], tuple]] = {
+    'horarias': lambda fecha: (fecha.year, fecha.month, fecha.day, fecha.hour),
+    'diarias': lambda fecha: (fecha.year, fecha.month, fecha.day),
+    'semanales': lambda fecha: tuple(fecha.isocalendar())[:2],
+}
+
+
+class CopiaSeguridad(NamedTuple):
+    """Una generación del almacén de copias."""
+    ruta: Path
+    fecha: datetime
+    hash: str
+    tamano: int  # Bytes del archivo comprimido
+
+
+def _nuevo_hash():
+    return hashlib.blake2b(digest_size=8)
+
+
+def seleccionar_conservadas(copias: List[CopiaSeguridad], retencion: Dict[str, int]) -> Set[Path]:
+    """
+    Aplica la política de retención a una lista de copias.
+
+    Args:
+        copias: Copias ordenadas de más reciente a más antigua
+        retencion: Número de copias recientes, horas, días y semanas a
+            conservar (claves 'ultimas', 'horarias', 'diarias' y 'semanales')
+
+    Returns:
+        Rutas de las copias que deben conservarse
+    """
+    # La última copia se conserva siempre
+    conservadas = {copia.ruta for copia in copias[:max(1, retencion.get('ultimas', 0))]}
+    for nivel, periodo in _PERIODOS.items():
+        limite = retencion.get(nivel, 0)
+        vistos = set()
+        for copia in copias:
+            if len(vistos) >= limite:
+                break
+            clave = periodo(copia.fecha)
+            if clave not in vistos:
+                # La primera de cada periodo es la más reciente
+                vistos.add(clave)
+                conservadas.add(copia.ruta)
+    return conservadas
+
+
+class AlmacenCopias:
+    """
+    Carpeta de copias de seguridad de un archivo de datos.
+
+    Los métodos no dependen de la interfaz y pueden llamarse desde un hilo de
+    trabajo: las copias se escriben primero en un temporal y se renombran al
+    terminar, así que nunca se lista una copia a medias.
+    """
+
+    def __init__(self, directorio: Path, nombre: str, compresion: str = 'gzip',
+                 retencion: Optional[Dict[str, int]] = None):
+        """
+        Inicializa el almacén.
+
+        Args:
+            directorio: Carpeta de las copias
+            nombre: Nombre del archivo de datos (prefijo de las copias)
+            compresion: 'gzip' o 'lzma'
+            retencion: Copias recientes, horas, días y semanas a conservar
+        """
+        if compresion not in COMPRESORES:
+            logger.warning(f"Compresión desconocida '{compresion}', se usa gzip")
+            compresion = 'gzip'
+        self.directorio = directorio
+        self.nombre = nombre
+        self.compresion = compresion
+        self.retencion = dict(RETENCION_POR_DEFECTO if retencion is None else retencion)
+
+    def _leer_nombre(self, ruta: Path) -> Optional[CopiaSeguridad]:
+        """Interpreta el nombre de un archivo de copia (None si no lo es)."""
+        prefijo = f'{self.nombre}.'
+        if not ruta.name.startswith(prefijo):
+            return None
+        partes = ruta.name[len(prefijo):].split('.')
+        if len(partes) != 3 or f'.{partes[2]}' not in {ext for ext, _ in COMPRESORES.values()}:
+            return None
+        try:
+            fecha = datetime.strptime(partes[0], FORMATO_FECHA)
+            return CopiaSeguridad(ruta, fecha, partes[1], ruta.stat().st_size)
+        except (ValueError, OSError):
+            return None
+
+    def listar(self) -> List[CopiaSeguridad]:
+        """
+        Lista las copias existentes sin abrirlas.
+
+        Returns:
+            Copias ordenadas de más reciente a más antigua
+        """
+        if not self.directorio.is_dir():
+            return []
+        copias = [copia for copia in map(self._leer_nombre, self.directorio.iterdir()) if copia]
+        copias.sort(key=lambda copia: copia.fecha, reverse=True)
+        return copias
+
+    def _hash_archivo(self, origen: Path) -> str:
+        """Hash del contenido de un archivo leído por bloques."""
+        hash_contenido = _nuevo_hash()
+        with open(origen, 'rb') as entrada:
+            portalocker.lock(entrada, portalocker.LOCK_SH)
+            try:
+                while bloque := entrada.read(TAMANO_BLOQUE):
+                    hash_contenido.update(bloque)
+            finally:
+                portalocker.unlock(entrada)
+        return hash_contenido.hexdigest()
+
+    def crear_copia(self, origen: Path, fecha: Optional[datetime] = None) -> Optional[CopiaSeguridad]:
+        """
+        Guarda una generación nueva de un archivo si su contenido cambió.
+
+        Args:
+            origen: Archivo a copiar
+            fecha: Fecha de la copia (por defecto, ahora)
+
+        Returns:
+            La copia creada, la última existente si el contenido es idéntico,
+            o None si no se pudo copiar
+        """
+        if not origen.exists():
+            return None
+
+        temporal = None
+        try:
+            existentes = self.listar()
+            # Calcular el hash cuesta mucho menos que comprimir: si el contenido
+            # coincide con la última copia no se llega a comprimir nada
+            if existentes and self._hash_archivo(origen) == existentes[0].hash:
+                logger.debug(f"Sin cambios desde la última copia: {existentes[0].ruta.name}")
+                return existentes[0]
+
+            self.directorio.mkdir(parents=True, exist_ok=True)
+            extension, abrir = COMPRESORES[self.compresion]
+            descriptor, temporal = tempfile.mkstemp(dir=self.directorio, prefix=f'.{self.nombre}.', suffix='.tmp')
+            os.close(descriptor)
+
+            # El hash se recalcula mientras se comprime: el archivo pudo cambiar
+            hash_contenido = _nuevo_hash()
+            with open(origen, 'rb') as entrada:
+                portalocker.lock(entrada, portalocker.LOCK_SH)
+                try:
+                    with abrir(temporal, 'wb') as salida:
+                        while bloque := entrada.read(TAMANO_BLOQUE):
+                            hash_contenido.update(bloque)
+                            salida.write(bloque)
+                finally:
+                    portalocker.unlock(entrada)
+
+            fecha = fecha or datetime.now()
+            ruta = self.directorio / f'{self.nombre}.{fecha.strftime(FORMATO_FECHA)}.{hash_contenido.hexdigest()}{extension}'
+            os.replace(temporal, ruta)
+            temporal = None
+            copia = CopiaSeguridad(ruta, fecha, hash_contenido.hexdigest(), ruta.stat().st_size)
+            logger.info(f"Copia de seguridad creada: {ruta}")
+
+            self.aplicar_retencion()
+            return copia
+
+        except Exception as e:
+            logger.error(f"Error al crear copia de seguridad de {origen}: {e}")
+            return None
+        finally:
+            if temporal is not None and os.path.exists(temporal):
+                os.remove(temporal)
+
+    def aplicar_retencion(self) -> int:
+        """
+        Elimina las copias que no cubre la política de retención.
+
+        Returns:
+            Número de copias eliminadas
+        """
+        copias = self.listar()
+        conservadas = seleccionar_conservadas(copias, self.retencion)
+        eliminadas = 0
+        for copia in copias:
+            if copia.ruta not in conservadas:
+                try:
+                    copia.ruta.unlink()
+                    eliminadas += 1
+                except OSError as e:
+                    logger.warning(f"No se pudo eliminar la copia {copia.ruta}: {e}")
+        if eliminadas:
+            logger.info(f"Copias antiguas eliminadas: {eliminadas}")
+        return eliminadas
+
+    def restaurar(self, copia: CopiaSeguridad, destino: Path) -> bool:
+        """
+        Descomprime una copia sobre el archivo de datos.
+
+        El contenido se verifica con el hash del nombre antes de reemplazar
+        el destino, que no se toca si la copia está dañada.
+
+        Args:
+            copia: Copia a restaurar
+            destino: Archivo de datos a reemplazar
+
+        Returns:
+            True si se restauró correctamente, False en caso contrario
+        """
+        extension = copia.ruta.suffix
+        abrir = next((abrir for ext, abrir in COMPRESORES.values() if ext == extension), None)
+        if abrir is None:
+            logger.error(f"Formato de copia desconocido: {copia.ruta}")
+            return False
+
+        temporal = None
+        try:
+            destino.parent.mkdir(parents=True, exist_ok=True)
+            descriptor, temporal = tempfile.mkstemp(dir=destino.parent, prefix=f'.{destino.name}.', suffix='.tmp')
+            hash_contenido = _nuevo_hash()
+            with abrir(copia.ruta, 'rb') as entrada, os.fdopen(descriptor, 'wb') as salida:
+                while bloque := entrada.read(TAMANO_BLOQUE):
+                    hash_contenido.update(bloque)
+                    salida.write(bloque)
+
+            if hash_contenido.hexdigest() != copia.hash:
+                logger.error(f"La copia {copia.ruta} está dañada (el hash no coincide)")
+                return False
+
+            os.replace(temporal, destino)
+            temporal = None
+            logger.info(f"Copia restaurada: {copia.ruta} -> {destino}")
+            return True
+
+        except Exception as e:
+            logger.error(f"Error al restaurar la copia {copia.ruta}: {e}")
+            return False
+        finally:
+            if temporal is not None and os.path.exists(temporal):
+                os.remove(temporal)
+
+
+def crear_almacen_copias(ruta_datos: Path) -> AlmacenCopias:
+    """
+    Crea el almacén de copias de un archivo de datos según la configuración.
+
+    Args:
+        ruta_datos: Ruta al archivo de datos
+
+    Returns:
+        Almacén con las copias en la carpeta configurada junto a los datos
+    """
+    config = obtener_config_almacenamiento()
+    return AlmacenCopias(
+        ruta_datos.parent / config.get('directorio_copias', 'copias'),
+        ruta_datos.name,
+        config.get('compresion_copias', 'gzip'),
+        config.get('retencion_copias'),
+    )
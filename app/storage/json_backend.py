@@ -0,0 +1,181 @@
+"""
+Backend de almacenamiento sobre un documento JSON.
+"""
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+from .base import BackendAlmacenamiento
+from .snapshot import (
+    ruta_snapshot, calcular_hash, leer_snapshot, escribir_snapshot, eliminar_snapshot
+)
+from ..config import obtener_config_almacenamiento
+from ..utils.esquema import marcar_validado
+from ..utils.io import leer_bytes, serializar_json, guardar_bytes
+
+
+logger = logging.getLogger(__name__)
+
+
+def _firma_archivo(ruta: Path) -> Optional[Tuple[int, int]]:
+    """Fecha de modificación y tamaño del archivo (None si no existe)."""
+    try:
+        estado = ruta.stat()
+    except OSError:
+        return None
+    return estado.st_mtime_ns, estado.st_size
+
+
+class BackendJSON(BackendAlmacenamiento):
+    """
+    Guarda el documento completo en un archivo JSON con bloqueo de archivo.
+
+    Las mutaciones individuales no se escriben por separado: cada persistencia
+    reescribe el documento entero. Opcionalmente mantiene junto al JSON una
+    instantánea binaria que evita reparsear y revalidar el documento al
+    arrancar mientras el JSON no cambie. La instantánea se escribe tras cargar
+    y validar el JSON y al cerrar, nunca en cada persistencia.
+    """
+
+    def __init__(self, ruta: Path, usar_snapshot: Optional[bool] = None):
+        """
+        Inicializa el backend.
+
+        Args:
+            ruta: Ruta al archivo JSON
+            usar_snapshot: Mantener la instantánea binaria (por defecto según configuración)
+        """
+        super().__init__(ruta)
+        if usar_snapshot is None:
+            usar_snapshot = obtener_config_almacenamiento().get('snapshot_binario', True)
+        self.usar_snapshot = usar_snapshot
+        self.ruta_snapshot = ruta_snapshot(ruta)
+        self._hash_cargado: Optional[bytes] = None
+        # Hash de la última escritura propia si la instantánea no la refleja
+        self._hash_sin_snapshot: Optional[bytes] = None
+        # Firma del archivo tal como lo dejó la última carga o escritura propia
+        self._firma: Optional[Tuple[int, int]] = None
+
+    def cargar(self) -> Optional[Dict[str, Any]]:
+        """
+        Carga el documento, desde la instantánea si sigue vigente.
+
+        Returns:
+            Documento con los datos o None si no existe o no se pudo leer
+        """
+        self.carga_validada = False
+        self.hash_contenido = None
+        self._hash_cargado = None
+        self._hash_sin_snapshot = None
+
+        # La firma se toma antes de leer: si el archivo cambia durante la
+        # lectura, la siguiente comprobación lo detecta
+        self._firma = _firma_archivo(self.ruta)
+        contenido = leer_bytes(self.ruta)
+        if contenido is None:
+            return None
+
+        # El hash identifica el contenido para la instantánea y para los
+        # veredictos de validación
+        hash_json = self.hash_contenido = calcular_hash(contenido)
+        if self.usar_snapshot:
+            datos = leer_snapshot(self.ruta_snapshot, hash_json)
+            if datos is not None:
+                logger.info(f"Datos cargados desde instantánea: {self.ruta_snapshot}")
+                self.carga_validada = True
+                return datos
+            self._hash_cargado = hash_json
+
+        try:
+            datos = json.loads(contenido)
+            logger.info(f"JSON cargado correctamente desde: {self.ruta}")
+            return datos
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            logger.error(f"Error de formato JSON en {self.ruta}: {e}")
+            return None
+
+    def confirmar_carga(self, datos: Dict[str, Any]) -> None:
+        """
+        Escribe la instantánea del JSON recién cargado y validado (o del que
+        se acaba de guardar con las reparaciones y migraciones de la carga).
+
+        Args:
+            datos: Documento validado
+        """
+        hash_json = self._hash_cargado or self._hash_sin_snapshot
+        if hash_json is not None and escribir_snapshot(self.ruta_snapshot, hash_json, datos):
+            self._hash_sin_snapshot = None
+        self._hash_cargado = None
+
+    def persistir(self, datos: Dict[str, Any]) -> bool:
+        """
+        Reescribe el documento JSON completo.
+
+        La instantánea no se reescribe aquí (serializar el documento entero con
+        pickle en cada guardado duplicaría su coste); queda obsoleta hasta
+        confirmar_cierre o la siguiente carga.
+
+        Args:
+            datos: Documento completo en memoria
+
+        Returns:
+            True si se guardó correctamente, False en caso contrario
+        """
+        # La carga anterior queda superada por esta escritura
+        self._hash_cargado = None
+
+        try:
+            contenido = serializar_json(datos)
+        except Exception as e:
+            logger.error(f"Error al serializar JSON para {self.ruta}: {e}")
+            return False
+
+        if not guardar_bytes(contenido, self.ruta):
+            return False
+        self._firma = _firma_archivo(self.ruta)
+        logger.info(f"JSON guardado correctamente en: {self.ruta}")
+
+        # Lo que escribe la aplicación sale de datos ya validados
+        hash_json = calcular_hash(contenido)
+        marcar_validado(hash_json)
+        if self.usar_snapshot:
+            if self._hash_sin_snapshot is None:
+                # La instantánea anterior ya no corresponde al JSON guardado;
+                # se borra para no leerla entera al arrancar
+                eliminar_snapshot(self.ruta_snapshot)
+            self._hash_sin_snapshot = hash_json
+        return True
+
+    def confirmar_cierre(self, datos: Dict[str, Any]) -> None:
+        """
+        Escribe la instantánea del último JSON guardado.
+
+        Solo se escribe si el archivo sigue siendo el de la última escritura
+        propia y los datos en memoria no tienen cambios sin guardar; en otro
+        caso la instantánea no correspondería al JSON.
+
+        Args:
+            datos: Documento completo en memoria
+        """
+        hash_json = self._hash_sin_snapshot
+        if hash_json is None or self.cambiado_externamente():
+            return
+        try:
+            pendientes = calcular_hash(serializar_json(datos)) != hash_json
+        except Exception as e:
+            logger.warning(f"No se pudo comprobar la instantánea de {self.ruta}: {e}")
+            return
+        if pendientes:
+            logger.info("Cambios sin guardar: no se escribe la instantánea")
+            return
+        if escribir_snapshot(self.ruta_snapshot, hash_json, datos):
+            self._hash_sin_snapshot = None
+
+    def cambiado_externamente(self) -> bool:
+        """
+        Compara la fecha de modificación y el tamaño del JSON con los conocidos.
+
+        Returns:
+            True si el archivo cambió desde la última carga o escritura propia
+        """
+        return _firma_archivo(self.ruta) != self._firma
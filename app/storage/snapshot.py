@@ -0,0 +1,160 @@
+"""
+Instantánea binaria del documento JSON para acelerar el arranque.
+
+La instantánea se guarda junto al JSON (``links.json.snap``) y contiene el
+documento ya validado y migrado serializado con pickle. La cabecera incluye
+el hash del contenido JSON del que procede: si el JSON cambia por fuera de
+la aplicación el hash deja de coincidir y la instantánea se ignora. El JSON
+sigue siendo siempre la fuente de verdad.
+
+El hash solo detecta instantáneas obsoletas, no manipuladas: la carpeta de
+datos puede estar compartida y cualquiera con permiso de escritura podría
+dejar un .snap con la cabecera correcta. Por eso la instantánea se lee con un
+Unpickler que solo admite los tipos que contiene un documento válido
+(EnlaceCompacto y los tipos básicos) y rechaza cualquier otra clase o función.
+"""
+import gc
+import hashlib
+import io
+import logging
+import pickle
+from pathlib import Path
+from typing import Any, Dict, Optional
+from ..models import enlace
+from ..utils.io import leer_bytes, guardar_bytes
+
+
+logger = logging.getLogger(__name__)
+
+# Cambiar la versión invalida las instantáneas escritas con un formato anterior
+CABECERA_SNAPSHOT = b'TLVSNAP2'
+LONGITUD_HASH = 32
+EXTENSION_SNAPSHOT = '.snap'
+
+# Únicos objetos globales que puede referenciar una instantánea
+_GLOBALES_PERMITIDOS = {
+    (enlace.__name__, 'EnlaceCompacto'): enlace.EnlaceCompacto,
+    (enlace.__name__, '_restaurar'): enlace._restaurar,
+    (enlace.__name__, '_AUSENTE'): enlace._AUSENTE,
+}
+_TIPOS_BASICOS = frozenset((
+    'dict', 'list', 'tuple', 'set', 'frozenset', 'str', 'bytes', 'bytearray',
+    'int', 'float', 'complex', 'bool',
+))
+
+
+class _UnpicklerRestringido(pickle.Unpickler):
+    """Unpickler que solo resuelve los globales de un documento de enlaces."""
+
+    def find_class(self, modulo: str, nombre: str) -> Any:
+        if modulo == 'builtins' and nombre in _TIPOS_BASICOS:
+            return super().find_class(modulo, nombre)
+        try:
+            return _GLOBALES_PERMITIDOS[(modulo, nombre)]
+        except KeyError:
+            raise pickle.UnpicklingError(f"Global no permitido en la instantánea: {modulo}.{nombre}") from None
+
+
+def ruta_snapshot(ruta_json: Path) -> Path:
+    """
+    Obtiene la ruta de la instantánea asociada a un archivo JSON.
+
+    Args:
+        ruta_json: Ruta al archivo JSON
+
+    Returns:
+        Ruta de la instantánea
+    """
+    return ruta_json.with_name(ruta_json.name + EXTENSION_SNAPSHOT)
+
+
+def calcular_hash(contenido: bytes) -> bytes:
+    """
+    Calcula el hash del contenido de un archivo JSON.
+
+    Args:
+        contenido: Bytes del archivo
+
+    Returns:
+        Digest BLAKE2b de LONGITUD_HASH bytes
+    """
+    return hashlib.blake2b(contenido, digest_size=LONGITUD_HASH).digest()
+
+
+def leer_snapshot(ruta: Path, hash_esperado: bytes) -> Optional[Dict[str, Any]]:
+    """
+    Lee una instantánea si corresponde al contenido JSON actual.
+
+    Args:
+        ruta: Ruta de la instantánea
+        hash_esperado: Hash del contenido JSON actual
+
+    Returns:
+        Documento con los datos o None si no existe, está obsoleta o es ilegible
+    """
+    if not ruta.exists():
+        return None
+
+    contenido = leer_bytes(ruta)
+    if not contenido:
+        return None
+
+    inicio_datos = len(CABECERA_SNAPSHOT) + LONGITUD_HASH
+    if (not contenido.startswith(CABECERA_SNAPSHOT)
+            or contenido[len(CABECERA_SNAPSHOT):inicio_datos] != hash_esperado):
+        logger.info(f"Instantánea obsoleta, se ignora: {ruta}")
+        return None
+
+    # Reconstruir cientos de miles de diccionarios dispara el recolector de
+    # ciclos una y otra vez sin que haya nada que recolectar
+    gc_activo = gc.isenabled()
+    gc.disable()
+    try:
+        # BytesIO comparte el buffer de bytes: no se copia la carga
+        flujo = io.BytesIO(contenido)
+        flujo.seek(inicio_datos)
+        datos = _UnpicklerRestringido(flujo).load()
+    except Exception as e:
+        logger.warning(f"Instantánea ilegible {ruta}: {e}")
+        return None
+    finally:
+        if gc_activo:
+            gc.enable()
+
+    if not isinstance(datos, dict):
+        return None
+    return datos
+
+
+def escribir_snapshot(ruta: Path, hash_json: bytes, datos: Dict[str, Any]) -> bool:
+    """
+    Escribe la instantánea de un documento.
+
+    Args:
+        ruta: Ruta de la instantánea
+        hash_json: Hash del contenido JSON del que procede el documento
+        datos: Documento validado
+
+    Returns:
+        True si se escribió correctamente, False en caso contrario
+    """
+    try:
+        carga = pickle.dumps(datos, protocol=5)
+    except Exception as e:
+        logger.warning(f"No se pudo serializar la instantánea {ruta}: {e}")
+        return False
+
+    return guardar_bytes(CABECERA_SNAPSHOT + hash_json + carga, ruta)
+
+
+def eliminar_snapshot(ruta: Path) -> None:
+    """
+    Elimina una instantánea si existe.
+
+    Args:
+        ruta: Ruta de la instantánea
+    """
+    try:
+        ruta.unlink(missing_ok=True)
+    except OSError as e:
+        logger.warning(f"No se pudo eliminar la instantánea {ruta}: {e}")
@@ -0,0 +1,483 @@
+"""
+Backend de almacenamiento sobre SQLite con índice de texto completo FTS5.
+
+Persiste enlaces, categorías y tags en tablas normalizadas y mantiene una
+tabla FTS5 sobre títulos, tags y URLs para preseleccionar resultados de búsqueda.
+"""
+import json
+import logging
+import os
+import re
+import sqlite3
+import tempfile
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Set
+from .base import (
+    BackendAlmacenamiento, Mutacion,
+    AGREGAR, ACTUALIZAR, ELIMINAR, CATEGORIAS, REEMPLAZAR
+)
+from .copias import CopiaSeguridad
+from ..utils.io import cargar_json, guardar_json, validar_estructura_json
+from ..utils.validators import normalizar
+
+
+logger = logging.getLogger(__name__)
+
+# Campos con columna propia; el resto se guarda como JSON en 'extra'
+CAMPOS_ENLACE = ('id', 'titulo', 'url', 'categoria', 'tags', 'es_favorito', 'creado_en', 'actualizado_en')
+
+ESQUEMA_SQL = """
+CREATE TABLE IF NOT EXISTS meta (
+    clave TEXT PRIMARY KEY,
+    valor TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS categorias (
+    id INTEGER PRIMARY KEY,
+    nombre TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS tags (
+    id INTEGER PRIMARY KEY,
+    nombre TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS links (
+    rowid_interno INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    posicion INTEGER NOT NULL,
+    titulo TEXT NOT NULL,
+    url TEXT NOT NULL,
+    categoria_id INTEGER NOT NULL REFERENCES categorias(id),
+    es_favorito INTEGER NOT NULL DEFAULT 0,
+    creado_en TEXT NOT NULL,
+    actualizado_en TEXT NOT NULL,
+    extra TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_links_posicion ON links(posicion);
+CREATE INDEX IF NOT EXISTS idx_links_categoria ON links(categoria_id);
+CREATE INDEX IF NOT EXISTS idx_links_url ON links(url);
+CREATE INDEX IF NOT EXISTS idx_links_favorito ON links(es_favorito);
+CREATE TABLE IF NOT EXISTS link_tags (
+    link_rowid INTEGER NOT NULL REFERENCES links(rowid_interno) ON DELETE CASCADE,
+    tag_id INTEGER NOT NULL REFERENCES tags(id),
+    posicion INTEGER NOT NULL,
+    PRIMARY KEY (link_rowid, tag_id)
+);
+CREATE INDEX IF NOT EXISTS idx_link_tags_tag ON link_tags(tag_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS links_fts USING fts5(
+    titulo, tags, url,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+
+def abrir_conexion(ruta_db: Path) -> sqlite3.Connection:
+    """
+    Abre una conexión SQLite en modo WAL y crea el esquema si no existe.
+
+    Args:
+        ruta_db: Ruta al archivo de base de datos
+
+    Returns:
+        Conexión lista para usar
+    """
+    ruta_db.parent.mkdir(parents=True, exist_ok=True)
+    conexion = sqlite3.connect(str(ruta_db))
+    # WAL permite lectores concurrentes mientras la aplicación escribe
+    conexion.execute("PRAGMA journal_mode=WAL")
+    conexion.execute("PRAGMA synchronous=NORMAL")
+    conexion.execute("PRAGMA foreign_keys=ON")
+    conexion.executescript(ESQUEMA_SQL)
+    return conexion
+
+
+def _consulta_fts(termino: str) -> str:
+    """
+    Convierte un término libre en una consulta FTS5 por prefijos.
+
+    Args:
+        termino: Término introducido por el usuario
+
+    Returns:
+        Consulta FTS5 o cadena vacía si no hay palabras utilizables
+    """
+    palabras = re.findall(r'\w+', normalizar(termino))
+    return " OR ".join(f'"{palabra}"*' for palabra in palabras)
+
+
+class BackendSQLite(BackendAlmacenamiento):
+    """
+    Backend de enlaces persistido en SQLite.
+
+    Cada mutación se escribe en la transacción abierta de la conexión y
+    persistir() la confirma, así que solo se tocan las filas afectadas.
+    """
+
+    def __init__(self, ruta: Path):
+        """
+        Inicializa el backend y crea el esquema si no existe.
+
+        Args:
+            ruta: Ruta al archivo SQLite
+        """
+        super().__init__(ruta)
+        self._conexion = abrir_conexion(ruta)
+        self._rowids: Dict[str, int] = {}
+        self._siguiente_posicion = 0
+        self._cache_categorias: Dict[str, int] = {}
+        self._cache_tags: Dict[str, int] = {}
+        # PRAGMA data_version solo cambia con commits de otras conexiones
+        self._version_datos: Optional[int] = None
+
+    def cargar(self) -> Optional[Dict[str, Any]]:
+        """
+        Lee todas las tablas y reconstruye el documento en memoria.
+
+        Returns:
+            Documento con los datos o None si la base de datos está vacía
+        """
+        try:
+            cursor = self._conexion.cursor()
+            self._version_datos = self._leer_version_datos()
+            fila_version = cursor.execute("SELECT valor FROM meta WHERE clave = 'version'").fetchone()
+            if fila_version is None:
+                return None
+
+            tags_por_enlace: Dict[int, List[str]] = {}
+            for link_rowid, nombre in cursor.execute(
+                "SELECT lt.link_rowid, t.nombre FROM link_tags lt "
+                "JOIN tags t ON t.id = lt.tag_id ORDER BY lt.link_rowid, lt.posicion"
+            ):
+                tags_por_enlace.setdefault(link_rowid, []).append(nombre)
+
+            self._rowids = {}
+            self._siguiente_posicion = 0
+            enlaces = []
+            for rowid, enlace_id, posicion, titulo, url, categoria, es_favorito, creado, actualizado, extra in cursor.execute(
+                "SELECT l.rowid_interno, l.id, l.posicion, l.titulo, l.url, c.nombre, l.es_favorito, "
+                "l.creado_en, l.actualizado_en, l.extra FROM links l "
+                "JOIN categorias c ON c.id = l.categoria_id ORDER BY l.posicion"
+            ):
+                enlace = {
+                    "id": enlace_id,
+                    "titulo": titulo,
+                    "url": url,
+                    "categoria": categoria,
+                    "tags": tags_por_enlace.get(rowid, []),
+                    "creado_en": creado,
+                    "actualizado_en": actualizado,
+                    "es_favorito": bool(es_favorito)
+                }
+                if extra:
+                    enlace.update(json.loads(extra))
+                enlaces.append(enlace)
+                self._rowids[enlace_id] = rowid
+                self._siguiente_posicion = posicion + 1
+
+            categorias = [nombre for (nombre,) in cursor.execute("SELECT nombre FROM categorias ORDER BY nombre")]
+
+            logger.info(f"Base de datos cargada: {len(enlaces)} enlaces desde {self.ruta}")
+            return {
+                "version": int(fila_version[0]),
+                "categorias": categorias,
+                "links": enlaces
+            }
+
+        except sqlite3.Error as e:
+            logger.error(f"Error al cargar SQLite {self.ruta}: {e}")
+            return None
+
+    def aplicar(self, mutaciones: List[Mutacion]) -> None:
+        """
+        Escribe las mutaciones en la transacción abierta.
+
+        Args:
+            mutaciones: Lista de mutaciones en orden
+        """
+        cursor = self._conexion.cursor()
+        for mutacion in mutaciones:
+            if mutacion.tipo in (AGREGAR, ACTUALIZAR):
+                self._escribir_enlace(cursor, mutacion.datos)
+            elif mutacion.tipo == ELIMINAR:
+                self._borrar_enlace(cursor, mutacion.enlace_id)
+            elif mutacion.tipo == CATEGORIAS:
+                self._sincronizar_categorias(cursor, mutacion.datos)
+            elif mutacion.tipo == REEMPLAZAR:
+                self._reemplazar_todo(cursor, mutacion.datos)
+
+    def descartar(self) -> None:
+        """Deshace la transacción abierta con las mutaciones sin confirmar."""
+        try:
+            self._conexion.rollback()
+        except sqlite3.Error as e:
+            logger.error(f"Error al descartar cambios en SQLite {self.ruta}: {e}")
+
+    def persistir(self, datos: Dict[str, Any]) -> bool:
+        """
+        Confirma la transacción con las mutaciones aplicadas.
+
+        Args:
+            datos: Documento completo en memoria (solo se usa su versión)
+
+        Returns:
+            True si se guardó correctamente, False en caso contrario
+        """
+        try:
+            self._conexion.execute(
+                "INSERT INTO meta (clave, valor) VALUES ('version', ?) "
+                "ON CONFLICT(clave) DO UPDATE SET valor = excluded.valor",
+                (str(datos.get('version', 1)),)
+            )
+            self._conexion.commit()
+            return True
+        except sqlite3.Error as e:
+            logger.error(f"Error al guardar en SQLite {self.ruta}: {e}")
+            self._conexion.rollback()
+            return False
+
+    def crear_backup(self) -> bool:
+        """
+        Guarda en el almacén de copias una instantánea consistente de la base
+        de datos, obtenida con la API de backup de SQLite.
+
+        Usa conexiones propias, así que puede llamarse desde un hilo de trabajo.
+
+        Returns:
+            True si se creó el backup correctamente, False en caso contrario
+        """
+        descriptor, temporal = tempfile.mkstemp(prefix=f'{self.ruta.name}.', suffix='.tmp')
+        os.close(descriptor)
+        try:
+            origen = sqlite3.connect(str(self.ruta))
+            destino = sqlite3.connect(temporal)
+            try:
+                origen.backup(destino)
+            finally:
+                destino.close()
+                origen.close()
+            return self.copias.crear_copia(Path(temporal)) is not None
+        except sqlite3.Error as e:
+            logger.error(f"Error al crear backup: {e}")
+            return False
+        finally:
+            os.remove(temporal)
+
+    def restaurar_copia(self, copia: CopiaSeguridad) -> bool:
+        """
+        Reemplaza la base de datos por una copia y vuelve a abrirla.
+
+        Args:
+            copia: Copia a restaurar
+
+        Returns:
+            True si se restauró correctamente, False en caso contrario
+        """
+        self._conexion.close()
+        try:
+            restaurada = self.copias.restaurar(copia, self.ruta)
+            if restaurada:
+                # El WAL de la base anterior no corresponde a la restaurada
+                for sufijo in ('-wal', '-shm'):
+                    self.ruta.with_name(f'{self.ruta.name}{sufijo}').unlink(missing_ok=True)
+            return restaurada
+        finally:
+            self._conexion = abrir_conexion(self.ruta)
+            self._cache_categorias.clear()
+            self._cache_tags.clear()
+
+    def _leer_version_datos(self) -> Optional[int]:
+        try:
+            return self._conexion.execute("PRAGMA data_version").fetchone()[0]
+        except sqlite3.Error:
+            return None
+
+    def cambiado_externamente(self) -> bool:
+        """
+        Detecta commits de otras conexiones con PRAGMA data_version.
+
+        Returns:
+            True si otra conexión modificó la base de datos desde la última carga
+        """
+        return self._leer_version_datos() != self._version_datos
+
+    def rutas_observadas(self) -> List[Path]:
+        """
+        La base de datos y su archivo WAL.
+
+        Returns:
+            Lista de rutas a vigilar
+        """
+        return [self.ruta, self.ruta.with_name(f'{self.ruta.name}-wal')]
+
+    def buscar_candidatos(self, termino: str) -> Optional[Set[str]]:
+        """
+        Preselecciona enlaces con una consulta FTS5 por prefijos.
+
+        Args:
+            termino: Término de búsqueda libre
+
+        Returns:
+            Conjunto de ids candidatos, o None si el término no es utilizable
+        """
+        consulta = _consulta_fts(termino)
+        if not consulta:
+            return None
+
+        try:
+            return {
+                enlace_id for (enlace_id,) in self._conexion.execute(
+                    "SELECT l.id FROM links_fts f JOIN links l ON l.rowid_interno = f.rowid "
+                    "WHERE links_fts MATCH ?",
+                    (consulta,)
+                )
+            }
+        except sqlite3.Error as e:
+            logger.warning(f"Consulta FTS inválida '{consulta}': {e}")
+            return None
+
+    def cerrar(self) -> None:
+        """Cierra la conexión con la base de datos."""
+        self._conexion.close()
+
+    def _id_categoria(self, cursor: sqlite3.Cursor, nombre: str) -> int:
+        """Obtiene (o crea) el id de una categoría."""
+        if nombre not in self._cache_categorias:
+            cursor.execute("INSERT OR IGNORE INTO categorias (nombre) VALUES (?)", (nombre,))
+            fila = cursor.execute("SELECT id FROM categorias WHERE nombre = ?", (nombre,)).fetchone()
+            self._cache_categorias[nombre] = fila[0]
+        return self._cache_categorias[nombre]
+
+    def _id_tag(self, cursor: sqlite3.Cursor, nombre: str) -> int:
+        """Obtiene (o crea) el id de un tag."""
+        if nombre not in self._cache_tags:
+            cursor.execute("INSERT OR IGNORE INTO tags (nombre) VALUES (?)", (nombre,))
+            self._cache_tags[nombre] = cursor.execute("SELECT id FROM tags WHERE nombre = ?", (nombre,)).fetchone()[0]
+        return self._cache_tags[nombre]
+
+    def _escribir_enlace(self, cursor: sqlite3.Cursor, enlace: Dict[str, Any]) -> None:
+        """Inserta o actualiza un enlace con sus tags y su entrada FTS."""
+        enlace_id = enlace['id']
+        tags = list(enlace.get('tags', []))
+        extra = {clave: valor for clave, valor in enlace.items() if clave not in CAMPOS_ENLACE}
+        valores = (
+            enlace.get('titulo', ''),
+            enlace.get('url', ''),
+            self._id_categoria(cursor, enlace.get('categoria', '')),
+            int(bool(enlace.get('es_favorito', False))),
+            enlace.get('creado_en', ''),
+            enlace.get('actualizado_en', ''),
+            json.dumps(extra, ensure_ascii=False) if extra else None
+        )
+        rowid = self._rowids.get(enlace_id)
+
+        if rowid is None:
+            cursor.execute(
+                "INSERT INTO links (titulo, url, categoria_id, es_favorito, creado_en, "
+                "actualizado_en, extra, id, posicion) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                valores + (enlace_id, self._siguiente_posicion)
+            )
+            rowid = cursor.lastrowid
+            self._rowids[enlace_id] = rowid
+            self._siguiente_posicion += 1
+        else:
+            cursor.execute(
+                "UPDATE links SET titulo = ?, url = ?, categoria_id = ?, es_favorito = ?, "
+                "creado_en = ?, actualizado_en = ?, extra = ? WHERE rowid_interno = ?",
+                valores + (rowid,)
+            )
+            cursor.execute("DELETE FROM link_tags WHERE link_rowid = ?", (rowid,))
+            cursor.execute("DELETE FROM links_fts WHERE rowid = ?", (rowid,))
+
+        cursor.executemany(
+            "INSERT OR IGNORE INTO link_tags (link_rowid, tag_id, posicion) VALUES (?, ?, ?)",
+            [(rowid, self._id_tag(cursor, tag), posicion) for posicion, tag in enumerate(tags)]
+        )
+        cursor.execute(
+            "INSERT INTO links_fts (rowid, titulo, tags, url) VALUES (?, ?, ?, ?)",
+            (rowid, valores[0], " ".join(tags), valores[1])
+        )
+
+    def _borrar_enlace(self, cursor: sqlite3.Cursor, enlace_id: str) -> None:
+        """Elimina un enlace, sus tags y su entrada FTS."""
+        rowid = self._rowids.pop(enlace_id, None)
+        if rowid is None:
+            return
+        cursor.execute("DELETE FROM link_tags WHERE link_rowid = ?", (rowid,))
+        cursor.execute("DELETE FROM links_fts WHERE rowid = ?", (rowid,))
+        cursor.execute("DELETE FROM links WHERE rowid_interno = ?", (rowid,))
+
+    def _sincronizar_categorias(self, cursor: sqlite3.Cursor, categorias: List[str]) -> None:
+        """Deja en la tabla de categorías exactamente las declaradas o en uso."""
+        for categoria in categorias:
+            self._id_categoria(cursor, categoria)
+
+        marcadores = ", ".join("?" for _ in categorias) or "''"
+        cursor.execute(
+            f"DELETE FROM categorias WHERE nombre NOT IN ({marcadores}) "
+            "AND id NOT IN (SELECT DISTINCT categoria_id FROM links)",
+            tuple(categorias)
+        )
+        self._cache_categorias = {}
+
+    def _reemplazar_todo(self, cursor: sqlite3.Cursor, datos: Dict[str, Any]) -> None:
+        """Sustituye todo el contenido por el documento indicado."""
+        for tabla in ("link_tags", "links_fts", "links", "categorias", "tags"):
+            cursor.execute(f"DELETE FROM {tabla}")
+        self._rowids = {}
+        self._siguiente_posicion = 0
+        self._cache_categorias = {}
+        self._cache_tags = {}
+
+        for enlace in datos.get('links', []):
+            self._escribir_enlace(cursor, enlace)
+        self._sincronizar_categorias(cursor, datos.get('categorias', []))
+
+
+def migrar_json_a_sqlite(ruta_json: Path, ruta_db: Path) -> bool:
+    """
+    Migra un archivo links.json a una base de datos SQLite.
+
+    Args:
+        ruta_json: Ruta al archivo JSON de origen
+        ruta_db: Ruta a la base de datos de destino
+
+    Returns:
+        True si la migración fue exitosa, False en caso contrario
+    """
+    datos = cargar_json(ruta_json)
+    if datos is None or not validar_estructura_json(datos):
+        logger.error(f"No se puede migrar {ruta_json}: estructura inválida")
+        return False
+
+    try:
+        backend = BackendSQLite(ruta_db)
+    except sqlite3.Error as e:
+        logger.error(f"Error al migrar {ruta_json} a SQLite: {e}")
+        return False
+
+    try:
+        backend.aplicar([Mutacion(REEMPLAZAR, datos=datos)])
+        exito = backend.persistir(datos)
+    finally:
+        backend.cerrar()
+
+    if exito:
+        logger.info(f"Migrados {len(datos['links'])} enlaces de {ruta_json} a {ruta_db}")
+    return exito
+
+
+def exportar_sqlite_a_json(ruta_db: Path, ruta_json: Path) -> bool:
+    """
+    Exporta una base de datos SQLite al formato links.json.
+
+    Args:
+        ruta_db: Ruta a la base de datos de origen
+        ruta_json: Ruta al archivo JSON de destino
+
+    Returns:
+        True si la exportación fue exitosa, False en caso contrario
+    """
+    backend = BackendSQLite(ruta_db)
+    try:
+        datos = backend.cargar()
+        return datos is not None and guardar_json(datos, ruta_json)
+    finally:
+        backend.cerrar()
@@ -0,0 +1,39 @@
+"""
+Hilo de trabajo para crear copias de seguridad sin bloquear la interfaz.
+"""
+import logging
+from typing import Callable
+from PyQt6.QtCore import QThread, pyqtSignal
+
+
+logger = logging.getLogger(__name__)
+
+
+class TrabajadorCopia(QThread):
+    """
+    Ejecuta una función de copia de seguridad en segundo plano.
+
+    La función solo debe leer los datos persistidos (como crear_backup de
+    los backends), nunca el estado en memoria del repositorio.
+    """
+
+    terminado = pyqtSignal(bool)
+
+    def __init__(self, crear_copia: Callable[[], bool], parent=None):
+        """
+        Inicializa el trabajador.
+
+        Args:
+            crear_copia: Función que crea la copia y devuelve si tuvo éxito
+            parent: Objeto padre
+        """
+        super().__init__(parent)
+        self.crear_copia = crear_copia
+
+    def run(self) -> None:
+        try:
+            correcto = bool(self.crear_copia())
+        except Exception as e:
+            logger.error(f"Error en la copia de seguridad en segundo plano: {e}")
+            correcto = False
+        self.terminado.emit(correcto)
@@ -0,0 +1,73 @@
+"""
+Vigilancia de los archivos de datos para detectar cambios de otros procesos.
+"""
+import logging
+from pathlib import Path
+from typing import Iterable, List
+from PyQt6.QtCore import QFileSystemWatcher, QObject, QTimer, pyqtSignal
+
+
+logger = logging.getLogger(__name__)
+
+
+class VigilanteArchivos(QObject):
+    """
+    Emite cambio_detectado cuando se modifican los archivos vigilados.
+
+    Las notificaciones se agrupan: una escritura suele producir varias
+    seguidas (y los guardados atómicos reemplazan el archivo), así que la
+    señal se emite una sola vez cuando pasan retardo_ms sin cambios nuevos.
+    También se vigila la carpeta para volver a registrar un archivo que se
+    haya reemplazado o recreado.
+    """
+
+    cambio_detectado = pyqtSignal()
+
+    def __init__(self, rutas: Iterable[Path], retardo_ms: int = 500, parent=None):
+        """
+        Inicializa el vigilante.
+
+        Args:
+            rutas: Archivos a vigilar
+            retardo_ms: Tiempo sin notificaciones antes de emitir la señal
+            parent: Objeto padre
+        """
+        super().__init__(parent)
+        self.rutas: List[Path] = [Path(ruta) for ruta in rutas]
+        self._vigilante = QFileSystemWatcher(self)
+        self._temporizador = QTimer(self)
+        self._temporizador.setSingleShot(True)
+        self._temporizador.setInterval(retardo_ms)
+        self._temporizador.timeout.connect(self._emitir)
+
+        self._vigilante.fileChanged.connect(self._al_notificar)
+        self._vigilante.directoryChanged.connect(self._al_notificar)
+        self._registrar_rutas()
+
+    def _registrar_rutas(self) -> None:
+        """Añade al vigilante las rutas (y carpetas) que no estén ya registradas."""
+        registrados = set(self._vigilante.files()) | set(self._vigilante.directories())
+        pendientes = []
+        for ruta in self.rutas:
+            for candidata in (ruta, ruta.parent):
+                if candidata.exists() and str(candidata) not in registrados:
+                    pendientes.append(str(candidata))
+                    registrados.add(str(candidata))
+        if pendientes:
+            self._vigilante.addPaths(pendientes)
+
+    def _al_notificar(self, ruta: str) -> None:
+        # Un archivo reemplazado deja de estar vigilado: se vuelve a registrar
+        self._registrar_rutas()
+        self._temporizador.start()
+
+    def _emitir(self) -> None:
+        logger.debug(f"Cambio detectado en {', '.join(str(ruta) for ruta in self.rutas)}")
+        self.cambio_detectado.emit()
+
+    def detener(self) -> None:
+        """Deja de vigilar los archivos."""
+        self._temporizador.stop()
+        vigilados = self._vigilante.files() + self._vigilante.directories()
+        if vigilados:
+            self._vigilante.removePaths(vigilados)
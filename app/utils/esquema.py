@@ -0,0 +1,261 @@
+"""
+Validación del documento de enlaces (formato de links.json) con diagnóstico.
+
+El validador se prepara una vez (campos requeridos como conjunto y una
+función de reparación por campo) y recorre los enlaces en una sola pasada.
+Un enlace correcto solo cuesta una comprobación de subconjunto de claves y
+otra de tipo; el diagnóstico detallado solo se calcula para los enlaces con
+problemas. En lugar de parar en el primer error se devuelven todos, con la
+posición del enlace, y opcionalmente se reparan los que tienen arreglo.
+
+Los veredictos positivos se recuerdan por hash del contenido: volver a
+validar un contenido ya validado (o escrito por la propia aplicación) no
+recorre los enlaces.
+"""
+import logging
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional
+from .time import obtener_timestamp_actual
+
+
+logger = logging.getLogger(__name__)
+
+CAMPOS_REQUERIDOS = ('id', 'titulo', 'url', 'categoria', 'tags', 'creado_en', 'actualizado_en')
+CATEGORIA_POR_DEFECTO = "General"
+
+# Errores que se escriben en el log por validación (el resto solo se cuentan)
+MAX_ERRORES_LOG = 20
+# Hashes de contenido con veredicto positivo que se recuerdan
+MAX_VEREDICTOS = 8
+
+
+class ErrorValidacion(NamedTuple):
+    """Problema encontrado en el documento o en uno de sus enlaces."""
+    indice: Optional[int]  # Posición del enlace, None si es del documento
+    mensaje: str
+    reparado: bool = False
+
+    def __str__(self) -> str:
+        lugar = "documento" if self.indice is None else f"enlace {self.indice}"
+        return f"{lugar}: {self.mensaje}{' (reparado)' if self.reparado else ''}"
+
+
+class ResultadoValidacion(NamedTuple):
+    """Errores de una validación."""
+    errores: List[ErrorValidacion]
+
+    @property
+    def valido(self) -> bool:
+        """True si no queda ningún error sin reparar."""
+        return all(error.reparado for error in self.errores)
+
+    @property
+    def reparados(self) -> int:
+        """Número de problemas reparados."""
+        return sum(error.reparado for error in self.errores)
+
+    @property
+    def documento_valido(self) -> bool:
+        """True si el documento se puede usar, aunque tenga enlaces sin arreglo."""
+        return all(error.reparado for error in self.errores if error.indice is None)
+
+    @property
+    def enlaces_irreparables(self) -> List[int]:
+        """Posiciones de los enlaces con algún error sin reparar, sin repetir."""
+        return sorted({error.indice for error in self.errores
+                       if error.indice is not None and not error.reparado})
+
+
+# Reparaciones de campos ausentes: reciben el enlace y el timestamp de la
+# validación y devuelven el valor (None si el campo no se puede deducir).
+# Se aplican en el orden de CAMPOS_REQUERIDOS.
+def _reparar_id(enlace: Dict[str, Any], ahora: str) -> Optional[str]:
+    return str(uuid.uuid4())
+
+
+def _reparar_titulo(enlace: Dict[str, Any], ahora: str) -> Optional[str]:
+    return enlace.get('url') or None
+
+
+def _reparar_categoria(enlace: Dict[str, Any], ahora: str) -> Optional[str]:
+    return CATEGORIA_POR_DEFECTO
+
+
+def _reparar_tags(enlace: Dict[str, Any], ahora: str) -> Optional[list]:
+    return []
+
+
+def _reparar_creado(enlace: Dict[str, Any], ahora: str) -> Optional[str]:
+    return enlace.get('actualizado_en') or ahora
+
+
+def _reparar_actualizado(enlace: Dict[str, Any], ahora: str) -> Optional[str]:
+    return enlace.get('creado_en') or ahora
+
+
+REPARACIONES: Dict[str, Callable[[Dict[str, Any], str], Any]] = {
+    'id': _reparar_id,
+    'titulo': _reparar_titulo,
+    'categoria': _reparar_categoria,
+    'tags': _reparar_tags,
+    'creado_en': _reparar_creado,
+    'actualizado_en': _reparar_actualizado,
+}
+
+
+def _convertir_tags(tags: Any) -> list:
+    """Lista de tags a partir de una tupla o de un texto separado por comas."""
+    if isinstance(tags, str):
+        return [tag.strip() for tag in tags.split(',') if tag.strip()]
+    if isinstance(tags, tuple):
+        return list(tags)
+    return []
+
+
+class ValidadorDocumento:
+    """
+    Validador del documento de enlaces preparado para unos campos requeridos.
+    """
+
+    def __init__(self, campos_requeridos: Iterable[str] = CAMPOS_REQUERIDOS,
+                 reparaciones: Optional[Dict[str, Callable[[Dict[str, Any], str], Any]]] = None):
+        """
+        Prepara el validador.
+
+        Args:
+            campos_requeridos: Campos obligatorios de cada enlace
+            reparaciones: Función de reparación por campo (por defecto REPARACIONES)
+        """
+        self.campos_requeridos = tuple(campos_requeridos)
+        self._requeridos = frozenset(self.campos_requeridos)
+        self.reparaciones = REPARACIONES if reparaciones is None else reparaciones
+
+    def validar(self, datos: Any, reparar: bool = False) -> ResultadoValidacion:
+        """
+        Valida un documento completo.
+
+        Args:
+            datos: Documento a validar
+            reparar: Completar en su sitio los campos que se pueden deducir
+
+        Returns:
+            Todos los errores encontrados
+        """
+        errores: List[ErrorValidacion] = []
+        if not isinstance(datos, dict):
+            errores.append(ErrorValidacion(None, "el documento no es un objeto JSON"))
+            return ResultadoValidacion(errores)
+
+        version = datos.get('version')
+        if not isinstance(version, int):
+            if reparar:
+                datos['version'] = 1
+            errores.append(ErrorValidacion(None, f"versión inválida: {version!r}", reparar))
+
+        enlaces = datos.get('links')
+        if not isinstance(enlaces, list):
+            errores.append(ErrorValidacion(None, "falta la lista 'links'"))
+            return ResultadoValidacion(errores)
+
+        requeridos = self._requeridos
+        ahora = None
+        for indice, enlace in enumerate(enlaces):
+            # Camino rápido: un enlace correcto no pasa de esta línea
+            if type(enlace) is dict and enlace.keys() >= requeridos and type(enlace['tags']) is list:
+                continue
+            if ahora is None:
+                ahora = obtener_timestamp_actual()
+            self._diagnosticar(indice, enlace, reparar, ahora, errores)
+
+        if not isinstance(datos.get('categorias'), list):
+            if reparar:
+                datos['categorias'] = sorted({enlace['categoria'] for enlace in enlaces
+                                              if isinstance(enlace, dict) and isinstance(enlace.get('categoria'), str)})
+            errores.append(ErrorValidacion(None, "falta la lista 'categorias'", reparar))
+
+        return ResultadoValidacion(errores)
+
+    def _diagnosticar(self, indice: int, enlace: Any, reparar: bool, ahora: str,
+                      errores: List[ErrorValidacion]) -> None:
+        """Añade a errores los problemas de un enlace (reparándolos si se puede)."""
+        if not isinstance(enlace, dict):
+            errores.append(ErrorValidacion(indice, f"no es un objeto ({type(enlace).__name__})"))
+            return
+
+        for campo in self.campos_requeridos:
+            if campo in enlace:
+                continue
+            reparacion = self.reparaciones.get(campo) if reparar else None
+            valor = reparacion(enlace, ahora) if reparacion else None
+            if valor is not None:
+                enlace[campo] = valor
+            errores.append(ErrorValidacion(indice, f"falta el campo '{campo}'", valor is not None))
+
+        if 'tags' in enlace and not isinstance(enlace['tags'], list):
+            tipo = type(enlace['tags']).__name__
+            if reparar:
+                enlace['tags'] = _convertir_tags(enlace['tags'])
+            errores.append(ErrorValidacion(indice, f"'tags' no es una lista ({tipo})", reparar))
+
+
+VALIDADOR = ValidadorDocumento()
+
+# Hashes de contenidos validados, del más antiguo al más reciente
+_veredictos: 'OrderedDict[bytes, None]' = OrderedDict()
+
+
+def marcar_validado(hash_contenido: bytes) -> None:
+    """
+    Recuerda que un contenido es válido (por ejemplo, porque lo escribió la
+    propia aplicación a partir de datos ya validados).
+
+    Args:
+        hash_contenido: Hash del contenido del archivo
+    """
+    _veredictos[hash_contenido] = None
+    _veredictos.move_to_end(hash_contenido)
+    while len(_veredictos) > MAX_VEREDICTOS:
+        _veredictos.popitem(last=False)
+
+
+def validar_documento(datos: Any, reparar: bool = False,
+                      hash_contenido: Optional[bytes] = None) -> ResultadoValidacion:
+    """
+    Valida un documento con el formato de links.json.
+
+    Args:
+        datos: Documento a validar
+        reparar: Completar en su sitio los campos que se pueden deducir
+        hash_contenido: Hash del archivo del que procede el documento; si ya
+            se validó ese contenido no se vuelve a recorrer
+
+    Returns:
+        Todos los errores encontrados
+    """
+    if hash_contenido is not None and hash_contenido in _veredictos:
+        return ResultadoValidacion([])
+
+    resultado = VALIDADOR.validar(datos, reparar)
+    if hash_contenido is not None and not resultado.errores:
+        marcar_validado(hash_contenido)
+    return resultado
+
+
+def registrar_diagnostico(resultado: ResultadoValidacion, origen: Any) -> None:
+    """
+    Escribe en el log los errores de una validación.
+
+    Args:
+        resultado: Resultado de la validación
+        origen: Descripción del origen de los datos (por ejemplo, la ruta)
+    """
+    if not resultado.errores:
+        return
+    nivel = logging.WARNING if resultado.valido else logging.ERROR
+    logger.log(nivel, f"Validación de {origen}: {len(resultado.errores)} problemas, "
+                      f"{resultado.reparados} reparados")
+    for error in resultado.errores[:MAX_ERRORES_LOG]:
+        logger.log(nivel, f"  {error}")
+    if len(resultado.errores) > MAX_ERRORES_LOG:
+        logger.log(nivel, f"  ... y {len(resultado.errores) - MAX_ERRORES_LOG} más")
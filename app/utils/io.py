@@ -4,9 +4,11 @@ Utilidades de entrada/salida para la aplicación.
 import json
 import logging
 import webbrowser
+from collections.abc import Mapping
 from pathlib import Path
 from typing import Dict, Any, Optional
 import portalocker
+from .esquema import registrar_diagnostico, validar_documento
 
 
 logger = logging.getLogger(__name__)
@@ -64,13 +66,61 @@ def cargar_json(ruta_archivo: Path) -> Optional[Dict[str, Any]]:
         return None
 
 
-def guardar_json(datos: Dict[str, Any], ruta_archivo: Path) -> bool:
+def leer_bytes(ruta_archivo: Path) -> Optional[bytes]:
     """
-    Guarda datos en un archivo JSON con bloqueo seguro.
+    Lee el contenido binario de un archivo con bloqueo compartido.
     
     Args:
-        datos: Diccionario con los datos a guardar
-        ruta_archivo: Ruta al archivo JSON
+        ruta_archivo: Ruta al archivo
+        
+    Returns:
+        Contenido del archivo o None si no existe o hay error
+    """
+    try:
+        if not ruta_archivo.exists():
+            logger.warning(f"Archivo no existe: {ruta_archivo}")
+            return None
+            
+        with open(ruta_archivo, 'rb') as f:
+            # Bloqueo compartido para lectura
+            portalocker.lock(f, portalocker.LOCK_SH)
+            try:
+                return f.read()
+            finally:
+                portalocker.unlock(f)
+                
+    except Exception as e:
+        logger.error(f"Error al leer {ruta_archivo}: {e}")
+        return None
+
+
+def serializar_json(datos: Dict[str, Any]) -> bytes:
+    """
+    Serializa datos con el formato legible de los archivos de la aplicación.
+    
+    Args:
+        datos: Diccionario con los datos a serializar
+        
+    Returns:
+        JSON codificado en UTF-8
+    """
+    return json.dumps(datos, ensure_ascii=False, indent=2, default=_mapeo_a_dict).encode('utf-8')
+
+
+def _mapeo_a_dict(objeto: Any) -> Dict[str, Any]:
+    """Serializa como objeto JSON los mapeos que no son dict (enlaces compactos)."""
+    if isinstance(objeto, Mapping):
+        return dict(objeto)
+    raise TypeError(f"Objeto de tipo {type(objeto).__name__} no serializable a JSON")
+
+
+def guardar_bytes(contenido: bytes, ruta_archivo: Path) -> bool:
+    """
+    Escribe contenido binario en un archivo con bloqueo exclusivo.
+    
+    Args:
+        contenido: Bytes a escribir
+        ruta_archivo: Ruta al archivo
         
     Returns:
         True si se guardó correctamente, False en caso contrario
@@ -79,94 +129,55 @@ def guardar_json(datos: Dict[str, Any], ruta_archivo: Path) -> bool:
         # Crear directorio padre si no existe
         ruta_archivo.parent.mkdir(parents=True, exist_ok=True)
         
-        with open(ruta_archivo, 'w', encoding='utf-8') as f:
+        with open(ruta_archivo, 'wb') as f:
             # Bloqueo exclusivo para escritura
             portalocker.lock(f, portalocker.LOCK_EX)
             try:
-                json.dump(datos, f, ensure_ascii=False, indent=2)
-                logger.info(f"JSON guardado correctamente en: {ruta_archivo}")
+                f.write(contenido)
                 return True
             finally:
                 portalocker.unlock(f)
                 
     except Exception as e:
-        logger.error(f"Error al guardar JSON en {ruta_archivo}: {e}")
+        logger.error(f"Error al guardar {ruta_archivo}: {e}")
         return False
 
 
-def validar_estructura_json(datos: Dict[str, Any]) -> bool:
+def guardar_json(datos: Dict[str, Any], ruta_archivo: Path) -> bool:
     """
-    Valida que un diccionario tenga la estructura esperada para links.json.
+    Guarda datos en un archivo JSON con bloqueo seguro.
     
     Args:
-        datos: Diccionario a validar
+        datos: Diccionario con los datos a guardar
+        ruta_archivo: Ruta al archivo JSON
         
     Returns:
-        True si la estructura es válida, False en caso contrario
+        True si se guardó correctamente, False en caso contrario
     """
     try:
-        # Verificar claves principales
-        if not isinstance(datos, dict):
-            return False
-            
-        if 'version' not in datos or 'categorias' not in datos or 'links' not in datos:
-            return False
-            
-        # Verificar tipos
-        if not isinstance(datos['version'], int):
-            return False
-            
-        if not isinstance(datos['categorias'], list):
-            return False
-            
-        if not isinstance(datos['links'], list):
-            return False
-            
-        # Verificar cada enlace
-        for link in datos['links']:
-            if not isinstance(link, dict):
-                return False
-                
-            campos_requeridos = ['id', 'titulo', 'url', 'categoria', 'tags', 'creado_en', 'actualizado_en']
-            for campo in campos_requeridos:
-                if campo not in link:
-                    return False
-                    
-            # Verificar tipos específicos
-            if not isinstance(link['tags'], list):
-                return False
-                
-        logger.info("Estructura JSON válida")
-        return True
-        
+        contenido = serializar_json(datos)
     except Exception as e:
-        logger.error(f"Error al validar estructura JSON: {e}")
+        logger.error(f"Error al serializar JSON para {ruta_archivo}: {e}")
         return False
+    
+    if guardar_bytes(contenido, ruta_archivo):
+        logger.info(f"JSON guardado correctamente en: {ruta_archivo}")
+        return True
+    return False
 
 
-def crear_backup(ruta_archivo: Path) -> bool:
+def validar_estructura_json(datos: Dict[str, Any]) -> bool:
     """
-    Crea una copia de seguridad de un archivo.
+    Valida que un diccionario tenga la estructura esperada para links.json.
+    
+    Los problemas encontrados se escriben en el log (ver utils.esquema).
     
     Args:
-        ruta_archivo: Ruta al archivo original
+        datos: Diccionario a validar
         
     Returns:
-        True si se creó el backup correctamente, False en caso contrario
+        True si la estructura es válida, False en caso contrario
     """
-    try:
-        if not ruta_archivo.exists():
-            return False
-            
-        backup_path = ruta_archivo.with_suffix(f'{ruta_archivo.suffix}.backup')
-        
-        with open(ruta_archivo, 'r', encoding='utf-8') as origen:
-            with open(backup_path, 'w', encoding='utf-8') as destino:
-                destino.write(origen.read())
-                
-        logger.info(f"Backup creado: {backup_path}")
-        return True
-        
-    except Exception as e:
-        logger.error(f"Error al crear backup: {e}")
-        return False
\ No newline at end of file
+    resultado = validar_documento(datos)
+    registrar_diagnostico(resultado, "documento JSON")
+    return resultado.valido
@@ -1,8 +1,15 @@
 """
 Utilidades para manejo de tiempo y fechas.
 """
-from datetime import datetime
-from typing import Optional
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Any, Optional
+
+
+# Origen de las fechas guardadas como microsegundos enteros (hora local, sin zona)
+EPOCA = datetime(1970, 1, 1)
+FORMATO_FECHA_UI = "%d/%m/%Y %H:%M"
+_MICROSEGUNDOS_MINUTO = 60_000_000
 
 
 def obtener_timestamp_actual() -> str:
@@ -15,21 +22,37 @@ def obtener_timestamp_actual() -> str:
     return datetime.now().isoformat()
 
 
-def formatear_fecha(timestamp: str) -> str:
+@lru_cache(maxsize=8192)
+def _formatear_minuto(minuto: int) -> str:
+    """Texto de un minuto contado desde EPOCA (la UI no muestra segundos)."""
+    return (EPOCA + timedelta(minutes=minuto)).strftime(FORMATO_FECHA_UI)
+
+
+@lru_cache(maxsize=8192)
+def _formatear_iso(timestamp: str) -> str:
+    try:
+        return datetime.fromisoformat(timestamp).strftime(FORMATO_FECHA_UI)
+    except ValueError:
+        return "Fecha inválida"
+
+
+def formatear_fecha(timestamp: Any) -> str:
     """
-    Formatea un timestamp ISO para mostrar en la UI.
+    Formatea un timestamp para mostrar en la UI.
+    
+    Los textos se cachean: la tabla pide la misma fecha en cada repintado.
     
     Args:
-        timestamp: Timestamp en formato ISO
+        timestamp: Timestamp en formato ISO o microsegundos desde EPOCA
         
     Returns:
         Fecha formateada para mostrar
     """
-    try:
-        dt = datetime.fromisoformat(timestamp)
-        return dt.strftime("%d/%m/%Y %H:%M")
-    except (ValueError, TypeError):
-        return "Fecha inválida"
+    if type(timestamp) is int:
+        return _formatear_minuto(timestamp // _MICROSEGUNDOS_MINUTO)
+    if isinstance(timestamp, str):
+        return _formatear_iso(timestamp)
+    return "Fecha inválida"
 
 
 def parsear_timestamp(timestamp: Optional[str]) -> Optional[datetime]:
@@ -3,10 +3,13 @@ Utilidades de validación para la aplicación.
 """
 import re
 import unicodedata
-from urllib.parse import urlparse
+from urllib.parse import urlparse, urlsplit, urlunsplit
 from typing import List
 
 
+_ESPACIOS_MULTIPLES = re.compile(r'\s+')
+
+
 def normalizar(texto: str) -> str:
     """
     Normaliza texto removiendo acentos, convirtiendo a minúsculas
@@ -30,12 +33,16 @@ def normalizar(texto: str) -> str:
     # Convertir a minúsculas
     texto = texto.lower()
     
+    # Sin caracteres no ASCII no hay acentos que quitar
+    if texto.isascii():
+        return _ESPACIOS_MULTIPLES.sub(' ', texto.strip())
+    
     # Remover acentos usando unicodedata
     texto = unicodedata.normalize('NFD', texto)
     texto = ''.join(c for c in texto if unicodedata.category(c) != 'Mn')
     
     # Limpiar espacios duplicados
-    texto = re.sub(r'\s+', ' ', texto.strip())
+    texto = _ESPACIOS_MULTIPLES.sub(' ', texto.strip())
     
     return texto
 
@@ -148,6 +155,44 @@ def limpiar_url(url: str) -> str:
     return url
 
 
+def canonicalizar_url(url: str) -> str:
+    """
+    Obtiene la forma canónica de una URL para detectar duplicados.
+    
+    Aplica limpiar_url, elimina el puerto por defecto y la barra final de la
+    ruta y compara sin distinguir mayúsculas, igual que url_existe.
+    
+    Args:
+        url: URL a canonicalizar
+        
+    Returns:
+        Clave canónica de la URL
+        
+    Examples:
+        >>> canonicalizar_url("WWW.Google.com/")
+        'https://www.google.com'
+        >>> canonicalizar_url("http://ejemplo.com:80/docs/")
+        'http://ejemplo.com/docs'
+    """
+    url = limpiar_url(url)
+    if not url:
+        return ""
+    
+    try:
+        partes = urlsplit(url)
+    except ValueError:
+        return normalizar(url)
+    
+    esquema = partes.scheme.lower()
+    servidor = partes.netloc.lower()
+    puerto_defecto = {'http': ':80', 'https': ':443'}.get(esquema)
+    if puerto_defecto and servidor.endswith(puerto_defecto):
+        servidor = servidor[:-len(puerto_defecto)]
+    
+    ruta = partes.path.rstrip('/')
+    return normalizar(urlunsplit((esquema, servidor, ruta, partes.query, partes.fragment)))
+
+
 def limpiar_tags(tags: List[str]) -> List[str]:
     """
     Limpia y normaliza una lista de tags.
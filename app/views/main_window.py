@@ -10,15 +10,20 @@ from PyQt6.QtWidgets import (
     QLineEdit, QPushButton, QListWidget, QListWidgetItem, QTableView,
     QSplitter, QLabel, QMessageBox, QFileDialog,
     QStatusBar, QMenuBar, QMenu, QFrame, QApplication,
-    QToolBar, QToolButton, QTabWidget, QInputDialog, QDialog, QTextEdit
+    QToolBar, QToolButton, QTabWidget, QInputDialog, QDialog, QTextEdit,
+    QProgressDialog
 )
 from PyQt6.QtCore import Qt, QTimer, pyqtSignal, QUrl
 from PyQt6.QtGui import QKeySequence, QShortcut, QFont, QAction, QDesktopServices, QIcon, QPixmap
-from ..models.repository import RepositorioEnlaces
+from ..models.columnas import FiltroEnlaces
+from ..models.eventos import EventoCambio
+from ..models.repository import crear_repositorio
 from ..models.link_model import ModeloTablaEnlaces
+from ..storage import TrabajadorCopia, VigilanteArchivos
+from ..intercambio import SesionImportacion, formato_por_extension
+from ..intercambio.trabajadores import TrabajadorImportacion, TrabajadorExportacion
 from ..models.search import (
-    buscar_enlaces, extraer_todas_las_categorias, 
-    extraer_todos_los_tags
+    extraer_todas_las_categorias, extraer_todos_los_tags
 )
 from ..utils.io import abrir_url
 from ..theme import Colors, Fonts, get_icon
@@ -28,10 +33,12 @@ from ..widgets import (
     show_warning_toast, show_info_toast
 )
 from ..widgets.about_dialog import AboutDialog
+from ..widgets.copias_dialog import DialogoCopias
+from ..widgets.estadisticas_dialog import DialogoEstadisticas
 from ..delegates import TagDelegate
 from .link_dialog import DialogoEnlace
 from ..config import (
-    obtener_config_tabla, obtener_config_app, 
+    obtener_config_tabla, obtener_config_app, obtener_config_almacenamiento,
     obtener_fluent_colors, obtener_fluent_typography, obtener_fluent_spacing, 
     obtener_fluent_elevation, obtener_fluent_motion,
     get_fluent_color, get_fluent_font_size, get_fluent_spacing, 
@@ -44,6 +51,12 @@ from ..config import (
 
 logger = logging.getLogger(__name__)
 
+# Pseudocategoría que muestra solo los favoritos
+FILTRO_FAVORITOS = "⭐ Favoritos"
+
+# Enlaces que se abren a la vez sin pedir confirmación
+MAX_ENLACES_SIN_CONFIRMAR = 10
+
 
 class VentanaPrincipal(QMainWindow):
     """
@@ -54,7 +67,7 @@ class VentanaPrincipal(QMainWindow):
         super().__init__()
         
         # Inicializar repositorio y modelo
-        self.repositorio = RepositorioEnlaces(ruta_datos)
+        self.repositorio = crear_repositorio(ruta_datos)
         self.modelo_tabla = ModeloTablaEnlaces()
         
         # Estado de filtros
@@ -62,6 +75,9 @@ class VentanaPrincipal(QMainWindow):
         self.tag_filtro_actual = ""
         self.busqueda_actual = ""
         
+        # Durante una importación los eventos del repositorio no repintan las vistas
+        self._vistas_suspendidas = False
+        
         # Timer para búsqueda con delay
         self.timer_busqueda = QTimer()
         self.timer_busqueda.setSingleShot(True)
@@ -72,6 +88,9 @@ class VentanaPrincipal(QMainWindow):
         self._conectar_senales()
         self._configurar_atajos()
         self._cargar_datos_iniciales()
+        self.repositorio.suscribir(self._al_cambiar_repositorio)
+        self._iniciar_vigilancia()
+        self._iniciar_copias_automaticas()
         
         # Inicializar sistema de notificaciones toast
         init_toast_system(self)
@@ -564,10 +583,18 @@ class VentanaPrincipal(QMainWindow):
         accion_importar.triggered.connect(self._importar_json)
         menu_archivo.addAction(accion_importar)
         
-        accion_exportar = QAction("Exportar JSON...", self)
+        accion_marcadores = QAction("Importar marcadores del navegador...", self)
+        accion_marcadores.triggered.connect(self._importar_marcadores)
+        menu_archivo.addAction(accion_marcadores)
+        
+        accion_exportar = QAction("Exportar...", self)
         accion_exportar.triggered.connect(self._exportar_json)
         menu_archivo.addAction(accion_exportar)
         
+        accion_restaurar = QAction("Restaurar copia de seguridad...", self)
+        accion_restaurar.triggered.connect(self._restaurar_copia)
+        menu_archivo.addAction(accion_restaurar)
+        
         menu_archivo.addSeparator()
         
         accion_salir = QAction("Salir", self)
@@ -594,6 +621,14 @@ class VentanaPrincipal(QMainWindow):
         accion_buscar.setShortcut(QKeySequence("Ctrl+F"))
         accion_buscar.triggered.connect(self._enfocar_busqueda)
         menu_editar.addAction(accion_buscar)
+        
+        # Menú Ver
+        menu_ver = menubar.addMenu("Ver")
+        
+        accion_estadisticas = QAction("Estadísticas...", self)
+        accion_estadisticas.setShortcut(QKeySequence("Ctrl+I"))
+        accion_estadisticas.triggered.connect(self._mostrar_estadisticas)
+        menu_ver.addAction(accion_estadisticas)
     
     def _crear_toolbar(self, layout_padre: QVBoxLayout) -> None:
         """Crea la barra de herramientas con íconos."""
@@ -992,6 +1027,13 @@ class VentanaPrincipal(QMainWindow):
         self.tabla_enlaces.setModel(self.modelo_tabla)
         self.tabla_enlaces.setAlternatingRowColors(True)
         self.tabla_enlaces.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        # Ctrl/Mayús + clic para seleccionar varios enlaces y editarlos en lote
+        self.tabla_enlaces.setSelectionMode(QTableView.SelectionMode.ExtendedSelection)
+        self.tabla_enlaces.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        # Clic en la cabecera: ascendente, descendente y vuelta al orden natural
+        cabecera = self.tabla_enlaces.horizontalHeader()
+        cabecera.setSortIndicatorClearable(True)
+        cabecera.setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
         self.tabla_enlaces.setSortingEnabled(True)
         
         # Configurar altura de filas optimizada para URLs largas
@@ -1155,6 +1197,8 @@ class VentanaPrincipal(QMainWindow):
         # Tabla
         self.tabla_enlaces.doubleClicked.connect(self._abrir_enlace)
         self.tabla_enlaces.selectionModel().selectionChanged.connect(self._seleccion_tabla_cambiada)
+        self.tabla_enlaces.customContextMenuRequested.connect(self._mostrar_menu_tabla)
+        self.modelo_tabla.orden_cambiado.connect(self._actualizar_tabla_enlaces)
     
     def _configurar_atajos(self) -> None:
         """Configura los atajos de teclado."""
@@ -1229,6 +1273,121 @@ class VentanaPrincipal(QMainWindow):
         # Mostrar toast de bienvenida con delay
         QTimer.singleShot(1000, self._mostrar_toast_bienvenida)
     
+    def _al_cambiar_repositorio(self, evento: EventoCambio) -> None:
+        """
+        Actualiza solo las vistas afectadas por un cambio del repositorio.
+        
+        Args:
+            evento: Cambios emitidos por el repositorio
+        """
+        if self._vistas_suspendidas:
+            return
+        
+        for categoria_antigua, categoria_nueva in evento.categorias_renombradas:
+            if self.categoria_filtro_actual == categoria_antigua:
+                self.categoria_filtro_actual = categoria_nueva
+        
+        if evento.cambia_categorias:
+            self._actualizar_lista_categorias()
+        
+        # Sin filtros ni orden la tabla muestra los propios enlaces del
+        # repositorio: una edición solo necesita repintar sus filas. En otro
+        # caso el modelo calcula la diferencia y conserva selección y desplazamiento
+        hay_filtro = (self.busqueda_actual or self.categoria_filtro_actual or self.tag_filtro_actual
+                      or self.modelo_tabla.obtener_orden())
+        if evento.cambia_filas or (hay_filtro and evento.actualizados):
+            self._actualizar_tabla_enlaces()
+        elif evento.actualizados:
+            self.modelo_tabla.refrescar_enlaces(evento.actualizados)
+        
+        self._actualizar_informacion()
+    
+    def _iniciar_vigilancia(self) -> None:
+        """Vigila los archivos de datos para incorporar los cambios de otros procesos."""
+        config = obtener_config_almacenamiento()
+        self._vigilante = None
+        if not config.get('vigilar_archivo', True):
+            return
+        self._vigilante = VigilanteArchivos(self.repositorio.rutas_observadas(),
+                                            config.get('retardo_vigilancia_ms', 500), self)
+        self._vigilante.cambio_detectado.connect(self._incorporar_cambios_externos)
+    
+    def _iniciar_copias_automaticas(self) -> None:
+        """Crea una copia de seguridad al arrancar y después cada cierto tiempo."""
+        self._trabajador_copia: Optional[TrabajadorCopia] = None
+        self.timer_copias: Optional[QTimer] = None
+        intervalo = obtener_config_almacenamiento().get('intervalo_copias_min', 60)
+        if intervalo <= 0:
+            return
+        self.timer_copias = QTimer(self)
+        self.timer_copias.timeout.connect(self._crear_copia_en_segundo_plano)
+        self.timer_copias.start(intervalo * 60 * 1000)
+        self._crear_copia_en_segundo_plano()
+    
+    def _crear_copia_en_segundo_plano(self) -> None:
+        """Copia los datos guardados en un hilo de trabajo (si no hay otra en curso)."""
+        if self._trabajador_copia is not None and self._trabajador_copia.isRunning():
+            return
+        self._trabajador_copia = TrabajadorCopia(self.repositorio.crear_backup, self)
+        self._trabajador_copia.terminado.connect(self._al_terminar_copia)
+        self._trabajador_copia.start()
+    
+    def _al_terminar_copia(self, correcto: bool) -> None:
+        if not correcto:
+            self.barra_estado.showMessage("⚠️ No se pudo crear la copia de seguridad", 5000)
+    
+    def _restaurar_copia(self) -> None:
+        """Deja elegir una copia de seguridad y sustituye los datos por ella."""
+        dialogo = DialogoCopias(self.repositorio.listar_copias(), self)
+        if dialogo.exec() != QDialog.DialogCode.Accepted:
+            return
+        copia = dialogo.copia_seleccionada()
+        if copia is None:
+            return
+        
+        respuesta = QMessageBox.question(
+            self,
+            "Restaurar copia",
+            f"¿Sustituir los datos actuales por la copia del {copia.fecha:%Y-%m-%d %H:%M:%S}?\n"
+            "Antes se guardará una copia del estado actual.",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            QMessageBox.StandardButton.No
+        )
+        if respuesta != QMessageBox.StandardButton.Yes:
+            return
+        
+        # Una copia en curso lee el mismo archivo que se va a reemplazar
+        if self._trabajador_copia is not None:
+            self._trabajador_copia.wait()
+        if self.repositorio.restaurar_copia(copia):
+            show_success_toast("🗄️ Copia de seguridad restaurada")
+        else:
+            QMessageBox.warning(self, "Error", "No se pudo restaurar la copia de seguridad")
+            show_error_toast("❌ Error al restaurar la copia")
+    
+    def _incorporar_cambios_externos(self) -> None:
+        """Aplica a las vistas lo que otro proceso haya guardado en los datos."""
+        # Una importación en curso trabaja sobre los enlaces actuales
+        if self._vistas_suspendidas:
+            return
+        resumen = self.repositorio.sincronizar_cambios_externos()
+        if resumen and any(resumen.values()):
+            self.statusBar().showMessage(f"🔄 Cambios externos: {self._describir_cambios(resumen)}", 5000)
+    
+    @staticmethod
+    def _describir_cambios(resumen: Dict[str, int]) -> str:
+        """Texto breve con los contadores de una sincronización."""
+        return (f"{resumen['agregados']} nuevos, {resumen['actualizados']} modificados, "
+                f"{resumen['eliminados']} eliminados")
+    
+    def _reanudar_vistas(self) -> None:
+        """Vuelve a escuchar los eventos y reconstruye las vistas tras una importación."""
+        self._vistas_suspendidas = False
+        self._actualizar_lista_categorias()
+        self._actualizar_tabla_enlaces()
+        self._actualizar_informacion()
+        self.widget_favoritos.refrescar_favoritos()
+    
     def _mostrar_toast_bienvenida(self):
         """Muestra el toast de bienvenida al cargar la aplicación."""
         enlaces = self.repositorio.obtener_enlaces()
@@ -1246,7 +1405,7 @@ class VentanaPrincipal(QMainWindow):
         self.lista_categorias.addItem(item_todas)
         
         # Obtener todas las categorías (tanto del repositorio como de los enlaces)
-        categorias_repositorio = self.repositorio._datos.get('categorias', [])
+        categorias_repositorio = self.repositorio.obtener_categorias()
         categorias_enlaces = extraer_todas_las_categorias(enlaces)
         
         # Combinar ambas listas sin duplicados
@@ -1259,27 +1418,37 @@ class VentanaPrincipal(QMainWindow):
             item_categoria = QListWidgetItem(f"📂 {categoria} ({count})")
             self.lista_categorias.addItem(item_categoria)
     
+    def _filtro_actual(self) -> FiltroEnlaces:
+        """Criterios de categoría, tag y favoritos seleccionados."""
+        if self.categoria_filtro_actual == FILTRO_FAVORITOS:
+            return FiltroEnlaces(tag=self.tag_filtro_actual, solo_favoritos=True)
+        return FiltroEnlaces(categoria=self.categoria_filtro_actual, tag=self.tag_filtro_actual)
+    
     def _actualizar_tabla_enlaces(self) -> None:
         """Actualiza la tabla de enlaces con filtros aplicados."""
-        enlaces = self.repositorio.obtener_enlaces()
-        
-        # Aplicar búsqueda y filtros
-        resultados = buscar_enlaces(
-            enlaces,
-            self.busqueda_actual,
-            self.categoria_filtro_actual,
-            self.tag_filtro_actual
-        )
-        
-        # Actualizar modelo
-        if self.busqueda_actual or self.tag_filtro_actual:
-            self.modelo_tabla.actualizar_enlaces_con_score(resultados)
+        orden = self.modelo_tabla.obtener_orden()
+        if self.busqueda_actual:
+            # Búsqueda con scoring (el repositorio usa su índice si lo tiene)
+            # sobre los mismos criterios que la tabla sin búsqueda
+            resultados = self.repositorio.buscar_enlaces(
+                self.busqueda_actual,
+                filtro=self._filtro_actual()
+            )
+            if orden:
+                resultados = self.repositorio.ordenar_resultados(resultados, *orden)
+            reiniciado = self.modelo_tabla.actualizar_enlaces_con_score(resultados)
         else:
-            enlaces_filtrados = [enlace for enlace, _ in resultados]
-            self.modelo_tabla.actualizar_enlaces(enlaces_filtrados)
-        
-        # Ajustar columnas
-        self.tabla_enlaces.resizeColumnsToContents()
+            # Solo filtros: índices de filas calculados por columnas
+            filas = self.repositorio.filtrar_filas(self._filtro_actual())
+            if orden:
+                # Permutación precalculada del repositorio, común a todos los filtros
+                filas = self.repositorio.ordenar_filas(filas, *orden)
+            reiniciado = self.modelo_tabla.actualizar_filas(self.repositorio.obtener_enlaces(), filas)
+        
+        # Ajustar columnas solo si el modelo se reinició: con cambios
+        # incrementales se conservan los anchos (y no se recorren todas las filas)
+        if reiniciado:
+            self.tabla_enlaces.resizeColumnsToContents()
     
     def _actualizar_informacion(self) -> None:
         """Actualiza la información estadística."""
@@ -1392,14 +1561,9 @@ class VentanaPrincipal(QMainWindow):
         try:
             # Las categorías se crean automáticamente cuando se agrega un enlace,
             # pero podemos agregar la categoría a la lista de categorías del repositorio
-            categorias = self.repositorio._datos.get('categorias', [])
-            if nombre not in categorias:
-                categorias.append(nombre)
-                self.repositorio._datos['categorias'] = categorias
+            if self.repositorio.agregar_categoria(nombre):
                 self.repositorio.guardar()
             
-            self._actualizar_lista_categorias()
-            
             # Seleccionar la nueva categoría
             for i in range(self.lista_categorias.count()):
                 item = self.lista_categorias.item(i)
@@ -1440,6 +1604,7 @@ class VentanaPrincipal(QMainWindow):
         # Contar enlaces en esta categoría
         enlaces = self.repositorio.obtener_enlaces()
         enlaces_en_categoria = [e for e in enlaces if e.get('categoria') == nombre_categoria]
+        mover_a = None
         
         if enlaces_en_categoria:
             respuesta = QMessageBox.question(
@@ -1470,38 +1635,25 @@ class VentanaPrincipal(QMainWindow):
                 return
             elif msg.clickedButton() == mover_btn:
                 # Mover enlaces a categoría "General"
-                for enlace in enlaces_en_categoria:
-                    enlace['categoria'] = 'General'
-                
-                # Asegurar que "General" esté en la lista de categorías
-                categorias = self.repositorio._datos.get('categorias', [])
-                if 'General' not in categorias:
-                    categorias.append('General')
-                    self.repositorio._datos['categorias'] = categorias
-                    
-            elif msg.clickedButton() == eliminar_btn:
-                # Eliminar todos los enlaces de la categoría
-                enlaces_filtrados = [e for e in enlaces if e.get('categoria') != nombre_categoria]
-                self.repositorio._datos['links'] = enlaces_filtrados
+                mover_a = 'General'
+            # Con "Eliminar enlaces" se borran junto con la categoría
         
         try:
-            # Eliminar la categoría de la lista de categorías
-            categorias = self.repositorio._datos.get('categorias', [])
-            if nombre_categoria in categorias:
-                categorias.remove(nombre_categoria)
-                self.repositorio._datos['categorias'] = categorias
-            
-            # Guardar cambios
-            self.repositorio.guardar()
+            # Limpiar filtro si era la categoría eliminada (antes de que el
+            # evento de cambio actualice la tabla)
+            era_filtro = self.categoria_filtro_actual == nombre_categoria
+            if era_filtro:
+                self.categoria_filtro_actual = ""
             
-            # Actualizar interfaz
-            self._actualizar_lista_categorias()
-            self._actualizar_tabla_enlaces()
-            self._actualizar_informacion()
+            # Eliminar la categoría (moviendo o eliminando sus enlaces) con un
+            # único evento y un único guardado
+            with self.repositorio.transaccion():
+                if not self.repositorio.eliminar_categoria(nombre_categoria, mover_a):
+                    # La categoría solo existía en los enlaces: eliminarlos igualmente
+                    self.repositorio.agregar_categoria(nombre_categoria)
+                    self.repositorio.eliminar_categoria(nombre_categoria, mover_a)
             
-            # Limpiar filtro si era la categoría eliminada
-            if self.categoria_filtro_actual == nombre_categoria:
-                self.categoria_filtro_actual = ""
+            if era_filtro:
                 self.lista_categorias.setCurrentRow(0)  # Seleccionar "Todas"
             
             logger.info(f"Categoría '{nombre_categoria}' eliminada exitosamente")
@@ -1600,6 +1752,126 @@ class VentanaPrincipal(QMainWindow):
             logger.error(f"Error obteniendo enlace seleccionado: {e}")
             return None
     
+    def _obtener_enlaces_seleccionados(self) -> List[Dict[str, Any]]:
+        """Obtiene los enlaces seleccionados en la tabla, en orden de fila."""
+        filas = sorted(indice.row() for indice in self.tabla_enlaces.selectionModel().selectedRows())
+        enlaces = (self.modelo_tabla.obtener_enlace_por_fila(fila) for fila in filas)
+        return [enlace for enlace in enlaces if enlace]
+    
+    def _mostrar_menu_tabla(self, posicion) -> None:
+        """Muestra las acciones sobre los enlaces seleccionados."""
+        enlaces = self._obtener_enlaces_seleccionados()
+        sin_cargar = self.modelo_tabla.obtener_numero_sin_cargar()
+        if not enlaces and not sin_cargar:
+            return
+        
+        menu = QMenu(self)
+        if enlaces:
+            if len(enlaces) == 1:
+                menu.addAction("Editar", self._editar_enlace_seleccionado)
+            menu.addAction(f"Abrir ({len(enlaces)})", self._abrir_enlaces_seleccionados)
+            menu.addSeparator()
+            menu.addAction("Cambiar categoría...", self._cambiar_categoria_seleccionados)
+            menu.addAction("Añadir tags...", lambda: self._editar_tags_seleccionados(agregar=True))
+            menu.addAction("Quitar tags...", lambda: self._editar_tags_seleccionados(agregar=False))
+            menu.addSeparator()
+            menu.addAction("⭐ Marcar como favoritos", lambda: self._marcar_favoritos_seleccionados(True))
+            menu.addAction("☆ Quitar de favoritos", lambda: self._marcar_favoritos_seleccionados(False))
+            menu.addSeparator()
+            menu.addAction(f"🗑️ Eliminar ({len(enlaces)})", self._eliminar_enlace_seleccionado)
+        if sin_cargar:
+            # La tabla recibe las filas por páginas al desplazarse
+            menu.addSeparator()
+            menu.addAction(f"Cargar todos (faltan {sin_cargar})", self._cargar_todos_enlaces)
+        menu.exec(self.tabla_enlaces.viewport().mapToGlobal(posicion))
+    
+    def _cargar_todos_enlaces(self) -> None:
+        """Entrega a la tabla todas las filas del resultado actual."""
+        cargados = self.modelo_tabla.cargar_todo()
+        self.barra_estado.showMessage(f"{cargados} enlaces más cargados en la tabla", 3000)
+    
+    def _editar_seleccionados(self, descripcion: str, **cambios) -> None:
+        """
+        Aplica un cambio a todos los enlaces seleccionados con un solo evento
+        y un solo guardado.
+        
+        Args:
+            descripcion: Texto del cambio para los mensajes
+            **cambios: Argumentos de RepositorioEnlaces.editar_enlaces_lote
+        """
+        ids = [enlace['id'] for enlace in self._obtener_enlaces_seleccionados()]
+        if not ids:
+            return
+        
+        modificados = self.repositorio.editar_enlaces_lote(ids, **cambios)
+        if modificados and not self.repositorio.guardar():
+            show_error_toast("❌ Error al guardar los cambios")
+            return
+        self.barra_estado.showMessage(f"{descripcion}: {modificados} de {len(ids)} enlaces modificados", 3000)
+        show_success_toast(f"✏️ {descripcion}: {modificados} enlaces")
+    
+    def _cambiar_categoria_seleccionados(self) -> None:
+        """Mueve los enlaces seleccionados a otra categoría."""
+        categorias = list(self.repositorio.obtener_categorias())
+        categoria, ok = QInputDialog.getItem(
+            self, "Cambiar categoría", "Nueva categoría para los enlaces seleccionados:",
+            categorias, 0, True
+        )
+        if ok and categoria.strip():
+            self._editar_seleccionados("Categoría cambiada", categoria=categoria.strip())
+    
+    def _editar_tags_seleccionados(self, agregar: bool) -> None:
+        """Añade o quita tags de los enlaces seleccionados."""
+        titulo = "Añadir tags" if agregar else "Quitar tags"
+        texto, ok = QInputDialog.getText(self, titulo, "Tags separados por comas:")
+        tags = [tag.strip() for tag in texto.split(',') if tag.strip()] if ok else []
+        if not tags:
+            return
+        if agregar:
+            self._editar_seleccionados("Tags añadidos", agregar_tags=tags)
+        else:
+            self._editar_seleccionados("Tags quitados", quitar_tags=tags)
+    
+    def _marcar_favoritos_seleccionados(self, es_favorito: bool) -> None:
+        """Marca o desmarca como favoritos los enlaces seleccionados."""
+        descripcion = "Marcados como favoritos" if es_favorito else "Quitados de favoritos"
+        self._editar_seleccionados(descripcion, es_favorito=es_favorito)
+    
+    def _abrir_enlaces_seleccionados(self) -> None:
+        """Abre en el navegador todos los enlaces seleccionados."""
+        enlaces = self._obtener_enlaces_seleccionados()
+        if len(enlaces) > MAX_ENLACES_SIN_CONFIRMAR:
+            respuesta = QMessageBox.question(
+                self, "Abrir enlaces", f"¿Abrir {len(enlaces)} enlaces en el navegador?",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+                QMessageBox.StandardButton.No
+            )
+            if respuesta != QMessageBox.StandardButton.Yes:
+                return
+        
+        abiertos = sum(1 for enlace in enlaces if enlace.get('url') and abrir_url(enlace['url']))
+        self.barra_estado.showMessage(f"Abiertos {abiertos} de {len(enlaces)} enlaces", 3000)
+    
+    def _eliminar_enlaces_seleccionados(self, enlaces: List[Dict[str, Any]]) -> None:
+        """Elimina varios enlaces tras confirmarlo, con un solo guardado."""
+        respuesta = QMessageBox.question(
+            self,
+            "Confirmar Eliminación",
+            f"¿Estás seguro de que quieres eliminar {len(enlaces)} enlaces?\n\nEsta acción no se puede deshacer.",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            QMessageBox.StandardButton.No
+        )
+        if respuesta != QMessageBox.StandardButton.Yes:
+            return
+        
+        eliminados = self.repositorio.eliminar_enlaces(enlace['id'] for enlace in enlaces)
+        if eliminados and not self.repositorio.guardar():
+            QMessageBox.warning(self, "Error", "No se pudo guardar los cambios.")
+            show_error_toast("❌ Error al guardar los cambios")
+            return
+        self.barra_estado.showMessage(f"{eliminados} enlaces eliminados correctamente", 3000)
+        show_success_toast(f"🗑️ {eliminados} enlaces eliminados")
+    
     def _nuevo_enlace(self) -> None:
         """Crea un nuevo enlace."""
         categorias = self.repositorio.obtener_categorias()
@@ -1627,7 +1899,6 @@ class VentanaPrincipal(QMainWindow):
         
         if enlace_id:
             if self.repositorio.guardar():
-                self._cargar_datos_iniciales()
                 self.barra_estado.showMessage(f"Enlace '{datos['titulo']}' creado correctamente", 3000)
                 show_success_toast(f"🔗 Enlace '{datos['titulo']}' creado")
             else:
@@ -1675,7 +1946,6 @@ class VentanaPrincipal(QMainWindow):
             datos['tags']
         ):
             if self.repositorio.guardar():
-                self._cargar_datos_iniciales()
                 self.barra_estado.showMessage(f"Enlace '{datos['titulo']}' actualizado correctamente", 3000)
                 show_success_toast(f"✏️ Enlace '{datos['titulo']}' actualizado")
             else:
@@ -1686,7 +1956,12 @@ class VentanaPrincipal(QMainWindow):
             show_error_toast("❌ Error al actualizar enlace")
     
     def _eliminar_enlace_seleccionado(self) -> None:
-        """Elimina el enlace actualmente seleccionado."""
+        """Elimina el enlace actualmente seleccionado (o todos los seleccionados)."""
+        seleccionados = self._obtener_enlaces_seleccionados()
+        if len(seleccionados) > 1:
+            self._eliminar_enlaces_seleccionados(seleccionados)
+            return
+        
         index = self.tabla_enlaces.currentIndex()
         if not index.isValid():
             QMessageBox.information(self, "Información", "Selecciona un enlace para eliminar.")
@@ -1708,7 +1983,6 @@ class VentanaPrincipal(QMainWindow):
         if respuesta == QMessageBox.StandardButton.Yes:
             if self.repositorio.eliminar_enlace(enlace['id']):
                 if self.repositorio.guardar():
-                    self._cargar_datos_iniciales()
                     self.barra_estado.showMessage(f"Enlace '{titulo}' eliminado correctamente", 3000)
                     show_success_toast(f"🗑️ Enlace '{titulo}' eliminado")
                 else:
@@ -1736,7 +2010,6 @@ class VentanaPrincipal(QMainWindow):
         if ok and categoria:
             if self.repositorio.agregar_categoria(categoria):
                 if self.repositorio.guardar():
-                    self._actualizar_lista_categorias()
                     self.barra_estado.showMessage(f"Categoría '{categoria}' creada correctamente", 3000)
                     show_success_toast(f"📁 Categoría '{categoria}' creada")
                 else:
@@ -1774,7 +2047,6 @@ class VentanaPrincipal(QMainWindow):
         if ok and categoria_nueva and categoria_nueva != categoria_actual:
             if self.repositorio.renombrar_categoria(categoria_actual, categoria_nueva):
                 if self.repositorio.guardar():
-                    self._cargar_datos_iniciales()
                     self.barra_estado.showMessage(f"Categoría renombrada a '{categoria_nueva}'", 3000)
                 else:
                     QMessageBox.warning(self, "Error", "No se pudo guardar el cambio.")
@@ -1812,7 +2084,6 @@ class VentanaPrincipal(QMainWindow):
         # Por simplicidad, eliminar enlaces también
         if self.repositorio.eliminar_categoria(categoria, None):
             if self.repositorio.guardar():
-                self._cargar_datos_iniciales()
                 self.barra_estado.showMessage(f"Categoría '{categoria}' eliminada", 3000)
             else:
                 QMessageBox.warning(self, "Error", "No se pudo guardar los cambios.")
@@ -1820,110 +2091,187 @@ class VentanaPrincipal(QMainWindow):
             QMessageBox.warning(self, "Error", "No se pudo eliminar la categoría.")
     
     def _importar_json(self) -> None:
-        """Importa datos desde un archivo JSON."""
+        """Importa enlaces desde un archivo JSON o NDJSON en segundo plano."""
         archivo, _ = QFileDialog.getOpenFileName(
             self,
             "Importar Enlaces",
             "",
-            "Archivos JSON (*.json);;Todos los archivos (*)"
+            "Archivos JSON (*.json *.ndjson *.jsonl);;Todos los archivos (*)"
         )
         
         if archivo:
-            try:
-                from ..utils.io import cargar_json, validar_estructura_json
-                datos = cargar_json(Path(archivo))
-                
-                if datos and validar_estructura_json(datos):
-                    # Crear backup antes de importar
-                    self.repositorio.crear_backup()
-                    
-                    if self.repositorio.importar_datos(datos):
-                        if self.repositorio.guardar():
-                            self._cargar_datos_iniciales()
-                            self.barra_estado.showMessage("Datos importados correctamente", 3000)
-                            show_success_toast("📥 Datos importados correctamente")
-                        else:
-                            QMessageBox.warning(self, "Error", "No se pudieron guardar los datos importados.")
-                            show_error_toast("❌ Error al guardar datos importados")
-                    else:
-                        QMessageBox.warning(self, "Error", "No se pudieron importar los datos.")
-                        show_error_toast("❌ Error al importar los datos")
-                else:
-                    QMessageBox.warning(self, "Error", "El archivo no tiene un formato válido.")
-                    show_warning_toast("⚠️ Formato de archivo inválido")
-            except Exception as e:
-                logger.error(f"Error al importar: {e}")
-                QMessageBox.warning(self, "Error", f"Error al importar archivo: {e}")
-                show_error_toast("❌ Error al importar archivo")
+            self._iniciar_importacion(Path(archivo))
+    
+    def _importar_marcadores(self) -> None:
+        """Importa marcadores de un navegador (HTML, Bookmarks de Chromium o places.sqlite)."""
+        archivo, _ = QFileDialog.getOpenFileName(
+            self,
+            "Importar Marcadores del Navegador",
+            "",
+            "Marcadores (*.html *.htm Bookmarks places.sqlite);;"
+            "Marcadores HTML (*.html *.htm);;Chrome/Edge (Bookmarks);;"
+            "Firefox (places.sqlite);;Todos los archivos (*)"
+        )
+        
+        if archivo:
+            self._iniciar_importacion(Path(archivo))
+    
+    def _iniciar_importacion(self, ruta: Path) -> None:
+        """
+        Importa y fusiona un archivo de enlaces o marcadores en segundo plano.
+        
+        Args:
+            ruta: Archivo a importar
+        """
+        try:
+            # La importación no guarda nada hasta el final, así que la copia
+            # previa puede hacerse en segundo plano mientras se lee el archivo
+            self._crear_copia_en_segundo_plano()
+            self._sesion_importacion = SesionImportacion(self.repositorio)
+        except Exception as e:
+            logger.error(f"Error al preparar la importación: {e}")
+            QMessageBox.warning(self, "Error", f"Error al importar archivo: {e}")
+            show_error_toast("❌ Error al importar archivo")
+            return
+        
+        self._importacion_cancelada = False
+        self._vistas_suspendidas = True
+        self._trabajador_importacion = TrabajadorImportacion(
+            ruta, timestamp_actual=self._sesion_importacion.timestamp, parent=self
+        )
+        
+        self._progreso_importacion = QProgressDialog("Importando enlaces...", "Cancelar", 0, 100, self)
+        self._progreso_importacion.setWindowTitle("Importar Enlaces")
+        self._progreso_importacion.setWindowModality(Qt.WindowModality.WindowModal)
+        self._progreso_importacion.setMinimumDuration(300)
+        self._progreso_importacion.canceled.connect(self._cancelar_importacion)
+        
+        trabajador = self._trabajador_importacion
+        trabajador.lote_listo.connect(self._incorporar_lote_importado)
+        trabajador.progreso.connect(self._progreso_importacion.setValue)
+        trabajador.terminado.connect(self._finalizar_importacion)
+        trabajador.error.connect(self._fallar_importacion)
+        trabajador.start()
+    
+    def _incorporar_lote_importado(self, lote: list) -> None:
+        """Incorpora al repositorio un lote leído por el trabajador de importación."""
+        if self._importacion_cancelada:
+            return
+        
+        self._sesion_importacion.incorporar(lote)
+        self._progreso_importacion.setLabelText(
+            f"Importando enlaces... {self._sesion_importacion.agregados} agregados"
+        )
+        self._trabajador_importacion.lote_procesado()
+    
+    def _cancelar_importacion(self) -> None:
+        """Cancela la importación en curso y descarta los lotes ya incorporados."""
+        if self._importacion_cancelada:
+            return
+        
+        self._importacion_cancelada = True
+        self._trabajador_importacion.requestInterruption()
+        self._trabajador_importacion.wait()
+        
+        # Nada se ha guardado todavía: descartar los lotes incorporados (también
+        # los ya escritos en la transacción abierta del backend) y recargar
+        self._vistas_suspendidas = False
+        self.repositorio.descartar_cambios()
+        self.barra_estado.showMessage("Importación cancelada", 3000)
+        show_warning_toast("⚠️ Importación cancelada")
+    
+    def _finalizar_importacion(self, estadisticas: dict) -> None:
+        """Guarda una sola vez al terminar la importación."""
+        if self._importacion_cancelada:
+            return
+        
+        self._sesion_importacion.incorporar_categorias(estadisticas.get('categorias', []))
+        self._progreso_importacion.reset()
+        
+        resumen = self._sesion_importacion.resumen()
+        self._reanudar_vistas()
+        if self.repositorio.guardar():
+            mensaje = (f"{resumen['agregados']} enlaces nuevos, {resumen['actualizados']} actualizados, "
+                       f"{resumen['omitidos']} sin cambios, {estadisticas['invalidos']} inválidos")
+            self.barra_estado.showMessage(mensaje, 5000)
+            show_success_toast(f"📥 {mensaje}")
+        else:
+            QMessageBox.warning(self, "Error", "No se pudieron guardar los datos importados.")
+            show_error_toast("❌ Error al guardar datos importados")
+    
+    def _fallar_importacion(self, mensaje: str) -> None:
+        """Descarta la importación si el archivo no se pudo leer."""
+        self._importacion_cancelada = True
+        self._progreso_importacion.reset()
+        self._vistas_suspendidas = False
+        self.repositorio.descartar_cambios()
+        QMessageBox.warning(self, "Error", f"El archivo no tiene un formato válido: {mensaje}")
+        show_warning_toast("⚠️ Formato de archivo inválido")
     
     def _exportar_json(self) -> None:
-        """Exporta datos a un archivo JSON."""
-        archivo, _ = QFileDialog.getSaveFileName(
+        """Exporta los enlaces en segundo plano (JSON, NDJSON, CSV o marcadores HTML)."""
+        archivo, filtro = QFileDialog.getSaveFileName(
             self,
             "Exportar Enlaces",
             "enlaces_backup.json",
-            "Archivos JSON (*.json);;Todos los archivos (*)"
+            "Archivos JSON (*.json);;NDJSON (*.ndjson);;CSV (*.csv);;"
+            "Marcadores HTML (*.html);;Todos los archivos (*)"
         )
         
-        if archivo:
-            try:
-                datos = self.repositorio.exportar_datos()
-                from ..utils.io import guardar_json
-                
-                if guardar_json(datos, Path(archivo)):
-                    self.barra_estado.showMessage(f"Datos exportados a {archivo}", 3000)
-                    show_success_toast("📤 Datos exportados correctamente")
-                else:
-                    QMessageBox.warning(self, "Error", "No se pudo exportar el archivo.")
-                    show_error_toast("❌ Error al exportar archivo")
-            except Exception as e:
-                logger.error(f"Error al exportar: {e}")
-                QMessageBox.warning(self, "Error", f"Error al exportar archivo: {e}")
-                show_error_toast("❌ Error al exportar archivo")
-    
+        if not archivo:
+            return
+        
+        ruta = Path(archivo)
+        # Si el usuario no escribió extensión, usar la del filtro elegido
+        if not ruta.suffix:
+            for extension in ('.ndjson', '.csv', '.html', '.json'):
+                if extension in filtro:
+                    ruta = ruta.with_suffix(extension)
+                    break
+        
+        instantanea = self.repositorio.obtener_instantanea()
+        self._trabajador_exportacion = TrabajadorExportacion(
+            instantanea.enlaces, ruta,
+            formato_por_extension(ruta), list(instantanea.categorias), parent=self
+        )
+        
+        self._progreso_exportacion = QProgressDialog("Exportando enlaces...", "Cancelar", 0, 100, self)
+        self._progreso_exportacion.setWindowTitle("Exportar Enlaces")
+        self._progreso_exportacion.setWindowModality(Qt.WindowModality.WindowModal)
+        self._progreso_exportacion.setMinimumDuration(300)
+        self._progreso_exportacion.canceled.connect(self._trabajador_exportacion.requestInterruption)
+        
+        trabajador = self._trabajador_exportacion
+        trabajador.progreso.connect(self._progreso_exportacion.setValue)
+        trabajador.terminado.connect(lambda total: self._finalizar_exportacion(ruta, total))
+        trabajador.error.connect(self._fallar_exportacion)
+        trabajador.start()
+    
+    def _finalizar_exportacion(self, ruta: Path, total: int) -> None:
+        """Informa del resultado de una exportación terminada."""
+        self._progreso_exportacion.reset()
+        self.barra_estado.showMessage(f"{total} enlaces exportados a {ruta}", 3000)
+        show_success_toast("📤 Datos exportados correctamente")
+    
+    def _fallar_exportacion(self, mensaje: str) -> None:
+        """Informa de un error durante la exportación."""
+        self._progreso_exportacion.reset()
+        QMessageBox.warning(self, "Error", f"Error al exportar archivo: {mensaje}")
+        show_error_toast("❌ Error al exportar archivo")
+
     def _refrescar_datos(self) -> None:
-        """Refresca los datos y la vista de forma completa."""
+        """Relee los datos guardados y aplica a las vistas solo lo que cambió."""
         try:
-            # Guardar el estado actual
-            categoria_seleccionada = None
-            filtro_actual = self.filtro_entrada.text() if hasattr(self, 'filtro_entrada') else ""
-            
-            # Obtener categoría actualmente seleccionada
-            if hasattr(self, 'lista_categorias') and self.lista_categorias.currentItem():
-                categoria_seleccionada = self.lista_categorias.currentItem().text()
-            
-            # Mostrar mensaje de progreso
             self.statusBar().showMessage("Refrescando datos...", 0)
             
-            # Recargar datos del repositorio
-            self.repositorio.cargar()
-            
-            # Actualizar todas las vistas
-            self._actualizar_lista_categorias()
-            
-            # Restaurar selección de categoría si existe
-            if categoria_seleccionada and hasattr(self, 'lista_categorias'):
-                for i in range(self.lista_categorias.count()):
-                    item = self.lista_categorias.item(i)
-                    if item and item.text() == categoria_seleccionada:
-                        self.lista_categorias.setCurrentItem(item)
-                        break
-            
-            self._actualizar_tabla_enlaces()
-            self._actualizar_informacion()
-            
-            # Restaurar filtro
-            if filtro_actual and hasattr(self, 'filtro_entrada'):
-                self.filtro_entrada.setText(filtro_actual)
-                self._filtrar_enlaces()
-            
-            # Reconfigurar el fondo si está activado
-            if hasattr(self, '_fondo_activado') and self._fondo_activado:
-                self._configurar_fondo_translucido(self.centralWidget())
+            # Los cambios llegan como un evento normal: se conservan filtros y selección
+            resumen = self.repositorio.sincronizar_cambios_externos(forzar=True)
+            if resumen is None:
+                self.statusBar().showMessage("❌ No se pudieron leer los datos guardados", 3000)
+                return
             
-            # Mostrar mensaje de éxito
-            self.statusBar().showMessage("✅ Datos refrescados correctamente", 3000)
-            logger.info("Datos refrescados completamente por el usuario")
+            self.statusBar().showMessage(f"✅ Datos refrescados: {self._describir_cambios(resumen)}", 3000)
+            logger.info("Datos refrescados por el usuario")
             
         except Exception as e:
             logger.error(f"Error al refrescar datos: {e}")
@@ -2392,6 +2740,11 @@ class VentanaPrincipal(QMainWindow):
         
         dialog.exec()
     
+    def _mostrar_estadisticas(self) -> None:
+        """Muestra el panel de estadísticas."""
+        dialogo = DialogoEstadisticas(self.repositorio, self)
+        dialogo.exec()
+    
     def _mostrar_acerca_de(self) -> None:
         """Muestra el diálogo Acerca de."""
         dialogo = AboutDialog(self)
@@ -2436,6 +2789,15 @@ class VentanaPrincipal(QMainWindow):
                 event.accept()
             else:
                 event.ignore()
+        
+        if event.isAccepted():
+            if self._vigilante is not None:
+                self._vigilante.detener()
+            if self.timer_copias is not None:
+                self.timer_copias.stop()
+            if self._trabajador_copia is not None:
+                self._trabajador_copia.wait()
+            self.repositorio.cerrar()
     
     def _configurar_fondo_panel_categorias(self, widget_categorias: QWidget) -> None:
         """Configura el fondo del panel de categorías sin imagen."""
@@ -2515,29 +2877,27 @@ class VentanaPrincipal(QMainWindow):
     def _seleccionar_enlace_por_id(self, enlace_id: str):
         """Selecciona un enlace en la tabla por su ID"""
         try:
-            # Buscar el enlace en el modelo de tabla
-            for row in range(self.modelo_tabla.rowCount()):
-                enlace = self.modelo_tabla._enlaces[row]
-                if enlace.get('id') == enlace_id:
-                    # Seleccionar la fila en la tabla
-                    index = self.modelo_tabla.index(row, 0)
-                    self.tabla_enlaces.selectRow(row)
-                    self.tabla_enlaces.scrollTo(index)
-                    
-                    # Cambiar a la pestaña de enlaces si no está activa
-                    if hasattr(self, 'tabs_principales'):
-                        self.tabs_principales.setCurrentIndex(0)  # Pestaña de enlaces
-                    
-                    logger.info(f"Enlace seleccionado desde favoritos: {enlace.get('titulo')}")
-                    break
+            # Buscar el enlace en el modelo de tabla (cargando su página si hace falta)
+            row = self.modelo_tabla.obtener_fila_por_id(enlace_id, cargar=True)
+            if row >= 0:
+                enlace = self.modelo_tabla.obtener_enlace_por_fila(row)
+                # Seleccionar la fila en la tabla
+                index = self.modelo_tabla.index(row, 0)
+                self.tabla_enlaces.selectRow(row)
+                self.tabla_enlaces.scrollTo(index)
+                
+                # Cambiar a la pestaña de enlaces si no está activa
+                if hasattr(self, 'tabs_principales'):
+                    self.tabs_principales.setCurrentIndex(0)  # Pestaña de enlaces
+                
+                logger.info(f"Enlace seleccionado desde favoritos: {enlace.get('titulo')}")
         except Exception as e:
             logger.error(f"Error seleccionando enlace: {e}")
     
     def _on_favorito_eliminado(self, enlace_id: str):
         """Maneja cuando se elimina un favorito"""
         try:
-            # Refrescar la tabla para actualizar la columna de favoritos
-            self._actualizar_tabla_enlaces()
+            # La columna de favoritos ya se repintó con el evento del repositorio
             show_success_toast("⭐ Favorito eliminado")
             logger.info(f"Favorito eliminado: {enlace_id}")
         except Exception as e:
@@ -2561,11 +2921,6 @@ class VentanaPrincipal(QMainWindow):
             if nuevo_estado is not None:
                 self.repositorio.guardar()
                 
-                # Refrescar vistas
-                self._actualizar_tabla_enlaces()
-                if hasattr(self, 'widget_favoritos'):
-                    self.widget_favoritos.refrescar_favoritos()
-                
                 # Mostrar feedback
                 if nuevo_estado:
                     show_success_toast(f"⭐ {enlace_seleccionado.get('titulo', 'Enlace')} marcado como favorito")
@@ -2583,22 +2938,22 @@ class VentanaPrincipal(QMainWindow):
     def _mostrar_solo_favoritos(self):
         """Filtra para mostrar solo enlaces favoritos"""
         try:
-            favoritos = self.repositorio.obtener_favoritos()
+            filas = self.repositorio.filtrar_filas(FiltroEnlaces(solo_favoritos=True))
             
-            if not favoritos:
+            if len(filas) == 0:
                 show_info_toast("ℹ️ No hay favoritos para mostrar")
                 return
             
             # Aplicar filtro de favoritos
-            self.modelo_tabla.establecer_enlaces(favoritos)
+            self.campo_busqueda.clear()
+            self.busqueda_actual = ""
+            self.tag_filtro_actual = ""
+            self.categoria_filtro_actual = FILTRO_FAVORITOS
+            self._actualizar_tabla_enlaces()
             self._actualizar_informacion()
             
-            # Actualizar estado de UI
-            self.categoria_filtro_actual = "⭐ Favoritos"
-            self._actualizar_lista_categorias()
-            
-            show_info_toast(f"⭐ Mostrando {len(favoritos)} favoritos")
-            logger.info(f"Filtro de favoritos aplicado: {len(favoritos)} enlaces")
+            show_info_toast(f"⭐ Mostrando {len(filas)} favoritos")
+            logger.info(f"Filtro de favoritos aplicado: {len(filas)} enlaces")
             
         except Exception as e:
             logger.error(f"Error mostrando favoritos: {e}")
@@ -6,6 +6,8 @@ Widgets personalizados para TECH LINK VIEWER
 
 from .titlebar import TitleBar
 from .about_dialog import AboutDialog
+from .copias_dialog import DialogoCopias
+from .estadisticas_dialog import DialogoEstadisticas
 from .notes_widget import NotesWidget
 from .grupos_sn_widget import GruposSNWidget
 from .favoritos_widget import FavoritosWidget, FavoritoItemWidget  # ⭐ Nuevo widget de favoritos
@@ -16,7 +18,7 @@ from .toast_notification import (
 )
 
 __all__ = [
-    'TitleBar', 'AboutDialog', 'NotesWidget', 'GruposSNWidget',
+    'TitleBar', 'AboutDialog', 'DialogoCopias', 'DialogoEstadisticas', 'NotesWidget', 'GruposSNWidget',
     'FavoritosWidget', 'FavoritoItemWidget',  # ⭐ Nuevos widgets
     'ToastNotification', 'ToastManager', 'ToastType',
     'init_toast_system', 'show_success_toast', 'show_error_toast',
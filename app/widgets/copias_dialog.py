@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Selector de copias de seguridad de TECH LINK VIEWER
+Lista las generaciones guardadas y permite elegir una para restaurarla
+"""
+
+from typing import List, Optional
+
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+                             QTableWidget, QTableWidgetItem, QHeaderView)
+from PyQt6.QtCore import Qt
+
+from ..storage import CopiaSeguridad
+from ..theme.colors import Colors
+from ..theme.fonts import Fonts
+
+
+def _formatear_tamano(tamano: int) -> str:
+    """Tamaño legible en B, KB o MB."""
+    if tamano < 1024:
+        return f"{tamano} B"
+    if tamano < 1024 * 1024:
+        return f"{tamano / 1024:.1f} KB"
+    return f"{tamano / (1024 * 1024):.1f} MB"
+
+
+class DialogoCopias(QDialog):
+    """Diálogo para elegir la copia de seguridad a restaurar"""
+
+    def __init__(self, copias: List[CopiaSeguridad], parent=None):
+        super().__init__(parent)
+        # La lista sale de los nombres de archivo: abrir el diálogo no descomprime nada
+        self.copias = copias
+        self.setWindowTitle("🗄️ Copias de seguridad")
+        self.setModal(True)
+        self.setMinimumSize(560, 420)
+        self.setFont(Fonts.get_monospace_font(Fonts.SIZE_NORMAL))
+        self.setStyleSheet(f"""
+            QDialog {{
+                background-color: {Colors.BG0};
+            }}
+            QLabel {{
+                color: {Colors.FG};
+            }}
+        """)
+
+        self._crear_interfaz()
+
+    def _crear_interfaz(self) -> None:
+        """Crea la tabla de copias y los botones."""
+        layout = QVBoxLayout(self)
+        layout.setSpacing(10)
+
+        if self.copias:
+            texto = f"{len(self.copias)} copias guardadas. Elige la que quieres restaurar:"
+        else:
+            texto = "Todavía no hay copias de seguridad."
+        layout.addWidget(QLabel(texto))
+
+        self.tabla = QTableWidget(len(self.copias), 3)
+        self.tabla.setHorizontalHeaderLabels(["Fecha", "Tamaño", "Contenido"])
+        self.tabla.verticalHeader().setVisible(False)
+        self.tabla.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.tabla.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.tabla.setSelectionMode(QTableWidget.SelectionMode.SingleSelection)
+        self.tabla.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        self.tabla.horizontalHeader().setStretchLastSection(True)
+        for fila, copia in enumerate(self.copias):
+            tamano = QTableWidgetItem(_formatear_tamano(copia.tamano))
+            tamano.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+            self.tabla.setItem(fila, 0, QTableWidgetItem(copia.fecha.strftime("%Y-%m-%d %H:%M:%S")))
+            self.tabla.setItem(fila, 1, tamano)
+            self.tabla.setItem(fila, 2, QTableWidgetItem(copia.hash))
+        self.tabla.itemSelectionChanged.connect(self._al_cambiar_seleccion)
+        self.tabla.doubleClicked.connect(self.accept)
+        layout.addWidget(self.tabla)
+
+        layout_botones = QHBoxLayout()
+        layout_botones.addStretch()
+        self.boton_restaurar = QPushButton("Restaurar")
+        self.boton_restaurar.setEnabled(False)
+        self.boton_restaurar.clicked.connect(self.accept)
+        boton_cancelar = QPushButton("Cancelar")
+        boton_cancelar.clicked.connect(self.reject)
+        layout_botones.addWidget(self.boton_restaurar)
+        layout_botones.addWidget(boton_cancelar)
+        layout.addLayout(layout_botones)
+
+    def _al_cambiar_seleccion(self) -> None:
+        self.boton_restaurar.setEnabled(self.copia_seleccionada() is not None)
+
+    def copia_seleccionada(self) -> Optional[CopiaSeguridad]:
+        """
+        Obtiene la copia elegida.
+
+        Returns:
+            La copia seleccionada o None si no hay ninguna
+        """
+        filas = self.tabla.selectionModel().selectedRows()
+        return self.copias[filas[0].row()] if filas else None
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Panel de estadísticas de TECH LINK VIEWER
+Resumen, tags más usados y enlaces creados por mes
+"""
+
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+                             QTableWidget, QTableWidgetItem, QHeaderView, QGroupBox)
+from PyQt6.QtCore import Qt
+
+from ..theme.colors import Colors
+from ..theme.fonts import Fonts
+
+
+# Número de tags del ranking
+CANTIDAD_TAGS = 20
+# Ancho máximo (en caracteres) de las barras por mes
+ANCHO_BARRA = 30
+
+
+class DialogoEstadisticas(QDialog):
+    """Diálogo con las estadísticas agregadas del repositorio"""
+
+    def __init__(self, repositorio, parent=None):
+        super().__init__(parent)
+        self.repositorio = repositorio
+        self.setWindowTitle("📈 Estadísticas")
+        self.setModal(True)
+        self.setMinimumSize(640, 520)
+        self.setFont(Fonts.get_monospace_font(Fonts.SIZE_NORMAL))
+        self.setStyleSheet(f"""
+            QDialog {{
+                background-color: {Colors.BG0};
+            }}
+            QGroupBox {{
+                color: {Colors.ACCENT_CYAN};
+                border: 1px solid {Colors.BORDER_LIGHT};
+                border-radius: 4px;
+                margin-top: 12px;
+                padding-top: 8px;
+                font-weight: bold;
+            }}
+            QGroupBox::title {{
+                subcontrol-origin: margin;
+                left: 8px;
+            }}
+            QLabel {{
+                color: {Colors.FG};
+            }}
+        """)
+
+        self._crear_interfaz()
+        self._actualizar()
+        # Las cifras siguen al repositorio mientras el panel está abierto
+        self.repositorio.suscribir(self._al_cambiar_repositorio)
+
+    def _crear_interfaz(self) -> None:
+        """Crea el resumen y las dos tablas."""
+        layout = QVBoxLayout(self)
+        layout.setSpacing(10)
+
+        self.label_resumen = QLabel()
+        self.label_resumen.setFont(Fonts.get_monospace_font(Fonts.SIZE_MEDIUM, bold=True))
+        layout.addWidget(self.label_resumen)
+
+        layout_tablas = QHBoxLayout()
+
+        grupo_tags = QGroupBox(f"🏷️ Top {CANTIDAD_TAGS} tags")
+        layout_tags = QVBoxLayout(grupo_tags)
+        self.tabla_tags = self._crear_tabla(["Tag", "Enlaces"])
+        layout_tags.addWidget(self.tabla_tags)
+        layout_tablas.addWidget(grupo_tags)
+
+        grupo_meses = QGroupBox("📅 Enlaces por mes")
+        layout_meses = QVBoxLayout(grupo_meses)
+        self.tabla_meses = self._crear_tabla(["Mes", "Enlaces", ""])
+        layout_meses.addWidget(self.tabla_meses)
+        layout_tablas.addWidget(grupo_meses, 1)
+
+        layout.addLayout(layout_tablas)
+
+        boton_cerrar = QPushButton("Cerrar")
+        boton_cerrar.clicked.connect(self.accept)
+        layout.addWidget(boton_cerrar, alignment=Qt.AlignmentFlag.AlignRight)
+
+    def _crear_tabla(self, cabeceras: list) -> QTableWidget:
+        """Crea una tabla de solo lectura con las cabeceras indicadas."""
+        tabla = QTableWidget(0, len(cabeceras))
+        tabla.setHorizontalHeaderLabels(cabeceras)
+        tabla.verticalHeader().setVisible(False)
+        tabla.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        tabla.setSelectionMode(QTableWidget.SelectionMode.NoSelection)
+        tabla.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        tabla.horizontalHeader().setStretchLastSection(True)
+        return tabla
+
+    def _llenar_tabla(self, tabla: QTableWidget, filas: list) -> None:
+        """Reemplaza el contenido de una tabla por las filas indicadas."""
+        tabla.setRowCount(len(filas))
+        for numero_fila, fila in enumerate(filas):
+            for columna, valor in enumerate(fila):
+                item = QTableWidgetItem(str(valor))
+                if isinstance(valor, int):
+                    item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                tabla.setItem(numero_fila, columna, item)
+
+    def _actualizar(self) -> None:
+        """Lee los contadores agregados del repositorio (sin recorrer los enlaces)."""
+        estadisticas = self.repositorio.obtener_estadisticas()
+        self.label_resumen.setText(
+            f"🔗 {estadisticas['total_enlaces']} enlaces   "
+            f"⭐ {estadisticas['total_favoritos']} favoritos   "
+            f"📁 {estadisticas['total_categorias']} categorías   "
+            f"🏷️ {estadisticas['total_tags_unicos']} tags"
+        )
+
+        self._llenar_tabla(self.tabla_tags, self.repositorio.obtener_tags_frecuentes(CANTIDAD_TAGS))
+
+        meses = self.repositorio.obtener_enlaces_por_mes()
+        maximo = max((cantidad for _, cantidad in meses), default=0)
+        self._llenar_tabla(self.tabla_meses, [
+            (mes, cantidad, "█" * max(1, round(ANCHO_BARRA * cantidad / maximo)))
+            for mes, cantidad in reversed(meses)  # Los más recientes primero
+        ])
+
+    def _al_cambiar_repositorio(self, evento) -> None:
+        """Refresca el panel tras cualquier cambio."""
+        self._actualizar()
+
+    def done(self, resultado: int) -> None:
+        """Deja de escuchar al repositorio al cerrar."""
+        self.repositorio.desuscribir(self._al_cambiar_repositorio)
+        super().done(resultado)
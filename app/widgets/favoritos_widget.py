@@ -174,10 +174,19 @@ class FavoritosWidget(QWidget):
         """)
     
     def set_repositorio(self, repositorio):
-        """Asigna el repositorio de datos"""
+        """Asigna el repositorio de datos y se suscribe a sus cambios"""
+        if self.repositorio:
+            self.repositorio.desuscribir(self._al_cambiar_repositorio)
         self.repositorio = repositorio
+        self.repositorio.suscribir(self._al_cambiar_repositorio)
         self.refrescar_favoritos()
     
+    def _al_cambiar_repositorio(self, evento):
+        """Refresca la lista solo si el cambio afecta a algún favorito"""
+        ids_mostrados = {enlace.get('id') for enlace in self.favoritos_data}
+        if evento.recarga or evento.favoritos or not ids_mostrados.isdisjoint(evento.actualizados):
+            self.refrescar_favoritos()
+    
     def refrescar_favoritos(self):
         """Refresca la lista de favoritos"""
         if not self.repositorio:
@@ -225,7 +234,6 @@ class FavoritosWidget(QWidget):
         if self.repositorio:
             if self.repositorio.desmarcar_favorito(enlace_id):
                 self.repositorio.guardar()
-                self.refrescar_favoritos()
                 self.favorito_eliminado.emit(enlace_id)
                 logger.info(f"Favorito eliminado: {enlace_id}")
     
@@ -253,13 +261,13 @@ class FavoritosWidget(QWidget):
             return
         
         count = 0
-        for enlace in self.favoritos_data:
-            if self.repositorio.desmarcar_favorito(enlace['id']):
-                count += 1
+        # Un único evento, un único refresco y un único guardado
+        with self.repositorio.transaccion():
+            for enlace in self.favoritos_data:
+                if self.repositorio.desmarcar_favorito(enlace['id']):
+                    count += 1
         
         if count > 0:
-            self.repositorio.guardar()
-            self.refrescar_favoritos()
             logger.info(f"Limpiados {count} favoritos")
 
 
@@ -19,7 +19,7 @@ from PyQt6.QtCore import Qt, pyqtSignal, QTimer
 from PyQt6.QtGui import QFont, QTextCharFormat, QColor, QAction
 
 from ..theme import Colors, Fonts, get_icon
-from ..utils.io import cargar_json, guardar_json
+from ..storage import BackendJSON
 from ..config import (
     obtener_config_notas, obtener_color_scheme, obtener_typography, 
     obtener_spacing, obtener_elevation, get_color, get_font_size, 
@@ -41,6 +41,7 @@ class NotesWidget(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.notas_archivo = Path("data/notas.json")
+        self._almacen = BackendJSON(self.notas_archivo, usar_snapshot=False)
         self.notas_data = {}
         self.nota_actual = None
         self.auto_save_timer = QTimer()
@@ -400,7 +401,7 @@ class NotesWidget(QWidget):
         """Carga las notas desde el archivo JSON"""
         try:
             if self.notas_archivo.exists():
-                self.notas_data = cargar_json(self.notas_archivo)
+                self.notas_data = self._almacen.cargar() or {}
             else:
                 self.notas_data = {}
                 # Crear nota de bienvenida
@@ -754,11 +755,8 @@ Desarrollado por Antware con ❤️ y ☕""",
     def _guardar_notas(self):
         """Guarda las notas en el archivo JSON"""
         try:
-            # Asegurar que el directorio existe
-            self.notas_archivo.parent.mkdir(exist_ok=True)
-            
-            # Guardar con formato legible
-            guardar_json(self.notas_data, self.notas_archivo)
+            # Guardar con formato legible (el backend crea el directorio si no existe)
+            self._almacen.persistir(self.notas_data)
             
         except Exception as e:
             logger.error(f"Error guardando notas: {e}")
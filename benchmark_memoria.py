@@ -0,0 +1,88 @@
+"""
+Mide la memoria de los enlaces como diccionarios frente a EnlaceCompacto.
+
+Genera un documento sintético con el formato de links.json, lo decodifica
+como lo haría la aplicación al cargar y compara la memoria retenida por la
+lista de diccionarios con la de la lista de enlaces compactos.
+
+Uso:
+    python benchmark_memoria.py [numero_de_enlaces]
+"""
+import gc
+import json
+import random
+import sys
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta
+from app.models.enlace import compactar_enlaces
+from app.models.migraciones import VERSION_ACTUAL
+
+
+CATEGORIAS = [f"Categoría {i}" for i in range(40)]
+TAGS = [f"tag{i}" for i in range(500)]
+
+
+def generar_documento(total: int) -> bytes:
+    """Genera un links.json sintético con el número de enlaces indicado."""
+    aleatorio = random.Random(42)
+    inicio = datetime(2020, 1, 1)
+    enlaces = []
+    for i in range(total):
+        creado = inicio + timedelta(seconds=aleatorio.randrange(150_000_000), microseconds=aleatorio.randrange(1_000_000))
+        enlaces.append({
+            "id": str(uuid.UUID(int=aleatorio.getrandbits(128), version=4)),
+            "titulo": f"Enlace de prueba número {i}",
+            "url": f"https://ejemplo{i % 1000}.com/ruta/{i}",
+            "categoria": aleatorio.choice(CATEGORIAS),
+            "tags": aleatorio.sample(TAGS, aleatorio.randint(1, 5)),
+            "es_favorito": aleatorio.random() < 0.05,
+            "creado_en": creado.isoformat(),
+            "actualizado_en": (creado + timedelta(days=aleatorio.randrange(30))).isoformat(),
+        })
+    documento = {"version": VERSION_ACTUAL, "categorias": CATEGORIAS, "links": enlaces}
+    return json.dumps(documento, ensure_ascii=False).encode('utf-8')
+
+
+def medir(funcion):
+    """Ejecuta una función y devuelve (resultado, bytes que sigue reteniendo)."""
+    gc.collect()
+    tracemalloc.start()
+    resultado = funcion()
+    gc.collect()
+    retenido, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return resultado, retenido
+
+
+def main():
+    """Ejecuta la comparación."""
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    contenido = generar_documento(total)
+    print(f"📦 {total} enlaces, {len(contenido) / 1e6:.1f} MB de JSON")
+
+    diccionarios, memoria_dict = medir(lambda: json.loads(contenido)['links'])
+    del diccionarios
+    # Los diccionarios intermedios se liberan: queda lo que retiene la aplicación
+    compactos, memoria_compacta = medir(lambda: compactar_enlaces(json.loads(contenido)['links']))
+    assert len(compactos) == total
+    del compactos
+
+    # Tiempos sin tracemalloc, que ralentiza mucho las asignaciones
+    inicio = time.perf_counter()
+    diccionarios = json.loads(contenido)['links']
+    segundos_json = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    compactar_enlaces(diccionarios)
+    segundos_compactar = time.perf_counter() - inicio
+
+    print(f"Diccionarios:      {memoria_dict / 1e6:8.1f} MB  ({memoria_dict / total:6.0f} B/enlace, "
+          f"json.loads {segundos_json:.2f} s)")
+    print(f"EnlaceCompacto:    {memoria_compacta / 1e6:8.1f} MB  ({memoria_compacta / total:6.0f} B/enlace, "
+          f"+ compactar {segundos_compactar:.2f} s)")
+    print(f"✅ Reducción: {100 * (1 - memoria_compacta / memoria_dict):.0f}%")
+
+
+if __name__ == "__main__":
+    main()
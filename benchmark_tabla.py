@@ -0,0 +1,103 @@
+"""
+Mide el coste de pintar la tabla de enlaces.
+
+Muestra en una QTableView fuera de pantalla un conjunto sintético de enlaces
+(el mismo generador que benchmark_memoria.py), la desplaza página a página y
+cuenta las llamadas a data() y el tiempo de cada fotograma. Después repite las
+llamadas de un fotograma directamente sobre el modelo y mide la memoria que
+reservan en Python, que con las fuentes, pinceles y textos compartidos debe
+quedarse en cero.
+
+Uso:
+    QT_QPA_PLATFORM=offscreen python benchmark_tabla.py [numero_de_enlaces] [fotogramas]
+"""
+import json
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QApplication, QTableView
+from app.models.enlace import compactar_enlaces
+from app.models.link_model import ModeloTablaEnlaces
+from benchmark_memoria import generar_documento
+
+
+class ModeloContado(ModeloTablaEnlaces):
+    """Modelo que cuenta las llamadas a data() por rol."""
+
+    def __init__(self):
+        super().__init__()
+        self.llamadas = Counter()
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        self.llamadas[role] += 1
+        return super().data(index, role)
+
+
+def pintar_fotogramas(vista: QTableView, modelo: ModeloContado, fotogramas: int) -> float:
+    """Desplaza la vista una página por fotograma y la pinta; devuelve los segundos."""
+    barra = vista.verticalScrollBar()
+    paso = max(1, barra.pageStep())
+    inicio = time.perf_counter()
+    for fotograma in range(fotogramas):
+        barra.setValue(fotograma * paso % max(1, barra.maximum()))
+        vista.viewport().grab()
+    return time.perf_counter() - inicio
+
+
+def medir_reservas(modelo: ModeloTablaEnlaces, celdas: list, roles: list) -> int:
+    """Bytes de Python reservados (pico) al pedir los roles de unas celdas ya vistas."""
+    for indice in celdas:
+        for rol in roles:
+            modelo.data(indice, rol)
+    tracemalloc.start()
+    base, _ = tracemalloc.get_traced_memory()
+    for indice in celdas:
+        for rol in roles:
+            modelo.data(indice, rol)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return pico - base
+
+
+def main():
+    """Ejecuta la medición."""
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    fotogramas = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    aplicacion = QApplication.instance() or QApplication(sys.argv)
+
+    enlaces = compactar_enlaces(json.loads(generar_documento(total))['links'])
+    modelo = ModeloContado()
+    modelo.actualizar_enlaces(enlaces)
+    vista = QTableView()
+    vista.setModel(modelo)
+    vista.resize(1200, 800)
+    vista.show()
+    aplicacion.processEvents()
+
+    # Primer recorrido: se calculan los textos de cada fila
+    modelo.llamadas.clear()
+    frio = pintar_fotogramas(vista, modelo, fotogramas)
+    llamadas = sum(modelo.llamadas.values())
+    # Segundo recorrido por las mismas filas: todo sale de las cachés
+    caliente = pintar_fotogramas(vista, modelo, fotogramas)
+
+    print(f"Enlaces: {total:,}  fotogramas: {fotogramas}")
+    print(f"Llamadas a data(): {llamadas / fotogramas:,.0f} por fotograma")
+    for rol, cantidad in modelo.llamadas.most_common():
+        print(f"  {Qt.ItemDataRole(rol).name:<24} {cantidad / (2 * fotogramas):,.0f}")
+    print(f"Fotograma (primera vez): {frio / fotogramas * 1000:.2f} ms")
+    print(f"Fotograma (ya visto):    {caliente / fotogramas * 1000:.2f} ms")
+
+    # Sin el contador, que también reserva memoria
+    roles = list(modelo.llamadas)
+    directo = ModeloTablaEnlaces()
+    directo.actualizar_enlaces(enlaces)
+    celdas = [directo.index(fila, columna)
+              for fila in range(min(40, total)) for columna in range(directo.columnCount())]
+    print(f"Memoria reservada al repetir un fotograma: {medir_reservas(directo, celdas, roles):,} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+"""
+Pruebas de los backends de almacenamiento de TLV 4.0.
+"""
+import json
+import pickle
+import shutil
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+from app.models.repository import RepositorioEnlaces
+from app.storage import AlmacenCopias, BackendAlmacenamiento, BackendJSON
+from app.storage.copias import CopiaSeguridad, seleccionar_conservadas
+from app.storage.snapshot import CABECERA_SNAPSHOT, calcular_hash, leer_snapshot
+from app.storage.sqlite_backend import BackendSQLite, migrar_json_a_sqlite, exportar_sqlite_a_json
+from app.utils.io import cargar_json
+
+
+RUTA_DATOS = Path("data/links.json")
+
+
+def _directorio_temporal() -> Path:
+    """Crea un directorio temporal con una copia de links.json."""
+    directorio = Path(tempfile.mkdtemp(prefix="tlv_test_"))
+    shutil.copy(RUTA_DATOS, directorio / "links.json")
+    return directorio
+
+
+def test_backend_abstracto():
+    """Un backend sin cargar o persistir no se puede instanciar."""
+    print("=== Prueba Backend Abstracto ===")
+
+    class SoloCarga(BackendAlmacenamiento):
+        def cargar(self):
+            return None
+
+    for clase in (BackendAlmacenamiento, SoloCarga):
+        try:
+            clase(Path("links.json"))
+            assert False, f"{clase.__name__} no debe poder instanciarse"
+        except TypeError:
+            pass
+
+
+def test_sqlite_migracion_ida_y_vuelta():
+    """Migra links.json a SQLite y lo vuelve a exportar sin perder enlaces."""
+    print("=== Prueba Migración JSON <-> SQLite ===")
+    directorio = _directorio_temporal()
+    try:
+        original = cargar_json(directorio / "links.json")
+        assert migrar_json_a_sqlite(directorio / "links.json", directorio / "links.db")
+        assert exportar_sqlite_a_json(directorio / "links.db", directorio / "exportado.json")
+
+        exportado = cargar_json(directorio / "exportado.json")
+        ids_original = [enlace['id'] for enlace in original['links']]
+        ids_exportado = [enlace['id'] for enlace in exportado['links']]
+        assert ids_original == ids_exportado
+        print(f"Enlaces migrados y exportados: {len(ids_exportado)}")
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+
+
+def test_sqlite_persistencia_incremental():
+    """Agrega, actualiza y elimina enlaces y comprueba que persisten."""
+    print("=== Prueba Persistencia SQLite ===")
+    directorio = _directorio_temporal()
+    try:
+        repo = RepositorioEnlaces(directorio / "links.db", BackendSQLite(directorio / "links.db"))
+        enlace_id = repo.agregar_enlace("Ejemplo", "https://ejemplo.org", "Pruebas", ["uno", "dos"])
+        assert enlace_id and repo.guardar()
+
+        assert repo.actualizar_enlace(enlace_id, "Ejemplo 2", "https://ejemplo.org", "Pruebas", ["tres"])
+        primero = repo.obtener_enlaces()[0]['id']
+        assert repo.eliminar_enlace(primero)
+        assert repo.guardar()
+        repo._backend.cerrar()
+
+        recargado = RepositorioEnlaces(directorio / "links.db", BackendSQLite(directorio / "links.db"))
+        enlace = recargado.obtener_enlace_por_id(enlace_id)
+        assert enlace['titulo'] == "Ejemplo 2"
+        assert enlace['tags'] == ["tres"]
+        assert recargado.obtener_enlace_por_id(primero) is None
+        assert "Pruebas" in recargado.obtener_categorias()
+        recargado._backend.cerrar()
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+
+
+def test_sqlite_busqueda_fts():
+    """La búsqueda FTS devuelve los mismos mejores resultados que la búsqueda en memoria."""
+    print("=== Prueba Búsqueda FTS ===")
+    directorio = _directorio_temporal()
+    try:
+        migrar_json_a_sqlite(directorio / "links.json", directorio / "links.db")
+        repo_json = RepositorioEnlaces(directorio / "links.json", BackendJSON(directorio / "links.json"))
+        repo_sqlite = RepositorioEnlaces(directorio / "links.db", BackendSQLite(directorio / "links.db"))
+
+        for termino in ("github", "google", "gogle"):
+            mejor_json = repo_json.buscar_enlaces(termino)[0][0]['id']
+            mejor_sqlite = repo_sqlite.buscar_enlaces(termino)[0][0]['id']
+            assert mejor_json == mejor_sqlite
+            print(f"'{termino}' -> {mejor_sqlite}")
+        repo_sqlite._backend.cerrar()
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+
+
+def test_sqlite_sin_guardar_no_persiste():
+    """Las mutaciones solo se hacen persistentes al guardar."""
+    print("=== Prueba Confirmación SQLite ===")
+    directorio = _directorio_temporal()
+    try:
+        migrar_json_a_sqlite(directorio / "links.json", directorio / "links.db")
+        repo = RepositorioEnlaces(directorio / "links.db", BackendSQLite(directorio / "links.db"))
+        total = len(repo.obtener_enlaces())
+        repo.agregar_enlace("Temporal", "https://temporal.example", "Pruebas", [])
+        repo._backend.cerrar()
+
+        recargado = BackendSQLite(directorio / "links.db")
+        assert len(recargado.cargar()['links']) == total
+        recargado.cerrar()
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+
+
+def test_snapshot_binario():
+    """La instantánea se usa mientras el JSON no cambie y se descarta si cambia."""
+    print("=== Prueba Instantánea Binaria ===")
+    directorio = _directorio_temporal()
+    try:
+        ruta = directorio / "links.json"
+        repo = RepositorioEnlaces(ruta, BackendJSON(ruta))
+        assert not repo._backend.carga_validada
+        assert (directorio / "links.json.snap").exists()
+
+        recargado = RepositorioEnlaces(ruta, BackendJSON(ruta))
+        assert recargado._backend.carga_validada
+        assert recargado.obtener_enlaces() == repo.obtener_enlaces()
+
+        # Una edición externa del JSON invalida la instantánea
+        datos = cargar_json(ruta)
+        datos['links'][0]['titulo'] = "Editado fuera"
+        ruta.write_text(json.dumps(datos), encoding='utf-8')
+        externo = RepositorioEnlaces(ruta, BackendJSON(ruta))
+        assert not externo._backend.carga_validada
+        assert externo.obtener_enlaces()[0]['titulo'] == "Editado fuera"
+
+        # Guardar no reescribe la instantánea; se escribe una vez al cerrar
+        snap = directorio / "links.json.snap"
+        enlace_id = externo.obtener_enlaces()[0]['id']
+        externo.alternar_favorito(enlace_id)
+        assert externo.guardar() and not snap.exists()
+        externo.alternar_favorito(enlace_id)
+        assert externo.guardar() and not snap.exists()
+        externo.cerrar()
+        assert snap.exists()
+        cerrado = RepositorioEnlaces(ruta, BackendJSON(ruta))
+        assert cerrado._backend.carga_validada
+        assert cerrado.obtener_enlaces() == externo.obtener_enlaces()
+
+        # Con cambios sin guardar la instantánea no se escribe
+        cerrado.alternar_favorito(enlace_id)
+        cerrado.guardar()
+        cerrado.alternar_favorito(enlace_id)
+        cerrado.cerrar()
+        assert not snap.exists()
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+
+
+class _Inyeccion:
+    """Objeto que al deserializarse ejecutaría una función arbitraria."""
+
+    def __reduce__(self):
+        return (shutil.rmtree, ("no_existe",))
+
+
+def test_snapshot_manipulado():
+    """Una instantánea con la cabecera correcta pero otros globales se ignora."""
+    print("=== Prueba Instantánea Manipulada ===")
+    directorio = _directorio_temporal()
+    try:
+        ruta = directorio / "links.json"
+        hash_json = calcular_hash(ruta.read_bytes())
+        snap = directorio / "links.json.snap"
+        for carga in ({'links': [_Inyeccion()]}, {'links': [], 'x': print}):
+            snap.write_bytes(CABECERA_SNAPSHOT + hash_json + pickle.dumps(carga, protocol=5))
+            assert leer_snapshot(snap, hash_json) is None
+            repo = RepositorioEnlaces(ruta, BackendJSON(ruta))
+            assert not repo._backend.carga_validada
+            assert len(repo.obtener_enlaces()) == len(cargar_json(ruta)['links'])
+        # La instantánea legítima que escribe la carga se sigue leyendo
+        assert leer_snapshot(snap, calcular_hash(ruta.read_bytes())) is not None
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+
+
+def test_copias_seguridad():
+    """Copias deduplicadas, retención por periodos y restauración."""
+    print("=== Prueba Copias de Seguridad ===")
+    directorio = _directorio_temporal()
+    try:
+        ruta = directorio / "links.json"
+        original = ruta.read_bytes()
+        almacen = AlmacenCopias(directorio / "copias", ruta.name, 'lzma')
+        primera = almacen.crear_copia(ruta)
+        # Sin cambios en el contenido no se crea otra generación
+        assert almacen.crear_copia(ruta) == primera and len(almacen.listar()) == 1
+
+        ruta.write_bytes(b'{"version": 1, "categorias": [], "links": []}')
+        segunda = almacen.crear_copia(ruta)
+        assert segunda.hash != primera.hash and almacen.listar() == [segunda, primera]
+
+        assert almacen.restaurar(primera, ruta)
+        assert ruta.read_bytes() == original
+
+        # Las 3 últimas y la más reciente de cada una de las 2 últimas horas y días
+        inicio = datetime(2024, 1, 10, 12, 0)
+        copias = [CopiaSeguridad(Path(str(minutos)), inicio - timedelta(minutes=minutos), '', 0)
+                  for minutos in range(0, 3 * 24 * 60, 30)]
+        conservadas = seleccionar_conservadas(copias, {'ultimas': 3, 'horarias': 2, 'diarias': 2})
+        assert conservadas == {Path('0'), Path('30'), Path('60'), Path('750')}
+        print(f"Copias: {[copia.ruta.name for copia in almacen.listar()]}")
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+
+
+def main():
+    """Ejecuta todas las pruebas."""
+    print("🧪 Ejecutando pruebas de almacenamiento")
+    print("=" * 40)
+
+    test_backend_abstracto()
+    test_sqlite_migracion_ida_y_vuelta()
+    test_sqlite_persistencia_incremental()
+    test_sqlite_busqueda_fts()
+    test_sqlite_sin_guardar_no_persiste()
+    test_snapshot_binario()
+    test_snapshot_manipulado()
+    test_copias_seguridad()
+
+    print("✅ Todas las pruebas completadas")
+
+
+if __name__ == "__main__":
+    main()
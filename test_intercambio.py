@@ -0,0 +1,273 @@
+"""
+Pruebas de importación y exportación en streaming de TLV 4.0.
+"""
+import csv
+import json
+import shutil
+import sqlite3
+import tempfile
+from pathlib import Path
+from app.intercambio import (
+    LectorEnlaces, SesionImportacion, normalizar_en_lotes, exportar_enlaces, abrir_lector,
+    LectorMarcadoresHTML, LectorMarcadoresChromium, LectorMarcadoresFirefox, FORMATO_NDJSON
+)
+from app.models.repository import RepositorioEnlaces
+from app.storage import BackendJSON
+from app.storage.sqlite_backend import BackendSQLite, migrar_json_a_sqlite
+from app.utils.io import cargar_json
+
+
+RUTA_DATOS = Path("data/links.json")
+
+
+def _directorio_temporal() -> Path:
+    """Crea un directorio temporal con una copia de links.json."""
+    directorio = Path(tempfile.mkdtemp(prefix="tlv_test_"))
+    shutil.copy(RUTA_DATOS, directorio / "links.json")
+    return directorio
+
+
+def test_lector_documento_por_bloques():
+    """El lector incremental devuelve los mismos enlaces que json.load aunque el bloque sea mínimo."""
+    print("=== Prueba Lector JSON Incremental ===")
+    original = cargar_json(RUTA_DATOS)
+    lector = LectorEnlaces(RUTA_DATOS, tamano_bloque=7)
+    enlaces = list(lector)
+
+    assert enlaces == original['links']
+    assert lector.categorias == original['categorias']
+    assert lector.progreso == 100
+    print(f"Enlaces leídos: {len(enlaces)}")
+
+
+def test_importar_ndjson_en_lotes():
+    """Importa NDJSON por lotes omitiendo duplicados y registros inválidos."""
+    print("=== Prueba Importación NDJSON ===")
+    directorio = _directorio_temporal()
+    try:
+        repo = RepositorioEnlaces(directorio / "links.json", BackendJSON(directorio / "links.json"))
+        existente = repo.obtener_enlaces()[0]
+        total = len(repo.obtener_enlaces())
+
+        ruta = directorio / "externo.ndjson"
+        with open(ruta, 'w', encoding='utf-8') as archivo:
+            archivo.write(json.dumps({"url": existente["url"] + "/"}) + "\n")
+            archivo.write("esto no es json\n")
+            archivo.write(json.dumps({"titulo": "Sin URL"}) + "\n")
+            for i in range(25):
+                archivo.write(json.dumps({"titulo": f"Nuevo {i}", "url": f"nuevo{i}.example.com",
+                                          "categoria": "Importados", "tags": "uno, Dos"}) + "\n")
+
+        lector = LectorEnlaces(ruta)
+        assert lector.formato == FORMATO_NDJSON
+
+        sesion = SesionImportacion(repo)
+        estadisticas = {}
+        for lote in normalizar_en_lotes(lector, tamano_lote=10, estadisticas=estadisticas,
+                                        timestamp_actual=sesion.timestamp):
+            assert len(lote) <= 10
+            sesion.incorporar(lote)
+
+        assert sesion.resumen() == {'agregados': 25, 'actualizados': 0, 'omitidos': 1}
+        assert estadisticas['invalidos'] == 1 and lector.lineas_invalidas == 1
+        assert len(repo.obtener_enlaces()) == total + 25
+        assert "Importados" in repo.obtener_categorias()
+        assert repo.obtener_enlaces()[-1]['tags'] == ["uno", "dos"]
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+
+
+def test_cancelar_importacion_sqlite():
+    """Cancelar una importación descarta los lotes ya escritos en la transacción de SQLite."""
+    print("=== Prueba Cancelar Importación SQLite ===")
+    directorio = _directorio_temporal()
+    try:
+        ruta_db = directorio / "links.db"
+        assert migrar_json_a_sqlite(directorio / "links.json", ruta_db)
+        repo = RepositorioEnlaces(ruta_db, BackendSQLite(ruta_db))
+        total = len(repo.obtener_enlaces())
+
+        sesion = SesionImportacion(repo)
+        sesion.incorporar([{"id": "importado-1", "titulo": "Importado", "url": "https://importado.example.com",
+                            "categoria": "Importados", "tags": [], "creado_en": sesion.timestamp,
+                            "actualizado_en": sesion.timestamp}])
+        assert len(repo.obtener_enlaces()) == total + 1
+
+        # Cancelar y guardar otro cambio no debe confirmar el lote descartado
+        assert repo.descartar_cambios()
+        assert len(repo.obtener_enlaces()) == total
+        assert repo.agregar_enlace("Después", "https://despues.example.com", "General", [])
+        assert repo.guardar()
+        repo._backend.cerrar()
+
+        recargado = RepositorioEnlaces(ruta_db, BackendSQLite(ruta_db))
+        urls = {enlace['url'] for enlace in recargado.obtener_enlaces()}
+        assert len(urls) == total + 1 and "https://importado.example.com" not in urls
+        recargado._backend.cerrar()
+        print(f"Enlaces tras cancelar: {len(urls)}")
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+
+
+def test_fusionar_datos():
+    """La fusión actualiza por última escritura, une tags y agrega los nuevos."""
+    print("=== Prueba Fusión de Importación ===")
+    directorio = _directorio_temporal()
+    try:
+        repo = RepositorioEnlaces(directorio / "links.json", BackendJSON(directorio / "links.json"))
+        primero, segundo = (dict(enlace) for enlace in repo.obtener_enlaces()[:2])
+        total = len(repo.obtener_enlaces())
+
+        reciente = dict(primero, titulo="Título nuevo", tags=["extra"],
+                        actualizado_en="2999-01-01T00:00:00")
+        antiguo = dict(segundo, id="otro-id", titulo="Título viejo",
+                       actualizado_en="2000-01-01T00:00:00")
+        nuevo = {"id": "nuevo-id", "titulo": "Nuevo", "url": "https://nuevo.example.com",
+                 "categoria": "Fusionados", "tags": [], "creado_en": "2024-01-01T00:00:00",
+                 "actualizado_en": "2024-01-01T00:00:00"}
+        datos = {"version": 1, "categorias": ["Fusionados"], "links": [reciente, antiguo, nuevo]}
+
+        resultado = repo.fusionar_datos(datos)
+        assert resultado == {'agregados': 1, 'actualizados': 1, 'omitidos': 1, 'invalidos': 0}
+        assert len(repo.obtener_enlaces()) == total + 1
+
+        fusionado = repo.obtener_enlace_por_id(primero['id'])
+        assert fusionado['titulo'] == "Título nuevo"
+        assert fusionado['tags'] == primero['tags'] + ["extra"]
+        assert repo.obtener_enlace_por_id(segundo['id'])['titulo'] == segundo['titulo']
+        assert "Fusionados" in repo.obtener_categorias()
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+
+
+def test_exportar_formatos():
+    """Las exportaciones JSON y NDJSON se releen igual; CSV y HTML tienen un registro por enlace."""
+    print("=== Prueba Exportación en Streaming ===")
+    directorio = Path(tempfile.mkdtemp(prefix="tlv_test_"))
+    try:
+        datos = cargar_json(RUTA_DATOS)
+        enlaces = datos['links']
+        progresos = []
+
+        for nombre in ("exportado.json", "exportado.ndjson"):
+            total = exportar_enlaces(enlaces, directorio / nombre, categorias=datos['categorias'],
+                                     progreso=lambda hechos, total: progresos.append(hechos))
+            assert total == len(enlaces)
+            assert list(LectorEnlaces(directorio / nombre)) == enlaces
+        assert cargar_json(directorio / "exportado.json")['categorias'] == datos['categorias']
+        assert progresos[-1] == len(enlaces)
+
+        exportar_enlaces(enlaces, directorio / "exportado.csv")
+        with open(directorio / "exportado.csv", encoding='utf-8', newline='') as archivo:
+            filas = list(csv.DictReader(archivo))
+        assert [fila['url'] for fila in filas] == [enlace['url'] for enlace in enlaces]
+
+        exportar_enlaces(enlaces, directorio / "exportado.html")
+        contenido = (directorio / "exportado.html").read_text(encoding='utf-8')
+        assert contenido.startswith("<!DOCTYPE NETSCAPE-Bookmark-file-1>")
+        assert contenido.count("<DT><A HREF=") == len(enlaces)
+        assert not list(directorio.glob("*.tmp"))
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+
+
+MARCADORES_HTML = """<!DOCTYPE NETSCAPE-Bookmark-file-1>
+<META HTTP-EQUIV="Content-Type" CONTENT="text/html; charset=UTF-8">
+<TITLE>Bookmarks</TITLE>
+<H1>Bookmarks</H1>
+<DL><p>
+    <DT><H3 ADD_DATE="1700000000">Desarrollo</H3>
+    <DL><p>
+        <DT><H3>Python</H3>
+        <DL><p>
+            <DT><A HREF="https://docs.python.org/" ADD_DATE="1700000000" TAGS="python,docs" SHORTCUTURL="py">Python &amp; docs</A>
+        </DL><p>
+        <DT><A HREF="place:sort=8&amp;maxResults=10">Más visitados</A>
+    </DL><p>
+    <DT><A HREF="https://example.org">Ejemplo</A>
+</DL><p>
+"""
+
+
+def _crear_places_sqlite(ruta: Path) -> None:
+    """Crea una base places.sqlite mínima con una carpeta, una etiqueta y una palabra clave."""
+    conexion = sqlite3.connect(ruta)
+    conexion.executescript("""
+        CREATE TABLE moz_places (id INTEGER PRIMARY KEY, url TEXT);
+        CREATE TABLE moz_bookmarks (id INTEGER PRIMARY KEY, type INTEGER, fk INTEGER, parent INTEGER,
+                                    position INTEGER, title TEXT, dateAdded INTEGER,
+                                    lastModified INTEGER, guid TEXT);
+        CREATE TABLE moz_keywords (id INTEGER PRIMARY KEY, keyword TEXT, place_id INTEGER);
+        INSERT INTO moz_places VALUES (1, 'https://developer.mozilla.org/'), (2, 'place:tag=x');
+        INSERT INTO moz_bookmarks VALUES
+            (1, 2, NULL, 0, 0, '', 0, 0, 'root________'),
+            (2, 2, NULL, 1, 0, 'menu', 0, 0, 'menu________'),
+            (3, 2, NULL, 1, 1, 'tags', 0, 0, 'tags________'),
+            (4, 2, NULL, 2, 0, 'Web', 0, 0, 'carpeta_web_'),
+            (5, 1, 1, 4, 0, 'MDN', 1700000000000000, 1700000000000000, 'marcador_mdn'),
+            (6, 2, NULL, 3, 0, 'referencia', 0, 0, 'etiqueta____'),
+            (7, 1, 1, 6, 0, NULL, 0, 0, 'etiquetado__'),
+            (8, 1, 2, 2, 1, 'Consulta', 0, 0, 'consulta____');
+        INSERT INTO moz_keywords VALUES (1, 'mdn', 1);
+    """)
+    conexion.commit()
+    conexion.close()
+
+
+def test_importar_marcadores_navegador():
+    """Los lectores de navegador convierten carpetas en categorías y etiquetas en tags."""
+    print("=== Prueba Marcadores de Navegador ===")
+    directorio = Path(tempfile.mkdtemp(prefix="tlv_test_"))
+    try:
+        (directorio / "marcadores.html").write_text(MARCADORES_HTML, encoding='utf-8')
+        lector = abrir_lector(directorio / "marcadores.html")
+        assert isinstance(lector, LectorMarcadoresHTML)
+        registros = list(lector)
+        assert [r['categoria'] for r in registros] == ["Desarrollo / Python", ""]
+        assert registros[0]['titulo'] == "Python & docs"
+        assert registros[0]['tags'] == ["python", "docs", "py"]
+        assert lector.lineas_invalidas == 1
+
+        chromium = {"roots": {"bookmark_bar": {"type": "folder", "name": "Barra", "children": [
+            {"type": "url", "name": "Qt", "url": "https://doc.qt.io", "date_added": "13345000000000000"},
+            {"type": "folder", "name": "Vacía", "children": []}]}}, "version": 1}
+        (directorio / "Bookmarks").write_text(json.dumps(chromium), encoding='utf-8')
+        lector = abrir_lector(directorio / "Bookmarks")
+        assert isinstance(lector, LectorMarcadoresChromium)
+        registros = list(lector)
+        assert len(registros) == 1 and registros[0]['categoria'] == "Barra"
+        assert registros[0]['creado_en'].startswith("2023-")
+
+        _crear_places_sqlite(directorio / "places.sqlite")
+        lector = abrir_lector(directorio / "places.sqlite")
+        assert isinstance(lector, LectorMarcadoresFirefox)
+        registros = list(lector)
+        assert len(registros) == 1
+        assert registros[0]['categoria'] == "Menú de marcadores / Web"
+        assert sorted(registros[0]['tags']) == ["mdn", "referencia"]
+
+        # Las tres fuentes terminan en enlaces normalizados válidos
+        enlaces = [enlace for lote in normalizar_en_lotes(LectorMarcadoresHTML(directorio / "marcadores.html"))
+                   for enlace in lote]
+        assert [enlace['categoria'] for enlace in enlaces] == ["Desarrollo / Python", "General"]
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+
+
+def main():
+    """Ejecuta todas las pruebas."""
+    print("🧪 Ejecutando pruebas de intercambio")
+    print("=" * 40)
+
+    test_lector_documento_por_bloques()
+    test_importar_ndjson_en_lotes()
+    test_cancelar_importacion_sqlite()
+    test_fusionar_datos()
+    test_exportar_formatos()
+    test_importar_marcadores_navegador()
+
+    print("✅ Todas las pruebas completadas")
+
+
+if __name__ == "__main__":
+    main()
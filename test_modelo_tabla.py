@@ -0,0 +1,171 @@
+"""
+Pruebas del modelo de tabla de enlaces de TLV 4.0.
+"""
+import sys
+from PyQt6.QtCore import Qt, QVariant
+from PyQt6.QtGui import QGuiApplication
+from app.models.enlace import compactar_enlaces
+from app.models.link_model import ModeloTablaEnlaces
+
+
+def _aplicacion() -> QGuiApplication:
+    """Devuelve la aplicación Qt existente o crea una (las fuentes la necesitan)."""
+    return QGuiApplication.instance() or QGuiApplication(sys.argv)
+
+
+def _enlaces(cantidad: int):
+    return compactar_enlaces([
+        {"id": f"id{i}", "titulo": f"Enlace {i}", "url": f"https://e{i}.example.com", "categoria": "General",
+         "tags": [], "es_favorito": False, "creado_en": "2024-01-01T00:00:00",
+         "actualizado_en": "2024-01-01T00:00:00"}
+        for i in range(cantidad)
+    ])
+
+
+class _Senales:
+    """Registra las señales estructurales que emite un modelo."""
+
+    def __init__(self, modelo: ModeloTablaEnlaces):
+        self.registro = []
+        modelo.modelReset.connect(lambda: self.registro.append(('reset',)))
+        modelo.rowsRemoved.connect(lambda _, inicio, fin: self.registro.append(('quitar', inicio, fin)))
+        modelo.rowsInserted.connect(lambda _, inicio, fin: self.registro.append(('insertar', inicio, fin)))
+        modelo.layoutChanged.connect(lambda *_: self.registro.append(('orden',)))
+        modelo.dataChanged.connect(
+            lambda primero, ultimo, *_: self.registro.append(('datos', primero.row(), ultimo.row())))
+
+
+def test_actualizaciones_incrementales():
+    """El modelo emite solo las señales de las filas que cambian."""
+    print("=== Prueba Actualizaciones Incrementales ===")
+    _aplicacion()
+    enlaces = _enlaces(10)
+    modelo = ModeloTablaEnlaces()
+    assert modelo.actualizar_filas(enlaces, list(range(10)))
+    senales = _Senales(modelo)
+
+    # Cambiar un favorito repinta solo su fila
+    enlaces[4]['es_favorito'] = True
+    enlaces[4]['actualizado_en'] = "2024-02-01T00:00:00"
+    assert not modelo.actualizar_filas(enlaces, list(range(10)))
+    assert senales.registro == [('datos', 4, 4)]
+
+    # Filtrar quita tramos de filas sin reiniciar
+    senales.registro.clear()
+    modelo.actualizar_filas(enlaces, [0, 1, 5, 6, 7])
+    assert senales.registro == [('quitar', 8, 9), ('quitar', 2, 4)]
+    assert [modelo.obtener_id_enlace_por_fila(fila) for fila in range(modelo.rowCount())] == \
+        ["id0", "id1", "id5", "id6", "id7"]
+
+    # Volver a ampliar inserta en su sitio; reordenar usa layoutChanged
+    senales.registro.clear()
+    modelo.actualizar_filas(enlaces, [7, 6, 5, 1, 0, 9])
+    assert senales.registro == [('orden',), ('insertar', 5, 5)]
+    assert [modelo.obtener_id_enlace_por_fila(fila) for fila in range(modelo.rowCount())] == \
+        ["id7", "id6", "id5", "id1", "id0", "id9"]
+
+    # Muchos tramos dispersos se aplican como un único cambio de disposición
+    muchos = _enlaces(200)
+    modelo.actualizar_filas(muchos, list(range(200)))
+    senales.registro.clear()
+    assert not modelo.actualizar_filas(muchos, list(range(0, 200, 2)))
+    assert senales.registro == [('orden',)] and modelo.rowCount() == 100
+
+    # Sin filas se reinicia
+    senales.registro.clear()
+    assert modelo.actualizar_filas(enlaces, [])
+    assert senales.registro == [('reset',)]
+    print(f"Filas finales: {modelo.rowCount()}")
+
+
+def test_cache_de_textos():
+    """Los textos se calculan una vez por fila y se renuevan cuando el enlace cambia."""
+    print("=== Prueba Caché de Textos ===")
+    _aplicacion()
+    enlaces = _enlaces(3)
+    modelo = ModeloTablaEnlaces()
+    modelo.actualizar_enlaces_con_score([(enlaces[0], 0.3), (enlaces[1], 0.9), (enlaces[2], 0.4)])
+    titulo = modelo.index(0, 1)
+    assert modelo.data(titulo) == "🔍 Enlace 0"
+    assert modelo.data(modelo.index(1, 1)) == "Enlace 1"
+    assert modelo.data(titulo) is modelo.data(titulo)
+
+    enlaces[0]['titulo'] = "Renombrado"
+    enlaces[0]['actualizado_en'] = "2024-02-01T00:00:00"
+    assert modelo.data(titulo) == "🔍 Renombrado"
+    assert modelo.data(modelo.index(0, 5)) == "01/02/2024 00:00"
+
+    # Al salir de la búsqueda desaparece el indicador de relevancia
+    modelo.actualizar_enlaces(enlaces)
+    assert modelo.data(titulo) == "Renombrado"
+    print(f"Título: {modelo.data(titulo)}")
+
+
+def test_paginas():
+    """La vista recibe las filas por páginas y las ya cargadas se conservan."""
+    print("=== Prueba Páginas ===")
+    _aplicacion()
+    enlaces = _enlaces(10)
+    modelo = ModeloTablaEnlaces(filas_por_pagina=4)
+    assert modelo.actualizar_filas(enlaces, list(range(10)))
+    assert modelo.rowCount() == 4 and modelo.obtener_numero_enlaces() == 10
+    assert modelo.canFetchMore() and modelo.obtener_enlace_por_fila(5) is None
+
+    senales = _Senales(modelo)
+    modelo.fetchMore()
+    assert senales.registro == [('insertar', 4, 7)] and modelo.rowCount() == 8
+
+    # Un filtro conserva las filas cargadas sin recorrer el resto
+    senales.registro.clear()
+    modelo.actualizar_filas(enlaces, list(range(1, 10)))
+    assert senales.registro == [('quitar', 0, 0), ('insertar', 7, 7)] and modelo.rowCount() == 8
+    assert modelo.obtener_numero_sin_cargar() == 1
+
+    # Buscar un enlace no cargado carga hasta su página
+    assert modelo.obtener_fila_por_id("id9") == -1
+    assert modelo.obtener_fila_por_id("id9", cargar=True) == 8
+    assert modelo.rowCount() == 9 and not modelo.canFetchMore()
+
+    # Un resultado nuevo tras vaciar la tabla empieza en la primera página
+    modelo.actualizar_filas(enlaces, [])
+    modelo.actualizar_filas(enlaces, list(range(10)))
+    assert modelo.rowCount() == 4
+    assert modelo.cargar_todo() == 6 and modelo.rowCount() == 10
+    print(f"Filas cargadas: {modelo.rowCount()}")
+
+
+def test_estilos_compartidos():
+    """Fuentes y pinceles se crean una vez y se comparten entre celdas."""
+    print("=== Prueba Estilos Compartidos ===")
+    _aplicacion()
+    modelo = ModeloTablaEnlaces()
+    modelo.actualizar_enlaces(_enlaces(3))
+    fuente = modelo.data(modelo.index(0, 1), Qt.ItemDataRole.FontRole)
+    assert fuente.bold()
+    assert modelo.data(modelo.index(2, 1), Qt.ItemDataRole.FontRole) is fuente
+    pincel = modelo.data(modelo.index(0, 3), Qt.ItemDataRole.ForegroundRole)
+    assert pincel is modelo.data(modelo.index(1, 3), Qt.ItemDataRole.ForegroundRole)
+    assert modelo.data(modelo.index(0, 2), Qt.ItemDataRole.ForegroundRole) is None
+    assert modelo.data(modelo.index(0, 0), Qt.ItemDataRole.UserRole) == "id0"
+
+    # Roles sin datos y celdas fuera del modelo
+    assert isinstance(modelo.data(modelo.index(0, 0), Qt.ItemDataRole.DecorationRole), QVariant)
+    assert isinstance(modelo.data(modelo.index(5, 0)), QVariant)
+    print(f"Fuente del título: {fuente.toString()}")
+
+
+def main():
+    """Ejecuta todas las pruebas."""
+    print("🧪 Ejecutando pruebas del modelo de tabla")
+    print("=" * 40)
+
+    test_actualizaciones_incrementales()
+    test_cache_de_textos()
+    test_paginas()
+    test_estilos_compartidos()
+
+    print("✅ Todas las pruebas completadas")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,587 @@
+"""
+Pruebas del repositorio de enlaces de TLV 4.0.
+"""
+import json
+import pickle
+import shutil
+import tempfile
+from pathlib import Path
+from app.models.columnas import FiltroEnlaces, filtrar_filas_python
+from app.models.enlace import EnlaceCompacto, clave_fecha, compactar_enlaces, fecha_guardada
+from app.models.estadisticas import EstadisticasEnlaces
+from app.models.instantanea import EnlaceCongelado, congelar
+from app.models.migraciones import VERSION_ACTUAL
+from app.models.repository import RepositorioEnlaces, TransaccionCancelada
+from app.storage import BackendJSON
+from app.utils.esquema import validar_documento
+from app.utils.io import cargar_json, serializar_json
+from app.utils.time import formatear_fecha
+
+
+RUTA_DATOS = Path("data/links.json")
+
+
+def _directorio_temporal() -> Path:
+    """Crea un directorio temporal con una copia de links.json."""
+    directorio = Path(tempfile.mkdtemp(prefix="tlv_test_"))
+    shutil.copy(RUTA_DATOS, directorio / "links.json")
+    return directorio
+
+
+def _crear_repositorio(directorio: Path) -> RepositorioEnlaces:
+    """Crea un repositorio JSON sin instantánea sobre el directorio."""
+    ruta = directorio / "links.json"
+    return RepositorioEnlaces(ruta, BackendJSON(ruta, usar_snapshot=False))
+
+
+def test_eventos_cambio():
+    """Cada operación emite un evento con los ids afectados y una generación creciente."""
+    print("=== Prueba Eventos de Cambio ===")
+    directorio = _directorio_temporal()
+    try:
+        repo = _crear_repositorio(directorio)
+        eventos = []
+        repo.suscribir(eventos.append)
+
+        enlace_id = repo.agregar_enlace("Eventos", "https://eventos.example.com", "Eventos", [])
+        assert eventos[-1].agregados == {enlace_id}
+        assert eventos[-1].categorias_cambiadas
+
+        repo.alternar_favorito(enlace_id)
+        assert eventos[-1].actualizados == {enlace_id}
+        assert eventos[-1].favoritos == {enlace_id}
+        assert not eventos[-1].cambia_filas
+
+        repo.renombrar_categoria("Eventos", "Eventos 2")
+        assert eventos[-1].categorias_renombradas == (("Eventos", "Eventos 2"),)
+
+        # Agregar y eliminar dentro de un grupo no deja rastro del enlace
+        with repo.agrupar_cambios():
+            otro_id = repo.agregar_enlace("Otro", "https://otro.example.com", "Eventos 2", [])
+            repo.eliminar_enlace(otro_id)
+            repo.eliminar_enlace(enlace_id)
+        assert eventos[-1].agregados == frozenset()
+        assert eventos[-1].eliminados == {enlace_id}
+
+        assert [evento.generacion for evento in eventos] == list(range(1, len(eventos) + 1))
+        assert repo.generacion == len(eventos)
+
+        repo.cargar()
+        assert eventos[-1].recarga
+
+        repo.desuscribir(eventos.append)
+        repo.agregar_categoria("Sin aviso")
+        assert repo.generacion == len(eventos) + 1
+        print(f"Eventos emitidos: {len(eventos)}")
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+
+
+def test_enlace_compacto():
+    """Los enlaces compactos se comportan como los diccionarios de links.json."""
+    print("=== Prueba Enlace Compacto ===")
+    originales = cargar_json(RUTA_DATOS)['links']
+    originales[0]['descripcion'] = "Campo fuera del esquema"
+    originales[1]['creado_en'] = "2024-05-01T10:30:00+02:00"
+    compactos = compactar_enlaces(json.loads(json.dumps(originales)))
+
+    assert [enlace.a_dict() for enlace in compactos] == originales
+    assert compactos == originales
+    assert json.loads(serializar_json(compactos)) == originales
+    assert pickle.loads(pickle.dumps(compactos)) == compactos
+
+    enlace = compactos[0]
+    assert enlace['descripcion'] == "Campo fuera del esquema"
+    assert isinstance(enlace['tags'], list) and isinstance(enlace.tags, tuple)
+    enlace['tags'] = ["uno", "dos"]
+    del enlace['descripcion']
+    assert 'descripcion' not in enlace and enlace.get('tags') == ["uno", "dos"]
+
+    # Las categorías repetidas comparten una sola cadena
+    por_categoria = {}
+    for compacto in compactos:
+        assert por_categoria.setdefault(compacto.categoria, compacto.categoria) is compacto.categoria
+    assert EnlaceCompacto({'id': 'x'}) == {'id': 'x'}
+    print(f"Enlaces compactados: {len(compactos)}")
+
+
+def test_filtrar_filas():
+    """El filtrado por columnas devuelve las mismas filas que el recorrido en Python."""
+    print("=== Prueba Filtrar Filas ===")
+    directorio = _directorio_temporal()
+    try:
+        repo = _crear_repositorio(directorio)
+        favorito_id = repo.agregar_enlace("Filtro", "https://filtro.example.com", "Filtros", ["Columnar"],
+                                          es_favorito=True)
+        otro_id = repo.agregar_enlace("Otro", "https://otro-filtro.example.com", "Filtros", ["columnar", "dos"])
+        filtros = [
+            FiltroEnlaces(),
+            FiltroEnlaces(categoria="Filtros"),
+            FiltroEnlaces(tag="COLUMNAR"),
+            FiltroEnlaces(categoria="Filtros", solo_favoritos=True),
+            FiltroEnlaces(creado_desde="2000-01-01T00:00:00", creado_hasta="2000-01-02T00:00:00"),
+            FiltroEnlaces(categoria="No existe"),
+            FiltroEnlaces(tag="nuevo"),
+        ]
+
+        def comprobar():
+            enlaces = repo.obtener_enlaces()
+            for filtro in filtros:
+                assert list(repo.filtrar_filas(filtro)) == filtrar_filas_python(enlaces, filtro), filtro
+
+        comprobar()
+        enlaces = repo.obtener_enlaces()
+        filas = repo.filtrar_filas(FiltroEnlaces(categoria="Filtros", tag="columnar"))
+        assert [enlaces[fila]['id'] for fila in filas] == [favorito_id, otro_id]
+        assert len(repo.filtrar_filas(filtros[4])) == 0
+
+        # El almacén se mantiene al día con ediciones, favoritos y eliminaciones
+        repo.alternar_favorito(otro_id)
+        repo.actualizar_enlace(favorito_id, "Filtro", "https://filtro.example.com", "Otra", ["tres"])
+        comprobar()
+        repo.eliminar_enlace(enlaces[0]['id'])
+        comprobar()
+        filas = repo.filtrar_filas(FiltroEnlaces(solo_favoritos=True, tag="dos"))
+        assert [repo.obtener_enlaces()[fila]['id'] for fila in filas] == [otro_id]
+
+        # Tras una edición que cambia el número de tags, un enlace nuevo con
+        # un tag que nadie tenía debe encontrarse igual
+        repo.actualizar_enlace(otro_id, "Otro", "https://otro-filtro.example.com", "Filtros", ["dos"])
+        nuevo_id = repo.agregar_enlace("Nuevo", "https://nuevo-filtro.example.com", "Filtros", ["nuevo"])
+        # Antes que cualquier otro filtro por tag, que reconstruiría los tags
+        filas = repo.filtrar_filas(FiltroEnlaces(tag="nuevo"))
+        assert [repo.obtener_enlaces()[fila]['id'] for fila in filas] == [nuevo_id]
+        comprobar()
+
+        # La búsqueda con término aplica el mismo filtro (favoritos incluidos)
+        resultados = repo.buscar_enlaces("filtro", filtro=FiltroEnlaces(solo_favoritos=True))
+        assert {enlace['id'] for enlace, _ in resultados} == {favorito_id, otro_id}
+        resultados = repo.buscar_enlaces("filtro", filtro=FiltroEnlaces(solo_favoritos=True, tag="dos"))
+        assert [enlace['id'] for enlace, _ in resultados] == [otro_id]
+        print(f"Filtros comprobados: {len(filtros)}")
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+
+
+def test_estadisticas_incrementales():
+    """Los contadores ajustados con eventos coinciden con un recálculo completo."""
+    print("=== Prueba Estadísticas Incrementales ===")
+    directorio = _directorio_temporal()
+    try:
+        repo = _crear_repositorio(directorio)
+
+        def comprobar():
+            completas = EstadisticasEnlaces()
+            completas.reconstruir(repo.obtener_enlaces())
+            estadisticas = repo.obtener_estadisticas()
+            assert estadisticas['total_enlaces'] == completas.total == len(repo.obtener_enlaces())
+            assert estadisticas['total_favoritos'] == completas.favoritos
+            assert estadisticas['total_tags_unicos'] == completas.total_tags_unicos
+            assert estadisticas['enlaces_por_categoria'] == completas.por_categoria()
+            assert repo.obtener_tags_frecuentes(1000) == completas.tags_frecuentes(1000)
+            assert repo.obtener_enlaces_por_mes() == completas.por_mes()
+
+        comprobar()
+        enlace_id = repo.agregar_enlace("Stats", "https://stats.example.com", "Stats", ["Unico-Stats", "dos"])
+        comprobar()
+        assert ("unico-stats", 1) in repo.obtener_tags_frecuentes(1000)
+
+        repo.actualizar_enlace(enlace_id, "Stats", "https://stats.example.com", "Otra", ["tres"], es_favorito=True)
+        comprobar()
+        assert "unico-stats" not in dict(repo.obtener_tags_frecuentes(1000))
+
+        repo.renombrar_categoria("Otra", "Otra 2")
+        repo.alternar_favorito(repo.obtener_enlaces()[0]['id'])
+        repo.eliminar_enlace(enlace_id)
+        comprobar()
+        print(f"Tags únicos: {repo.obtener_estadisticas()['total_tags_unicos']}")
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+
+
+def test_categorias_indexadas():
+    """Renombrar, mover y eliminar categorías afecta solo a sus enlaces."""
+    print("=== Prueba Categorías Indexadas ===")
+    directorio = _directorio_temporal()
+    try:
+        repo = _crear_repositorio(directorio)
+        fecha = "2024-01-01T00:00:00"
+        repo.agregar_enlaces_lote([
+            {"id": f"lote-{i}", "titulo": f"Lote {i}", "url": f"https://lote.example.com/{i}",
+             "categoria": "Lote A" if i % 2 else "Lote B", "tags": [], "es_favorito": i % 3 == 0,
+             "creado_en": fecha, "actualizado_en": fecha}
+            for i in range(200)
+        ])
+        total = len(repo.obtener_enlaces())
+
+        def por_categoria(categoria):
+            return {enlace['id'] for enlace in repo.obtener_enlaces() if enlace['categoria'] == categoria}
+
+        impares = por_categoria("Lote A")
+        assert repo.renombrar_categoria("Lote A", "Lote C")
+        assert por_categoria("Lote C") == impares and not por_categoria("Lote A")
+
+        # El índice sigue al día tras editar un enlace
+        enlace = repo.obtener_enlace_por_id("lote-1")
+        repo.actualizar_enlace("lote-1", enlace['titulo'], enlace['url'], "Lote B", [])
+        assert repo.eliminar_categoria("Lote C", mover_a="Lote B")
+        assert len(por_categoria("Lote B")) == 200 and "Lote C" not in repo.obtener_categorias()
+
+        eventos = []
+        repo.suscribir(eventos.append)
+        repo.agregar_enlace("Extra", "https://extra-lote.example.com", "Lote B", [])
+        assert repo.eliminar_categoria("Lote B")
+        assert len(repo.obtener_enlaces()) == total - 200 and not por_categoria("Lote B")
+        assert len(eventos[-1].eliminados) == 201
+        print(f"Enlaces restantes: {len(repo.obtener_enlaces())}")
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+
+
+def test_cambios_externos():
+    """Los cambios guardados por otra instancia se aplican como diferencia."""
+    print("=== Prueba Cambios Externos ===")
+    directorio = _directorio_temporal()
+    try:
+        local = _crear_repositorio(directorio)
+        remoto = _crear_repositorio(directorio)
+        assert not local._backend.cambiado_externamente()
+
+        editado, eliminado = remoto.obtener_enlaces()[0], remoto.obtener_enlaces()[1]
+        nuevo_id = remoto.agregar_enlace("Remoto", "https://remoto.example.com", "Remota", ["x"], es_favorito=True)
+        remoto.actualizar_enlace(editado['id'], "Título remoto", editado['url'], editado['categoria'], [])
+        remoto.eliminar_enlace(eliminado['id'])
+        assert remoto.guardar()
+
+        eventos = []
+        local.suscribir(eventos.append)
+        objeto_editado = local.obtener_enlace_por_id(editado['id'])
+        resumen = local.sincronizar_cambios_externos()
+        assert resumen == {'agregados': 1, 'actualizados': 1, 'eliminados': 1}
+        assert len(eventos) == 1 and not eventos[0].recarga
+        assert eventos[0].agregados == {nuevo_id} and eventos[0].eliminados == {eliminado['id']}
+        assert eventos[0].actualizados == {editado['id']} and nuevo_id in eventos[0].favoritos
+        # El enlace editado se actualiza en su sitio
+        assert objeto_editado['titulo'] == "Título remoto"
+        assert local.obtener_enlaces() == remoto.obtener_enlaces()
+        assert "Remota" in local.obtener_categorias()
+
+        # Las escrituras propias no cuentan como cambios externos
+        assert local.guardar()
+        assert local.sincronizar_cambios_externos() is None
+        assert local.sincronizar_cambios_externos(forzar=True) == {'agregados': 0, 'actualizados': 0,
+                                                                     'eliminados': 0}
+
+        # Un cliente anterior guarda la versión 1, sin es_favorito
+        ruta = directorio / "links.json"
+        antiguo = cargar_json(ruta)
+        antiguo['version'] = 1
+        for enlace in antiguo['links']:
+            del enlace['es_favorito']
+        antiguo['links'][0]['titulo'] = "Cliente antiguo"
+        antiguo['links'][0]['actualizado_en'] = "2030-01-01T00:00:00"
+        ruta.write_text(json.dumps(antiguo), encoding='utf-8')
+        assert local.sincronizar_cambios_externos(forzar=True)['actualizados'] == 1
+        cambiado = local.obtener_enlace_por_id(antiguo['links'][0]['id'])
+        assert cambiado['titulo'] == "Cliente antiguo" and 'es_favorito' in cambiado
+        assert local._datos['version'] == VERSION_ACTUAL
+        assert local.guardar() and cargar_json(ruta)['version'] == VERSION_ACTUAL
+        print(f"Resumen: {resumen}")
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+
+
+class _BackendContador(BackendJSON):
+    """Backend JSON que cuenta las escrituras."""
+
+    def __init__(self, ruta: Path):
+        super().__init__(ruta, usar_snapshot=False)
+        self.escrituras = 0
+
+    def persistir(self, datos) -> bool:
+        self.escrituras += 1
+        return super().persistir(datos)
+
+
+def test_migraciones_por_version():
+    """Las migraciones se aplican una vez según la versión y con una sola escritura."""
+    print("=== Prueba Migraciones por Versión ===")
+    directorio = _directorio_temporal()
+    try:
+        ruta = directorio / "links.json"
+        datos = cargar_json(ruta)
+        datos['version'] = 1
+        for enlace in datos['links']:
+            enlace.pop('es_favorito', None)
+        ruta.write_bytes(serializar_json(datos))
+
+        backend = _BackendContador(ruta)
+        repo = RepositorioEnlaces(ruta, backend)
+        assert backend.escrituras == 1
+        assert all(enlace['es_favorito'] is False for enlace in repo.obtener_enlaces())
+        assert cargar_json(ruta)['version'] == VERSION_ACTUAL
+
+        # Con los datos al día no se migra ni se escribe nada
+        backend = _BackendContador(ruta)
+        RepositorioEnlaces(ruta, backend)
+        assert backend.escrituras == 0
+        print(f"Versión tras migrar: {VERSION_ACTUAL}")
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+
+
+def test_validacion_diagnostico():
+    """El validador informa de todos los errores con su posición y repara los que puede."""
+    print("=== Prueba Validación con Diagnóstico ===")
+    datos = cargar_json(RUTA_DATOS)
+    correcto = dict(datos['links'][0])
+    sin_titulo = {clave: valor for clave, valor in correcto.items() if clave != 'titulo'}
+    tags_texto = dict(correcto, tags="python, web")
+    sin_url = {clave: valor for clave, valor in correcto.items() if clave != 'url'}
+    documento = {"version": 1, "categorias": [], "links": [correcto, sin_titulo, "texto", tags_texto, sin_url]}
+
+    resultado = validar_documento(documento)
+    assert not resultado.valido
+    assert [error.indice for error in resultado.errores] == [1, 2, 3, 4]
+
+    resultado = validar_documento(documento, reparar=True)
+    # Solo quedan sin reparar el registro que no es un objeto y el que no tiene URL
+    assert [error.indice for error in resultado.errores if not error.reparado] == [2, 4]
+    assert sin_titulo['titulo'] == correcto['url'] and tags_texto['tags'] == ["python", "web"]
+    assert resultado.documento_valido and resultado.enlaces_irreparables == [2, 4]
+    assert not validar_documento({"version": 2, "categorias": []}).documento_valido
+
+    # Al cargar solo se descartan los enlaces sin arreglo, no toda la colección
+    directorio = _directorio_temporal()
+    try:
+        ruta = directorio / "links.json"
+        validos = [dict(correcto, id=f"valido-{numero}") for numero in range(50)]
+        ruta.write_text(json.dumps(dict(datos, links=validos[:25] + [dict(sin_url)] + validos[25:])),
+                        encoding='utf-8')
+        repo = _crear_repositorio(directorio)
+        assert [enlace['id'] for enlace in repo.obtener_enlaces()] == [enlace['id'] for enlace in validos]
+        assert len(cargar_json(ruta)['links']) == 50
+        assert repo.listar_copias()
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+
+    # Un contenido con veredicto positivo no se vuelve a recorrer
+    assert validar_documento(datos, hash_contenido=b'contenido').valido
+    assert validar_documento(documento, hash_contenido=b'contenido').errores == []
+    print(f"Errores: {[str(error) for error in resultado.errores]}")
+
+
+def test_fechas_enteras():
+    """Las fechas se muestran y ordenan desde los microsegundos guardados."""
+    print("=== Prueba Fechas Enteras ===")
+    antiguo, reciente = compactar_enlaces([
+        {"id": "a", "actualizado_en": "2024-05-01T10:30:00.500000"},
+        {"id": "b", "actualizado_en": "2024-05-01T10:31:00"},
+    ])
+    assert type(fecha_guardada(antiguo, 'actualizado_en')) is int
+    assert formatear_fecha(fecha_guardada(antiguo, 'actualizado_en')) == formatear_fecha(antiguo['actualizado_en'])
+    assert formatear_fecha(fecha_guardada(reciente, 'actualizado_en')) == "01/05/2024 10:31"
+    assert clave_fecha(antiguo, 'actualizado_en') < clave_fecha(reciente, 'actualizado_en')
+    assert clave_fecha({"id": "c"}, 'actualizado_en') < clave_fecha(antiguo, 'actualizado_en')
+    print(f"Formato: {formatear_fecha(fecha_guardada(antiguo, 'actualizado_en'))}")
+
+
+def test_instantaneas():
+    """Las instantáneas no ven cambios posteriores y comparten los enlaces sin cambios."""
+    print("=== Prueba Instantáneas ===")
+    directorio = _directorio_temporal()
+    try:
+        repo = _crear_repositorio(directorio)
+        enlace_id = repo.agregar_enlace("Instantánea", "https://instantanea.example.com", "General", ["a"])
+        primera = repo.obtener_instantanea()
+        assert primera.generacion == repo.generacion
+        assert repo.obtener_instantanea() is primera
+        assert all(isinstance(enlace, EnlaceCongelado) for enlace in primera.enlaces)
+
+        congelado = next(enlace for enlace in primera.enlaces if enlace.id == enlace_id)
+        try:
+            congelado['titulo'] = "Modificado"
+            assert False, "Un enlace congelado no debe poder modificarse"
+        except TypeError:
+            pass
+        for modificar in (lambda: setattr(congelado, 'titulo', "Modificado"),
+                          lambda: delattr(congelado, 'url'),
+                          lambda: setattr(congelado, 'extra', {'nota': "x"})):
+            try:
+                modificar()
+                assert False, "Un enlace congelado no debe poder modificarse por atributo"
+            except TypeError:
+                pass
+
+        con_extra = congelar({'id': 'extra', 'titulo': "Extra", 'url': "https://extra.example.com", 'nota': "a"})
+        try:
+            con_extra.extra['nota'] = "b"
+            assert False, "Las claves extra de un enlace congelado no deben poder modificarse"
+        except TypeError:
+            pass
+        assert con_extra['nota'] == "a"
+        copia = pickle.loads(pickle.dumps(con_extra))
+        assert isinstance(copia, EnlaceCongelado) and copia == con_extra
+
+        repo.actualizar_enlace(enlace_id, "Editado", "https://instantanea.example.com", "General", ["b"])
+        segunda = repo.obtener_instantanea()
+        assert segunda.generacion > primera.generacion
+        assert congelado['titulo'] == "Instantánea" and congelado['tags'] == ["a"]
+        assert next(enlace for enlace in segunda.enlaces if enlace.id == enlace_id)['titulo'] == "Editado"
+        # Los enlaces que no cambiaron son los mismos objetos en ambas instantáneas
+        compartidos = sum(a is b for a, b in zip(primera.enlaces, segunda.enlaces))
+        assert compartidos == len(primera.enlaces) - 1
+
+        repo.eliminar_enlace(enlace_id)
+        assert len(repo.obtener_instantanea().enlaces) == len(primera.enlaces) - 1
+        assert len(primera.enlaces) == len(segunda.enlaces)
+        print(f"Enlaces compartidos: {compartidos}")
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+
+
+def test_transacciones():
+    """Una transacción emite un evento y guarda una vez, o se deshace por completo."""
+    print("=== Prueba Transacciones ===")
+    directorio = _directorio_temporal()
+    try:
+        backend = _BackendContador(directorio / "links.json")
+        repo = RepositorioEnlaces(directorio / "links.json", backend)
+        escrituras = backend.escrituras
+        eventos = []
+        repo.suscribir(eventos.append)
+
+        with repo.transaccion():
+            primero = repo.agregar_enlace("Uno", "https://uno.example.com", "Transacción", [])
+            segundo = repo.agregar_enlace("Dos", "https://dos.example.com", "Transacción", [])
+            repo.alternar_favorito(segundo)
+            repo.guardar()
+        assert len(eventos) == 1 and eventos[0].agregados == {primero, segundo}
+        assert backend.escrituras == escrituras + 1
+        assert json.loads((directorio / "links.json").read_text(encoding='utf-8'))['links'][-1]['es_favorito']
+
+        antes = [enlace.a_dict() for enlace in repo.obtener_enlaces()]
+        categorias = list(repo.obtener_categorias())
+        instantanea = repo.obtener_instantanea()
+        try:
+            with repo.transaccion():
+                repo.actualizar_enlace(primero, "Editado", "https://uno.example.com", "Otra", ["x"])
+                repo.alternar_favorito(segundo)
+                repo.eliminar_categoria("Transacción")
+                repo.agregar_enlace("Tres", "https://tres.example.com", "General", [])
+                raise ValueError("fallo a mitad")
+        except ValueError:
+            pass
+        assert [enlace.a_dict() for enlace in repo.obtener_enlaces()] == antes
+        assert repo.obtener_categorias() == categorias
+        assert len(eventos) == 1 and backend.escrituras == escrituras + 1
+        assert repo.buscar_enlaces(categoria_filtro="Transacción")
+        assert repo.obtener_instantanea() is instantanea
+
+        with repo.transaccion():
+            repo.eliminar_enlace(primero)
+            raise TransaccionCancelada()
+        assert repo.obtener_enlace_por_id(primero) is not None
+        print(f"Eventos: {len(eventos)}, escrituras: {backend.escrituras - escrituras}")
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+
+
+def test_edicion_en_lote():
+    """Las acciones en lote modifican todos los enlaces con un único evento."""
+    print("=== Prueba Edición en Lote ===")
+    directorio = _directorio_temporal()
+    try:
+        repo = _crear_repositorio(directorio)
+        ids = [repo.agregar_enlace(f"Lote {i}", f"https://lote{i}.example.com", "General", ["Viejo", "comun"])
+               for i in range(3)]
+        eventos = []
+        repo.suscribir(eventos.append)
+
+        assert repo.editar_enlaces_lote(ids, categoria="Reorganizado", agregar_tags=["Nuevo", "comun"],
+                                        quitar_tags=["viejo"], es_favorito=True) == 3
+        assert len(eventos) == 1 and eventos[0].actualizados == set(ids) and eventos[0].favoritos == set(ids)
+        for enlace_id in ids:
+            enlace = repo.obtener_enlace_por_id(enlace_id)
+            assert enlace['categoria'] == "Reorganizado" and enlace['es_favorito']
+            assert enlace['tags'] == ["comun", "nuevo"]
+        assert "Reorganizado" in repo.obtener_categorias()
+        assert len(repo.buscar_enlaces(categoria_filtro="Reorganizado")) == 3
+
+        # Sin nada que cambiar no se modifica ni se notifica
+        assert repo.editar_enlaces_lote(ids, es_favorito=True) == 0
+        assert len(eventos) == 1
+
+        assert repo.eliminar_enlaces(ids[:2] + ["inexistente"]) == 2
+        assert eventos[-1].eliminados == set(ids[:2])
+        assert repo.obtener_enlace_por_id(ids[2]) is not None
+        print(f"Eventos: {len(eventos)}")
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+
+
+def test_ordenacion_por_columnas():
+    """Los órdenes por columna se calculan una vez y sirven para cualquier filtro."""
+    print("=== Prueba Ordenación por Columnas ===")
+    directorio = _directorio_temporal()
+    try:
+        repo = _crear_repositorio(directorio)
+        id_beta = repo.agregar_enlace("beta", "https://www.zeta.example.com/x", "General", ["a"])
+        repo.agregar_enlace("Alfa", "https://alfa.example.com", "General", ["a", "b", "c"])
+        id_gamma = repo.agregar_enlace("gamma", "http://media.example.com:8080", "Otra", [])
+        enlaces = repo.obtener_enlaces()
+        total = len(enlaces)
+        nuevas = [total - 3, total - 2, total - 1]
+
+        def titulos(filas):
+            return [enlaces[fila]['titulo'] for fila in filas]
+
+        # Sin filtro se devuelve la permutación cacheada
+        todas = repo.ordenar_filas(range(total), 'titulo')
+        assert titulos(todas) == sorted(titulos(range(total)), key=str.casefold)
+        assert repo.ordenar_filas(range(total), 'titulo') is todas
+
+        assert titulos(repo.ordenar_filas(nuevas, 'titulo')) == ["Alfa", "beta", "gamma"]
+        assert titulos(repo.ordenar_filas(nuevas, 'host')) == ["Alfa", "gamma", "beta"]
+        assert titulos(repo.ordenar_filas(nuevas, 'tags', descendente=True)) == ["Alfa", "beta", "gamma"]
+
+        # Un cambio que no mueve al enlace conserva el orden; uno que lo mueve lo recalcula
+        repo.alternar_favorito(id_beta)
+        assert repo.ordenar_filas(range(total), 'titulo') is todas
+        assert titulos(repo.ordenar_filas(nuevas, 'favorito', descendente=True)) == ["beta", "Alfa", "gamma"]
+        repo.actualizar_enlace(id_gamma, "Aaa", "http://media.example.com:8080", "Otra", [])
+        assert titulos(repo.ordenar_filas(nuevas, 'titulo')) == ["Aaa", "Alfa", "beta"]
+
+        # Los resultados de una búsqueda se ordenan con los mismos rangos
+        resultados = [(enlaces[fila], 1.0) for fila in nuevas]
+        ordenados = repo.ordenar_resultados(resultados, 'titulo', descendente=True)
+        assert [enlace['titulo'] for enlace, _ in ordenados] == ["beta", "Alfa", "Aaa"]
+        print(f"Enlaces ordenados: {total}")
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+
+
+def main():
+    """Ejecuta todas las pruebas."""
+    print("🧪 Ejecutando pruebas del repositorio")
+    print("=" * 40)
+
+    test_eventos_cambio()
+    test_enlace_compacto()
+    test_filtrar_filas()
+    test_estadisticas_incrementales()
+    test_categorias_indexadas()
+    test_cambios_externos()
+    test_migraciones_por_version()
+    test_validacion_diagnostico()
+    test_fechas_enteras()
+    test_instantaneas()
+    test_transacciones()
+    test_edicion_en_lote()
+    test_ordenacion_por_columnas()
+
+    print("✅ Todas las pruebas completadas")
+
+
+if __name__ == "__main__":
+    main()